@@ -0,0 +1,76 @@
+"""
+Optional async database mode for the read routers.
+
+Set ASYNC_DB=1 to serve the read endpoints (standings, squads,
+quarterbacks) from an AsyncEngine: asyncpg on PostgreSQL, aiosqlite
+locally. Reads then wait on the database without holding a threadpool
+thread. Admin endpoints, syncs and scripts keep the sync engine either way.
+
+The read code itself is shared: handlers pass a sync function taking a
+Session to run_read(), which runs it through AsyncSession.run_sync() in
+async mode, or on the threadpool with a regular Session otherwise.
+"""
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.database.config import SQLALCHEMY_DATABASE_URL, SessionLocal
+from app.database.engine_config import configure_engine, engine_options
+from typing import Any, AsyncIterator, Callable, Union
+import os
+
+ASYNC_DB = os.getenv("ASYNC_DB", "").lower() in ("1", "true", "yes")
+
+# Sync driver URL prefix -> async driver URL prefix
+ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+def async_database_url(url: str) -> str:
+    """
+    Swap a sync database URL's driver for its async counterpart.
+
+    Raises:
+        ValueError: No async driver known for the URL's dialect
+    """
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    raise ValueError(f"No async driver configured for {url.split('://', 1)[0]}")
+
+async_engine = None
+AsyncSessionLocal = None
+
+if ASYNC_DB:
+    # Imported only in async mode so asyncpg/aiosqlite stay optional
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+    configure_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_read_db() -> AsyncIterator[Union[Session, Any]]:
+    """
+    Session dependency for read routers: an AsyncSession in async mode,
+    otherwise a regular Session (closed on the threadpool).
+    """
+    if ASYNC_DB:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+async def run_read(db, read: Callable[..., Any], *args) -> Any:
+    """
+    Run read(session, *args) against a session from get_read_db without
+    blocking the event loop.
+    """
+    if ASYNC_DB:
+        return await db.run_sync(read, *args)
+    return await run_in_threadpool(read, db, *args)
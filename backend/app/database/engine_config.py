@@ -0,0 +1,226 @@
+"""
+Engine configuration from environment variables, plus pool and query
+metrics.
+
+Pool (PostgreSQL and file-backed SQLite):
+    DB_POOL_SIZE          connections kept open (default 5)
+    DB_MAX_OVERFLOW       extra connections under load (default 10)
+    DB_POOL_TIMEOUT       seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE       seconds before a connection is replaced (default 1800)
+    DB_POOL_PRE_PING      test connections on checkout (default true), so
+                          connections the server dropped are replaced
+                          instead of failing the request
+
+PostgreSQL:
+    DB_STATEMENT_TIMEOUT_MS   server-side statement timeout (default 30000, 0 = off)
+
+SQLite:
+    SQLITE_PRAGMAS        comma-separated pragmas run on every new connection
+                          (default "journal_mode=WAL,busy_timeout=5000,
+                          synchronous=NORMAL"); WAL lets reads run while a
+                          sync writes, busy_timeout waits on the write lock
+                          instead of failing with "database is locked"
+
+Metrics:
+    DB_SLOW_QUERY_MS      queries slower than this are counted as slow (default 500)
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict, List, Tuple
+import os
+import threading
+import time
+
+DEFAULT_SQLITE_PRAGMAS = "journal_mode=WAL,busy_timeout=5000,synchronous=NORMAL"
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name, "").strip().lower()
+    return value in ("1", "true", "yes", "on") if value else default
+
+def sqlite_pragmas() -> List[Tuple[str, str]]:
+    """Parse SQLITE_PRAGMAS into (name, value) pairs."""
+    pragmas = []
+    for item in os.getenv("SQLITE_PRAGMAS", DEFAULT_SQLITE_PRAGMAS).split(","):
+        if "=" in item:
+            name, value = (part.strip() for part in item.split("=", 1))
+            if name:
+                pragmas.append((name, value))
+    return pragmas
+
+class PoolMetrics:
+    """
+    Counters fed by engine events and the timed pool classes below.
+    Shared by the sync and async engines; thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Read once: record_query runs on every statement
+        self.slow_query_seconds = _env_int("DB_SLOW_QUERY_MS", 500) / 1000
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidated = 0
+            self.queries = 0
+            self.query_seconds_total = 0.0
+            self.query_seconds_max = 0.0
+            self.slow_queries = 0
+            self.since = time.time()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_query(self, seconds: float) -> None:
+        slow = seconds >= self.slow_query_seconds
+        with self._lock:
+            self.queries += 1
+            self.query_seconds_total += seconds
+            self.query_seconds_max = max(self.query_seconds_max, seconds)
+            self.slow_queries += slow
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidated(self) -> None:
+        with self._lock:
+            self.invalidated += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "since": self.since,
+                "checkouts": self.checkouts,
+                "checkout_wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "checkout_timeouts": self.timeouts,
+                "connections_opened": self.connects,
+                "connections_invalidated": self.invalidated,
+                "queries": self.queries,
+                "query_ms_avg": round(self.query_seconds_total / self.queries * 1000, 3) if self.queries else 0.0,
+                "query_ms_max": round(self.query_seconds_max * 1000, 3),
+                "slow_queries": self.slow_queries,
+                "slow_query_ms": round(self.slow_query_seconds * 1000),
+            }
+
+pool_metrics = PoolMetrics()
+
+class _TimedCheckout:
+    # Times how long a checkout waits for a connection (including opening
+    # a new one when the pool grows into its overflow)
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(url: str, is_async: bool = False) -> Dict:
+    """
+    create_engine / create_async_engine keyword arguments for a URL.
+    """
+    options: Dict = {}
+    connect_args: Dict = {}
+
+    if url.startswith("sqlite"):
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+            # In-memory databases use SQLAlchemy's single-connection pools
+            return {"connect_args": connect_args}
+    else:
+        timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 30000)
+        if timeout_ms:
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+    )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def configure_engine(engine: Engine) -> None:
+    """
+    Attach SQLite pragmas and the metrics listeners to an engine (for an
+    AsyncEngine, pass its sync_engine).
+    """
+    is_sqlite = engine.dialect.name == "sqlite"
+    pragmas = sqlite_pragmas() if is_sqlite else []
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_metrics.record_connect()
+        if pragmas:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.record_invalidated()
+
+    # The start time lives on the statement's execution context, so a
+    # statement that fails (no after_cursor_execute) leaves nothing behind
+    # on the pooled connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is not None:
+            pool_metrics.record_query(time.perf_counter() - start)
+
+def pool_status(engine: Engine) -> Dict:
+    """Live state of an engine's pool."""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    return status
@@ -0,0 +1,86 @@
+"""
+Versioned schema migrations.
+
+schema_migrations records every migration applied to the database. At
+startup migrate() reads the highest applied version with one query and
+stops there if it is the latest, so an up-to-date database costs a single
+SELECT instead of reflecting every table and index.
+
+Migration 1 is the baseline: ensure_schema brings a database of any earlier
+shape (or an empty one) up to the current models. Every later schema change
+gets its own numbered migration appended to MIGRATIONS; changing the models
+alone no longer reaches databases that are already current.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from app.database.schema import ensure_schema
+from typing import Callable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Kept off Base.metadata so the baseline's create_all doesn't manage it
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+def add_sync_job_runner(engine: Engine) -> None:
+    """sync_jobs.runner: the host:pid that queued each job."""
+    if "runner" not in {column["name"] for column in inspect(engine).get_columns("sync_jobs")}:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE sync_jobs ADD COLUMN runner VARCHAR"))
+
+# (version, name, upgrade function), in order
+MIGRATIONS: List[Tuple[int, str, Callable[[Engine], None]]] = [
+    (1, "baseline schema", ensure_schema),
+    (2, "sync job runner", add_sync_job_runner),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(engine: Engine) -> int:
+    """Return the highest applied migration (0 for a database without any)."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        # No schema_migrations table yet
+        return 0
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Apply pending migrations in order, recording each one as it finishes.
+
+    Returns:
+        Versions applied (empty when the schema was already current)
+    """
+    version = current_version(engine)
+    if version >= LATEST_VERSION:
+        return []
+
+    migration_metadata.create_all(bind=engine)
+    applied = []
+    for number, name, upgrade in MIGRATIONS:
+        if number <= version:
+            continue
+        logger.info("Applying schema migration %d: %s", number, name)
+        upgrade(engine)
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    schema_migrations.insert().values(version=number, name=name, applied_at=datetime.now(timezone.utc))
+                )
+        except IntegrityError:
+            # Another process starting at the same time recorded it first;
+            # migrations are written to be safe to run twice
+            pass
+        applied.append(number)
+    return applied
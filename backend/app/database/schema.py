@@ -0,0 +1,136 @@
+"""
+Schema setup: create missing tables, columns and indexes. Runs as the
+baseline migration (see migrations.py), not on every start.
+"""
+from sqlalchemy import Index, String, Table, cast, func, inspect, literal, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.database.config import Base
+from app.models.models import BonusType  # also registers models on Base.metadata
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Scoring tables whose duplicate rows (written before their unique index
+# existed) are dropped so the index can be created, keeping the first copy.
+# Other tables' duplicates (quarterbacks, squads) have rows pointing at them,
+# so they stop the migration instead and have to be merged by hand.
+DEDUPLICATE_TABLES = {"weekly_stats", "season_bonuses", "playoff_appearances"}
+
+class DuplicateRowsError(Exception):
+    """Existing rows repeat the key of a unique index about to be created."""
+
+def _check_duplicates(engine: Engine, table: Table, index: Index) -> None:
+    """
+    Raises:
+        DuplicateRowsError: Rows share the index key (up to 10 keys listed)
+    """
+    key = list(index.expressions)
+    with engine.connect() as connection:
+        duplicates = connection.execute(
+            select(*key, func.count().label("copies")).group_by(*key).having(func.count() > 1).limit(10)
+        ).all()
+    if duplicates:
+        listed = "; ".join(", ".join(str(value) for value in row[:-1]) + f" ({row[-1]} rows)" for row in duplicates)
+        raise DuplicateRowsError(
+            f"Cannot create unique index {index.name}: {table.name} has duplicate keys: {listed}. "
+            "Merge or rename the duplicates, then restart to finish the migration."
+        )
+
+def _drop_duplicates(engine: Engine, table: Table, index: Index) -> set:
+    """
+    Delete rows that repeat an earlier row's index key.
+
+    Returns:
+        Seasons that lost rows (their totals need a rebuild)
+    """
+    first_ids = select(func.min(table.c.id)).group_by(*index.expressions)
+    with engine.begin() as connection:
+        seasons = set(connection.execute(
+            select(table.c.season).where(table.c.id.not_in(first_ids)).distinct()
+        ).scalars())
+        if seasons:
+            removed = connection.execute(table.delete().where(table.c.id.not_in(first_ids))).rowcount
+            logger.warning("Removed %d duplicate %s rows before creating %s", removed, table.name, index.name)
+    return seasons
+
+def _keep_repeat_awards(engine: Engine, table: Table, index: Index) -> None:
+    """
+    Award seeds before award_period existed stored a QB's repeat POW/POM
+    wins as identical rows. Give the repeats a placeholder period so they
+    survive the unique index; re-seeding the season's awards replaces them.
+    """
+    first_ids = select(func.min(table.c.id)).group_by(*index.expressions)
+    with engine.begin() as connection:
+        connection.execute(
+            table.update().where(
+                table.c.id.not_in(first_ids),
+                table.c.award_period.is_(None),
+                table.c.bonus_type.in_([BonusType.CONF_POW, BonusType.CONF_POM])
+            ).values(award_period=literal("legacy-", String) + cast(table.c.id, String))
+        )
+
+def _index_names(engine: Engine, inspector, table: Table) -> set:
+    if engine.dialect.name == "sqlite":
+        # SQLite reflection skips expression indexes; read the catalog directly
+        with engine.connect() as connection:
+            return set(connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+                {"table": table.name}
+            ).scalars())
+    return {index["name"] for index in inspector.get_indexes(table.name)}
+
+def ensure_schema(engine: Engine) -> None:
+    """
+    Create any missing tables, then any nullable columns and indexes declared
+    on models that existing tables don't have yet (create_all skips both on
+    tables that already exist). Duplicate scoring rows blocking a new unique
+    index are removed first and their seasons' totals rebuilt.
+
+    Raises:
+        DuplicateRowsError: Duplicate quarterbacks or squads block a unique
+            index; nothing is recorded, so the migration reruns once fixed
+    """
+    Base.metadata.create_all(bind=engine)
+    deduplicated = set()
+
+    try:
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+            existing = _index_names(engine, inspector, table)
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if index.name == "uq_season_bonuses_qb_season_type_period":
+                    _keep_repeat_awards(engine, table, index)
+                if index.unique and table.name in DEDUPLICATE_TABLES:
+                    deduplicated |= _drop_duplicates(engine, table, index)
+                elif index.unique:
+                    _check_duplicates(engine, table, index)
+                try:
+                    index.create(bind=engine)
+                except SQLAlchemyError as e:
+                    # Upserts target the unique indexes, so running without one
+                    # would fail at write time; stop the migration instead
+                    if index.unique:
+                        raise
+                    logger.warning("Could not create index %s: %s", index.name, e)
+    finally:
+        # Rows already dropped need their totals rebuilt even if a later
+        # index stops the migration
+        if deduplicated:
+            # Imported here: the services import the models this module sets up
+            from app.services.totals import TotalsService
+            with Session(engine) as db:
+                for season in sorted(deduplicated):
+                    TotalsService.rebuild_season(db, season)
+                db.commit()
@@ -0,0 +1,57 @@
+"""
+Dialect-aware INSERT ... ON CONFLICT helpers (PostgreSQL and SQLite).
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, List, Sequence
+
+# Rows per statement; keeps bound parameters well under SQLite's limit.
+UPSERT_BATCH_SIZE = 500
+
+def upsert(
+    db: Session,
+    model,
+    rows: List[Dict],
+    conflict_columns: Sequence,
+    update_columns: Sequence[str]
+) -> int:
+    """
+    Bulk insert rows, updating update_columns when a row with the same
+    conflict_columns already exists. Rows go in statements of up to
+    UPSERT_BATCH_SIZE rows, all in the caller's transaction.
+
+    Args:
+        db: Database session (its bind decides the dialect)
+        model: Mapped model class
+        rows: Column->value dicts, all with the same keys
+        conflict_columns: Columns (or the expressions) of a unique index on
+            the table, e.g. models.SEASON_BONUS_KEY
+        update_columns: Columns to overwrite on conflict; empty to skip
+            conflicting rows instead (INSERT ... ON CONFLICT DO NOTHING)
+
+    Returns:
+        Rows inserted or updated (skipped conflicts don't count)
+    """
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise NotImplementedError(f"Upsert not supported for dialect: {dialect}")
+
+    written = 0
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        statement = insert(model).values(rows[start:start + UPSERT_BATCH_SIZE])
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: statement.excluded[column] for column in update_columns}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        written += db.execute(statement).rowcount
+    return written
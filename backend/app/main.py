@@ -1,20 +1,42 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.config import engine, Base
-from app.routers import standings, squads, quarterbacks, admin
+from fastapi.responses import ORJSONResponse
+from app.database.config import engine, SessionLocal
+from app.database.migrations import migrate
+from app.routers import standings, squads, quarterbacks, seasons, admin
+from app.services.totals import TotalsService
+from app.services.http_cache import SelectiveGZipMiddleware
+from app.services.jobs import JobRunner
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+def prepare_database() -> None:
+    """
+    Startup: apply pending schema migrations (one version check when
+    current), backfill missing standings totals and close out sync jobs
+    interrupted by a restart.
+    """
+    applied = migrate(engine)
+
+    with SessionLocal() as db:
+        # Writes keep the totals current, so the per-season backfill only
+        # runs after a migration or when a totals table has been left empty
+        if applied or TotalsService.totals_missing(db):
+            TotalsService.ensure_all_seasons(db)
+        # Sync jobs don't survive a restart; close out any left queued/running
+        JobRunner.fail_interrupted(db)
+
+prepare_database()
 
 app = FastAPI(
     title="AR15 League API",
     description="Fantasy Football League API for QB-only league",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson instead of the stdlib json module for every dict response
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS for frontend
@@ -34,14 +56,24 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "PUT", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# Compress responses above GZIP_MIN_BYTES (the QB list, details and
+# snapshot payloads are large and repetitive). The standings stream is left
+# uncompressed: gzip would buffer its events.
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MIN_BYTES", "1000")),
+    exclude_paths=[standings.STREAM_PATH]
+)
+
 # Include routers
 app.include_router(standings.router)
 app.include_router(squads.router)
 app.include_router(quarterbacks.router)
+app.include_router(seasons.router)
 app.include_router(admin.router)
 
 @app.get("/")
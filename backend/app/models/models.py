@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Enum
+from sqlalchemy import (
+    Column, Integer, String, Float, Boolean, ForeignKey, Enum, DateTime, Index, JSON, Text, func, literal_column
+)
 from sqlalchemy.orm import relationship
 from app.database.config import Base
 import enum
@@ -13,6 +15,11 @@ class Squad(Base):
 
     quarterbacks = relationship("Quarterback", back_populates="squad")
 
+    __table_args__ = (
+        # Serves every per-season squad query; one squad name per season
+        Index("uq_squads_season_name", "season", "name", unique=True),
+    )
+
 class Quarterback(Base):
     __tablename__ = "quarterbacks"
 
@@ -21,11 +28,21 @@ class Quarterback(Base):
     nfl_team = Column(String, nullable=False)
     squad_id = Column(Integer, ForeignKey("squads.id"), nullable=True)
     season = Column(Integer, nullable=False)
+    # nflverse player_id (GSIS ID, e.g. "00-0033873"); learned by the NFL
+    # sync from name matches or set by an admin
+    gsis_id = Column(String, nullable=True, index=True)
 
     squad = relationship("Squad", back_populates="quarterbacks")
-    weekly_stats = relationship("WeeklyStat", back_populates="quarterback")
-    season_bonuses = relationship("SeasonBonus", back_populates="quarterback")
-    playoff_appearances = relationship("PlayoffAppearance", back_populates="quarterback")
+    # Ordered by id: lookups now walk the (qb_id, ...) unique indexes, which
+    # would otherwise return rows in key order rather than entry order
+    weekly_stats = relationship("WeeklyStat", back_populates="quarterback", order_by="WeeklyStat.id")
+    season_bonuses = relationship("SeasonBonus", back_populates="quarterback", order_by="SeasonBonus.id")
+    playoff_appearances = relationship("PlayoffAppearance", back_populates="quarterback", order_by="PlayoffAppearance.id")
+
+    __table_args__ = (
+        # Serves per-season roster queries and award/name lookups
+        Index("uq_quarterbacks_season_name", "season", "name", unique=True),
+    )
 
 class WeeklyStat(Base):
     __tablename__ = "weekly_stats"
@@ -47,6 +64,11 @@ class WeeklyStat(Base):
 
     quarterback = relationship("Quarterback", back_populates="weekly_stats")
 
+    __table_args__ = (
+        # One stat line per QB per week; lets syncs upsert natively.
+        Index("uq_weekly_stats_qb_season_week", "qb_id", "season", "week", unique=True),
+    )
+
 class BonusType(str, enum.Enum):
     MVP = "MVP"
     MVP_RUNNER_UP = "MVP_RUNNER_UP"
@@ -65,9 +87,28 @@ class SeasonBonus(Base):
     season = Column(Integer, nullable=False)
     bonus_type = Column(Enum(BonusType), nullable=False)
     points = Column(Float, nullable=False)
+    # Which week/month an award is for ("Week 5", "December"); lets a QB
+    # hold several POW/POM awards and award re-seeds diff row by row
+    award_period = Column(String, nullable=True)
 
     quarterback = relationship("Quarterback", back_populates="season_bonuses")
 
+    __table_args__ = (
+        # One bonus per QB, type and award period; season-long bonuses have
+        # no period, so NULL is folded to '' to make them unique too
+        Index(
+            "uq_season_bonuses_qb_season_type_period",
+            qb_id, season, bonus_type, func.coalesce(award_period, literal_column("''")),
+            unique=True
+        ),
+    )
+
+# ON CONFLICT target matching uq_season_bonuses_qb_season_type_period
+SEASON_BONUS_KEY = (
+    SeasonBonus.qb_id, SeasonBonus.season, SeasonBonus.bonus_type,
+    func.coalesce(SeasonBonus.award_period, literal_column("''"))
+)
+
 class PlayoffRound(str, enum.Enum):
     WILD_CARD = "WILD_CARD"
     DIVISIONAL = "DIVISIONAL"
@@ -85,3 +126,76 @@ class PlayoffAppearance(Base):
     points = Column(Float, nullable=False)
 
     quarterback = relationship("Quarterback", back_populates="playoff_appearances")
+
+    __table_args__ = (
+        # One appearance per QB per round
+        Index("uq_playoff_appearances_qb_season_round", "qb_id", "season", "round", unique=True),
+    )
+
+# Materialized totals, maintained by TotalsService on every write so read
+# endpoints don't re-aggregate raw scoring rows.
+class QBSeasonTotal(Base):
+    __tablename__ = "qb_season_totals"
+
+    qb_id = Column(Integer, ForeignKey("quarterbacks.id"), primary_key=True)
+    season = Column(Integer, nullable=False, index=True)
+    squad_id = Column(Integer, ForeignKey("squads.id"), nullable=True, index=True)
+    total_points = Column(Float, nullable=False, default=0.0)
+    squad_rank = Column(Integer, nullable=True)
+
+class SquadSeasonTotal(Base):
+    __tablename__ = "squad_season_totals"
+
+    squad_id = Column(Integer, ForeignKey("squads.id"), primary_key=True)
+    season = Column(Integer, nullable=False, index=True)
+    total_points = Column(Float, nullable=False, default=0.0)
+    qb_count = Column(Integer, nullable=False, default=0)
+    rank = Column(Integer, nullable=True)
+
+# Data generation per season. Bumped in the same transaction as every write
+# so caches keyed by it can never serve results from before the write.
+class SeasonVersion(Base):
+    __tablename__ = "season_versions"
+
+    season = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+# Per-season scoring rule overrides (see DEFAULT_SCORING_RULES in
+# app/services/scoring.py); seasons without a row use the league defaults.
+class ScoringRuleSet(Base):
+    __tablename__ = "scoring_rule_sets"
+
+    season = Column(Integer, primary_key=True)
+    rules = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+# Background NFL sync jobs. Rows are kept as the sync history.
+class SyncJob(Base):
+    __tablename__ = "sync_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    season = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    # Dry runs only plan their change set (kept in result["change_set"]);
+    # applied_at is set once it has been applied
+    dry_run = Column(Boolean, nullable=True, default=False)
+    applied_at = Column(DateTime(timezone=True), nullable=True)
+    # host:pid of the process that queued and runs the job
+    runner = Column(String, nullable=True)
+
+# Last fully synced regular season week per season and sync source
+# ("weekly_stats", "wins"), so incremental syncs only process new games.
+class SyncWatermark(Base):
+    __tablename__ = "sync_watermarks"
+
+    season = Column(Integer, primary_key=True)
+    source = Column(String, primary_key=True)
+    last_week = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
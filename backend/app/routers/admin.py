@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from app.database.config import get_db
+from pydantic import BaseModel, ValidationError
+from app.database.config import engine, get_db
+from app.database.engine_config import pool_metrics, pool_status
+from app.database import async_config
+from app.database.upsert import upsert
 from app.models.models import (
     WeeklyStat, SeasonBonus, PlayoffAppearance, Quarterback,
-    BonusType, PlayoffRound
+    BonusType, PlayoffRound, SEASON_BONUS_KEY
 )
 from app.services.scoring import ScoringEngine
-from app.services.nfl_stats import NFLStatsService
+from app.services.scoring_rules import ScoringRuleService
+from app.services.totals import TotalsService
+from app.services.cache import standings_cache
+from app.services.errors import StaleChangeSetError
+from app.services.standings_stream import standings_broadcaster
+from app.services.jobs import job_runner
+from app.services.bulk_ingest import BulkIngestService
+from app.services.awards import AwardService
+from typing import Dict, List, Optional, Tuple
 import os
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -59,6 +70,9 @@ class PlayoffAppearanceCreate(BaseModel):
     round: str
     won_super_bowl: bool = False
 
+class PlayerIdUpdate(BaseModel):
+    gsis_id: Optional[str] = None
+
 @router.post("/weekly-stats/")
 def add_weekly_stat(stat_data: WeeklyStatCreate, db: Session = Depends(get_db)):
     """
@@ -70,35 +84,35 @@ def add_weekly_stat(stat_data: WeeklyStatCreate, db: Session = Depends(get_db)):
     if not qb:
         raise HTTPException(status_code=404, detail="Quarterback not found")
 
-    # Check if stat already exists for this week
-    existing_stat = db.query(WeeklyStat).filter(
-        WeeklyStat.qb_id == stat_data.qb_id,
-        WeeklyStat.week == stat_data.week,
-        WeeklyStat.season == stat_data.season
-    ).first()
-
-    if existing_stat:
-        # Update existing stat
-        for key, value in stat_data.model_dump().items():
-            if key not in ["qb_id", "week", "season"]:
-                setattr(existing_stat, key, value)
-        stat = existing_stat
-    else:
-        # Create new stat
-        stat = WeeklyStat(**stat_data.model_dump())
-        db.add(stat)
-
     # Calculate points
-    stat.points = ScoringEngine.calculate_weekly_points(stat)
+    values = stat_data.model_dump()
+    points = ScoringEngine.calculate_weekly_points(
+        WeeklyStat(**values), ScoringRuleService.get_rules(db, stat_data.season)
+    )
 
+    # Points of the stat line being replaced, if this week was already entered
+    previous_points = db.query(WeeklyStat.points).filter(
+        WeeklyStat.qb_id == stat_data.qb_id,
+        WeeklyStat.season == stat_data.season,
+        WeeklyStat.week == stat_data.week
+    ).scalar() or 0.0
+
+    # Insert, or update the existing line for this QB and week
+    upsert(
+        db,
+        WeeklyStat,
+        [{**values, "points": points}],
+        conflict_columns=["qb_id", "season", "week"],
+        update_columns=[key for key in values if key not in ("qb_id", "season", "week")] + ["points"]
+    )
+    TotalsService.apply_qb_delta(db, qb, points - previous_points)
     db.commit()
-    db.refresh(stat)
 
     return {
         "message": "Weekly stats saved successfully",
-        "week": stat.week,
+        "week": stat_data.week,
         "qb_name": qb.name,
-        "points": stat.points
+        "points": points
     }
 
 @router.post("/bonuses/")
@@ -118,28 +132,21 @@ def add_season_bonus(bonus_data: SeasonBonusCreate, db: Session = Depends(get_db
         raise HTTPException(status_code=400, detail=f"Invalid bonus type: {bonus_data.bonus_type}")
 
     # Calculate points for this bonus
-    points = ScoringEngine.get_bonus_points(bonus_type)
-
-    # Check if bonus already exists
-    existing_bonus = db.query(SeasonBonus).filter(
-        SeasonBonus.qb_id == bonus_data.qb_id,
-        SeasonBonus.season == bonus_data.season,
-        SeasonBonus.bonus_type == bonus_type
-    ).first()
-
-    if existing_bonus:
+    points = ScoringEngine.get_bonus_points(bonus_type, ScoringRuleService.get_rules(db, bonus_data.season))
+
+    # Create bonus; the unique index rejects a second copy
+    created = upsert(
+        db,
+        SeasonBonus,
+        [{"qb_id": bonus_data.qb_id, "season": bonus_data.season, "bonus_type": bonus_type, "points": points}],
+        conflict_columns=SEASON_BONUS_KEY,
+        update_columns=[]
+    )
+    if not created:
         raise HTTPException(status_code=400, detail="This bonus already exists for this QB")
 
-    # Create bonus
-    bonus = SeasonBonus(
-        qb_id=bonus_data.qb_id,
-        season=bonus_data.season,
-        bonus_type=bonus_type,
-        points=points
-    )
-    db.add(bonus)
+    TotalsService.apply_qb_delta(db, qb, points)
     db.commit()
-    db.refresh(bonus)
 
     return {
         "message": "Bonus added successfully",
@@ -165,29 +172,29 @@ def add_playoff_appearance(playoff_data: PlayoffAppearanceCreate, db: Session =
         raise HTTPException(status_code=400, detail=f"Invalid playoff round: {playoff_data.round}")
 
     # Calculate points for this playoff appearance
-    points = ScoringEngine.get_playoff_points(playoff_round, playoff_data.won_super_bowl)
-
-    # Check if playoff appearance already exists
-    existing_playoff = db.query(PlayoffAppearance).filter(
-        PlayoffAppearance.qb_id == playoff_data.qb_id,
-        PlayoffAppearance.season == playoff_data.season,
-        PlayoffAppearance.round == playoff_round
-    ).first()
+    points = ScoringEngine.get_playoff_points(
+        playoff_round, playoff_data.won_super_bowl, ScoringRuleService.get_rules(db, playoff_data.season)
+    )
 
-    if existing_playoff:
+    # Create playoff appearance; the unique index rejects a second copy
+    created = upsert(
+        db,
+        PlayoffAppearance,
+        [{
+            "qb_id": playoff_data.qb_id,
+            "season": playoff_data.season,
+            "round": playoff_round,
+            "won_super_bowl": playoff_data.won_super_bowl,
+            "points": points
+        }],
+        conflict_columns=["qb_id", "season", "round"],
+        update_columns=[]
+    )
+    if not created:
         raise HTTPException(status_code=400, detail="This playoff appearance already exists for this QB")
 
-    # Create playoff appearance
-    playoff = PlayoffAppearance(
-        qb_id=playoff_data.qb_id,
-        season=playoff_data.season,
-        round=playoff_round,
-        won_super_bowl=playoff_data.won_super_bowl,
-        points=points
-    )
-    db.add(playoff)
+    TotalsService.apply_qb_delta(db, qb, points)
     db.commit()
-    db.refresh(playoff)
 
     return {
         "message": "Playoff appearance added successfully",
@@ -196,182 +203,346 @@ def add_playoff_appearance(playoff_data: PlayoffAppearanceCreate, db: Session =
         "points": points
     }
 
+async def bulk_rows(request: Request) -> List:
+    """
+    Read a bulk request body: a JSON array of objects, or CSV with a header
+    row (Content-Type: text/csv) using the single-record field names.
+    """
+    try:
+        return BulkIngestService.parse_rows(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _validate_rows(rows: List, schema) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+    """Validate each row against the single-record schema; rows are numbered from 1."""
+    valid, errors = [], []
+    for row, data in enumerate(rows, start=1):
+        if not isinstance(data, dict):
+            errors.append({"row": row, "status": "error", "error": "Row must be an object"})
+            continue
+        try:
+            valid.append((row, schema(**data).model_dump()))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            errors.append({"row": row, "status": "error", "error": message})
+    return valid, errors
+
+def _bulk_response(results: List[Dict], errors: List[Dict], dry_run: bool) -> Dict:
+    results = sorted(results + errors, key=lambda result: result["row"])
+    counts = {status: 0 for status in ("created", "updated", "unchanged", "error")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "dry_run": dry_run,
+        "received": len(results),
+        **counts,
+        "results": results
+    }
+
+@router.post("/weekly-stats/bulk/")
+def bulk_add_weekly_stats(dry_run: bool = False, rows: List = Depends(bulk_rows), db: Session = Depends(get_db)):
+    """
+    Add or update many weekly stat lines in one transaction.
+
+    Takes a JSON array of weekly-stats records or a text/csv body with the
+    same columns (qb_id, week, season, passing_yards, ...). Rows with
+    errors are reported and skipped; the rest are saved. Re-sending a
+    batch is safe: identical rows come back as unchanged.
+    """
+    valid, errors = _validate_rows(rows, WeeklyStatCreate)
+    results = BulkIngestService.weekly_stats(db, valid, dry_run=dry_run)
+    return _bulk_response(results, errors, dry_run)
+
+@router.post("/bonuses/bulk/")
+def bulk_add_season_bonuses(dry_run: bool = False, rows: List = Depends(bulk_rows), db: Session = Depends(get_db)):
+    """
+    Add many season bonuses in one transaction (JSON array or text/csv
+    with qb_id, season, bonus_type). Bonuses a QB already has are
+    reported as unchanged.
+    """
+    valid, errors = _validate_rows(rows, SeasonBonusCreate)
+    results = BulkIngestService.bonuses(db, valid, dry_run=dry_run)
+    return _bulk_response(results, errors, dry_run)
+
+@router.post("/playoffs/bulk/")
+def bulk_add_playoff_appearances(dry_run: bool = False, rows: List = Depends(bulk_rows), db: Session = Depends(get_db)):
+    """
+    Add or update many playoff appearances in one transaction (JSON array
+    or text/csv with qb_id, season, round, won_super_bowl).
+    """
+    valid, errors = _validate_rows(rows, PlayoffAppearanceCreate)
+    results = BulkIngestService.playoffs(db, valid, dry_run=dry_run)
+    return _bulk_response(results, errors, dry_run)
+
+@router.post("/quarterbacks/{qb_id}/gsis-id/")
+def set_qb_gsis_id(qb_id: int, data: PlayerIdUpdate, db: Session = Depends(get_db)):
+    """
+    Set (or clear, with null) a QB's nflverse player ID so the NFL sync
+    matches them by ID instead of by name. Use it for QBs a sync reports in
+    unmatched_roster.
+    """
+    qb = db.query(Quarterback).filter(Quarterback.id == qb_id).first()
+    if not qb:
+        raise HTTPException(status_code=404, detail="Quarterback not found")
+
+    gsis_id = data.gsis_id.strip() if data.gsis_id else None
+    if gsis_id:
+        taken = db.query(Quarterback).filter(
+            Quarterback.season == qb.season,
+            Quarterback.gsis_id == gsis_id,
+            Quarterback.id != qb.id
+        ).first()
+        if taken:
+            raise HTTPException(status_code=409, detail=f"{gsis_id} is already assigned to {taken.name}")
+
+    qb.gsis_id = gsis_id
+    db.commit()
+    return {"qb_id": qb.id, "qb_name": qb.name, "gsis_id": qb.gsis_id}
+
+def _enqueue_sync(db: Session, kind: str, season: int, dry_run: bool, response: Response) -> Dict:
+    """
+    Queue a background sync job (or join the one already running) and
+    return it with 202 Accepted. Poll /api/admin/jobs/{id} for the result.
+
+    With dry_run the job only plans the change set (rows to insert, update
+    and delete, point deltas per QB and squad) and writes nothing; review it
+    in the job result and POST /api/admin/jobs/{id}/apply to commit it.
+    """
+    job, coalesced = job_runner.submit(db, kind, season, dry_run)
+    response.status_code = 202
+    return {**job, "coalesced": coalesced}
+
 @router.post("/sync-stats/")
-def sync_nfl_stats(season: int = 2026, db: Session = Depends(get_db)):
+def sync_nfl_stats(response: Response, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
     """
-    Sync NFL season aggregate stats from nflreadpy.
+    Sync NFL season aggregate stats from nflverse data.
     This will fetch season totals for all rostered QBs and update the database.
+    Runs as a background job.
     """
-    try:
-        result = NFLStatsService.sync_qb_season_stats(db, season)
-        return {
-            "message": f"Successfully synced season stats for {season}",
-            **result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to sync stats: {str(e)}")
+    return _enqueue_sync(db, "stats", season, dry_run, response)
 
 @router.post("/sync-wins/")
-def sync_qb_wins(season: int = 2026, db: Session = Depends(get_db)):
+def sync_qb_wins(response: Response, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
     """
     Sync QB wins from NFL game results.
-    Only credits wins to the starting QB for each game.
+    Only credits wins to the starting QB for each game, and reverses stored
+    wins that no game result backs any more. Runs as a background job.
 
     Awards:
     - 3 points for regular season win
     - 4 points for prime time win (games starting at 5 PM or later)
     """
-    try:
-        result = NFLStatsService.sync_qb_wins(db, season)
-        return {
-            "message": f"Successfully synced QB wins for {season}",
-            **result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to sync wins: {str(e)}")
+    return _enqueue_sync(db, "wins", season, dry_run, response)
 
 @router.post("/sync-playoffs/")
-def sync_playoff_wins(season: int = 2026, db: Session = Depends(get_db)):
+def sync_playoff_wins(response: Response, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
     """
-    Sync playoff WINS from NFL game results.
-    Creates PlayoffAppearance entries for QBs who WON in each round.
+    Sync playoff appearances from NFL game results.
+    Creates PlayoffAppearance entries for QBs who started each round, won
+    or lost. Runs as a background job.
 
-    Points per playoff WIN:
+    Points per playoff appearance:
     - Wild Card: 3 points
     - Divisional: 6 points
     - Conference Championship: 10 points
     - Super Bowl: 15 points (+25 bonus)
     """
+    return _enqueue_sync(db, "playoffs", season, dry_run, response)
+
+@router.post("/sync-all/")
+def sync_all(response: Response, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Sync stats, QB wins and playoff wins in one pass.
+
+    Player stats and the schedule are downloaded once (concurrently) and all
+    three stages commit together. Reports per-stage timings.
+    Runs as a background job.
+    """
+    return _enqueue_sync(db, "all", season, dry_run, response)
+
+@router.post("/sync-weekly/")
+def sync_weekly(response: Response, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Incremental sync: per-week stats, wins and playoff wins for only the
+    weeks and games after the season's last synced week.
+
+    The first weekly sync of a season replaces its week-0 season totals with
+    per-week rows. Runs as a background job.
+    """
+    return _enqueue_sync(db, "weekly", season, dry_run, response)
+
+@router.get("/jobs/")
+def list_jobs(season: Optional[int] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """
+    Sync job history, newest first.
+    """
+    return job_runner.list(db, season=season, limit=limit)
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Status of a sync job: progress, duration and result counts once done.
+    """
+    job = job_runner.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs/{job_id}/apply")
+def apply_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Commit the change set of a reviewed dry-run sync job, exactly as
+    planned, in one transaction. Fails with 409 if the season's data
+    changed since the dry run (run it again in that case) or the job was
+    already applied.
+    """
     try:
-        result = NFLStatsService.sync_playoff_appearances(db, season)
-        return {
-            "message": f"Successfully synced playoff wins for {season}",
-            **result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to sync playoffs: {str(e)}")
+        return job_runner.apply(db, job_id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Job not found")
+    except StaleChangeSetError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _apply_awards(db: Session, season: int, payload: Dict, dry_run: bool) -> Dict:
+    try:
+        report = AwardService.apply(db, season, payload, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    verb = "Planned" if dry_run else "Applied"
+    report["message"] = (
+        f"{verb} awards for {season}: {report['inserted']} added, "
+        f"{report['updated']} updated, {report['deleted']} removed"
+    )
+    return report
 
 @router.post("/seed-awards/")
-def seed_awards(season: int = 2026, db: Session = Depends(get_db)):
-    """
-    Seed Player of the Week and Player of the Month awards for the season.
-    Data sourced from Pro-Football-Reference.com.
-
-    Only affects CONF_POW and CONF_POM bonuses - does NOT touch other stats.
-    Safe to run multiple times (clears and re-adds POW/POM awards).
-
-    NOTE: The award lists below are 2025-season data. They are only applied
-    when seeding the 2025 season, so running this for another season simply
-    clears that season's POW/POM bonuses without adding the (wrong) 2025 data.
-    Add a new season's award list here when that data becomes available.
-    """
-    # Award data by season. Add new seasons here as data becomes available.
-    # 2025 Players of the Week - 10 points each (CONF_POW)
-    players_of_week_2025 = [
-        # AFC
-        {"name": "Josh Allen", "week": 1},
-        {"name": "Josh Allen", "week": 11},
-        {"name": "Josh Allen", "week": 14},
-        {"name": "Patrick Mahomes", "week": 4},
-        {"name": "Patrick Mahomes", "week": 6},
-        {"name": "C.J. Stroud", "week": 5},
-        {"name": "Lamar Jackson", "week": 9},
-        {"name": "Drake Maye", "week": 13},
-        {"name": "Trevor Lawrence", "week": 15},
-        {"name": "Joe Burrow", "week": 16},
-        # NFC
-        {"name": "J.J. McCarthy", "week": 1},
-        {"name": "Jared Goff", "week": 2},
-        {"name": "Caleb Williams", "week": 3},
-        {"name": "Jordan Love", "week": 8},
-        {"name": "Jordan Love", "week": 13},
-        {"name": "Bryce Young", "week": 11},
-        {"name": "Brock Purdy", "week": 16},
-        {"name": "Matthew Stafford", "week": 18},
-    ]
-
-    # 2025 Players of the Month - 20 points each (CONF_POM)
-    players_of_month_2025 = [
-        {"name": "Trevor Lawrence", "month": "December"},
-        {"name": "Matthew Stafford", "month": "November"},
-        {"name": "Matthew Stafford", "month": "December"},
-    ]
-
-    # Select the award data for the requested season. Only 2025 data exists;
-    # other seasons get empty lists so we never apply 2025 awards elsewhere.
-    awards_by_season = {
-        2025: (players_of_week_2025, players_of_month_2025),
-    }
-    players_of_week, players_of_month = awards_by_season.get(season, ([], []))
+def seed_awards(season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Seed a season's awards (Player of the Week/Month, MVP voting, Rookie of
+    the Year) from its data file, backend/data/awards/<season>.json.
 
-    # Clear existing POW/POM bonuses for the season
-    db.query(SeasonBonus).filter(
-        SeasonBonus.season == season,
-        SeasonBonus.bonus_type.in_([BonusType.CONF_POW, BonusType.CONF_POM])
-    ).delete(synchronize_session=False)
-    db.commit()
+    Re-seeding is an idempotent diff: only awards that were added, removed
+    or re-valued change, and other bonuses are never touched. Award names
+    not on the season's roster are listed in unmatched_names.
 
-    pow_count = 0
-    pom_count = 0
-    pow_points = 0
-    pom_points = 0
-    team_points = {}
-
-    # Add Players of the Week
-    for award in players_of_week:
-        qb = db.query(Quarterback).filter(
-            Quarterback.name == award["name"],
-            Quarterback.season == season
-        ).first()
+    A season without a data file yet (e.g. the current one before its
+    awards are announced) changes nothing and reports zero awards.
+    """
+    try:
+        payload = AwardService.load(season)
+    except LookupError as e:
+        report = AwardService.empty_report(season, dry_run)
+        report["message"] = f"{e}; nothing changed"
+        return report
+    return _apply_awards(db, season, payload, dry_run)
+
+@router.post("/awards/")
+def upload_awards(payload: Dict, season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Apply an uploaded award data set (same format as the data files) to a
+    season, e.g. before the file is committed. See seed-awards.
+    """
+    return _apply_awards(db, season, payload, dry_run)
 
-        if qb:
-            bonus = SeasonBonus(
-                qb_id=qb.id,
-                season=season,
-                bonus_type=BonusType.CONF_POW,
-                points=10.0
-            )
-            db.add(bonus)
-            pow_count += 1
-            pow_points += 10
-
-            if qb.squad:
-                team_points[qb.squad.name] = team_points.get(qb.squad.name, 0) + 10
-
-    # Add Players of the Month
-    for award in players_of_month:
-        qb = db.query(Quarterback).filter(
-            Quarterback.name == award["name"],
-            Quarterback.season == season
-        ).first()
+class ScoringRulesUpdate(BaseModel):
+    rules: Dict
 
-        if qb:
-            bonus = SeasonBonus(
-                qb_id=qb.id,
-                season=season,
-                bonus_type=BonusType.CONF_POM,
-                points=20.0
-            )
-            db.add(bonus)
-            pom_count += 1
-            pom_points += 20
+@router.get("/scoring-rules/")
+def get_scoring_rules(season: int = 2026, db: Session = Depends(get_db)):
+    """
+    The season's scoring rule set (league defaults unless overridden).
+    """
+    return {
+        "season": season,
+        "custom": ScoringRuleService.is_custom(db, season),
+        "rules": ScoringRuleService.get_rules(db, season)
+    }
 
-            if qb.squad:
-                team_points[qb.squad.name] = team_points.get(qb.squad.name, 0) + 20
+@router.put("/scoring-rules/")
+def set_scoring_rules(
+    data: ScoringRulesUpdate,
+    season: int = 2026,
+    rescore: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Override the season's scoring rules. Only the keys given change; the
+    rest keep the league defaults. Yards-per-point values must divide 100
+    and point values have at most 2 decimals.
 
+    With rescore (the default) every stored points value of the season is
+    recomputed under the new rules in the same request, and the standings
+    deltas are returned.
+    """
+    try:
+        rules = ScoringRuleService.set_rules(db, season, data.rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if rescore:
+        return ScoringRuleService.rescore(db, season)
     db.commit()
+    return {"season": season, "rules": rules}
 
-    return {
-        "message": f"Awards seeded successfully for {season}",
-        "pow_awards": pow_count,
-        "pow_points": pow_points,
-        "pom_awards": pom_count,
-        "pom_points": pom_points,
-        "total_awards": pow_count + pom_count,
-        "total_points": pow_points + pom_points,
-        "points_by_team": team_points
-    }
+@router.post("/rescore/")
+def rescore_season(season: int = 2026, dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Recompute every stored points value (weekly stats, bonuses, playoff
+    appearances) of a season under its scoring rules with set-based
+    UPDATEs and rebuild its totals. Reports the rows changed and how each
+    QB's and squad's total and rank moved; dry_run rolls it all back.
+    """
+    return ScoringRuleService.rescore(db, season, dry_run=dry_run)
 
+@router.get("/totals/check/")
+def check_totals(season: int = 2026, repair: bool = False, db: Session = Depends(get_db)):
+    """
+    Verify the materialized QB/squad totals against a from-scratch rebuild.
+    Reports any drift; pass repair=true to rebuild the season when drift is found.
+    """
+    return TotalsService.check_consistency(db, season, repair=repair)
+
+@router.get("/cache-stats/")
+def get_cache_stats():
+    """
+    Report standings cache hit/miss/eviction counters and cached seasons.
+    """
+    return standings_cache.stats()
+
+@router.get("/db-stats/")
+def get_db_stats(reset: bool = False):
+    """
+    Report live connection pool state (checked out, overflow) for the sync
+    engine and, in async mode, the async engine, plus checkout wait and
+    query timing counters since startup or the last reset=true.
+    """
+    pools = {"sync": pool_status(engine)}
+    if async_config.async_engine is not None:
+        pools["async"] = pool_status(async_config.async_engine.sync_engine)
+    stats = {"dialect": engine.dialect.name, "pools": pools, "metrics": pool_metrics.snapshot()}
+    if reset:
+        pool_metrics.reset()
+    return stats
+
+@router.get("/stream-stats/")
+def get_stream_stats():
+    """
+    Report live standings stream clients per season and how many updates
+    and slow-client resyncs have been sent.
+    """
+    return standings_broadcaster.stats()
+
+@router.get("/nfl-cache/")
+def get_nfl_cache():
+    """
+    List cached nflverse files with their fetch and revalidation times.
+    """
+    # Imported here so the API starts without Polars
+    from app.services.nfl_data import NFLDataCache
+    return {"files": NFLDataCache.status()}
 
 @router.get("/debug-nfl-columns/")
 def debug_nfl_columns(season: int = 2024):
@@ -379,15 +550,19 @@ def debug_nfl_columns(season: int = 2024):
     Debug endpoint to see what columns are available in NFL data.
     """
     try:
-        import nflreadpy as nfl
-        stats = nfl.load_player_stats(seasons=[season], summary_level="reg")
-        data = stats.to_pandas()
-        qb_data = data[data['position'] == 'QB']
+        import polars as pl
+        from app.services.nfl_data import NFLDataCache
+        data = NFLDataCache.scan("player_stats_reg", season)
+        counts = data.select(
+            pl.len().alias("total_players"),
+            (pl.col('position') == 'QB').sum().alias("total_qbs")
+        ).collect().row(0, named=True)
+        sample = data.filter(pl.col('position') == 'QB').head(1).collect()
         return {
-            "columns": list(data.columns),
-            "total_players": len(data),
-            "total_qbs": len(qb_data),
-            "sample_qb": qb_data.head(1).to_dict('records')[0] if len(qb_data) > 0 else {}
+            "columns": data.collect_schema().names(),
+            "total_players": counts["total_players"],
+            "total_qbs": counts["total_qbs"],
+            "sample_qb": sample.to_dicts()[0] if sample.height > 0 else {}
         }
     except Exception as e:
         return {"error": str(e)}
@@ -515,6 +690,7 @@ def seed_database(season: int = 2026, db: Session = Depends(get_db)):
             db.add(qb)
             total_qbs += 1
 
+    TotalsService.rebuild_season(db, season)
     db.commit()
 
     return {
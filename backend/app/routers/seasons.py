@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+from app.database.async_config import get_read_db, run_read
+from app.services.snapshot import SnapshotService
+from app.services.cache import standings_cache
+from app.services.http_cache import conditional_get, json_body_response, serialize_json
+
+router = APIRouter(prefix="/api/seasons", tags=["seasons"])
+
+def _snapshot(db: Session, request: Request, response: Response, season: int):
+    not_modified = conditional_get(request, response, db, season, "snapshot")
+    if not_modified:
+        return not_modified
+
+    # Cache the serialized body, so repeat requests skip both the build and
+    # the JSON encoding
+    body = standings_cache.get_or_compute(
+        db, season, "snapshot",
+        lambda: serialize_json(SnapshotService.build(db, season))
+    )
+    return json_body_response(response, body)
+
+@router.get("/{season}/snapshot")
+async def get_season_snapshot(season: int, request: Request, response: Response, db=Depends(get_read_db)):
+    """
+    Get everything the Home, Rosters and Player Standings pages show for a
+    season in one payload: standings, worst QB, squads, every squad's roster
+    with top-5 flags, and the QB leaderboard.
+    """
+    return await run_read(db, _snapshot, request, response, season)
@@ -1,66 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app.database.config import get_db
+from app.database.async_config import get_read_db, run_read
 from app.models.models import Squad
 from app.services.standings import StandingsService
+from app.services.qb_details import QuarterbackDetailService
+from app.services.cache import standings_cache
+from app.services.http_cache import conditional_get, json_body_response, serialize_json
 
 router = APIRouter(prefix="/api/squads", tags=["squads"])
 
+def _squads(db: Session, request: Request, response: Response, season: int):
+    not_modified = conditional_get(request, response, db, season, "squads")
+    if not_modified:
+        return not_modified
+
+    def build_squads():
+        result = []
+        for squad in StandingsService.get_squad_totals(db, season):
+            result.append({
+                "id": squad["id"],
+                "name": squad["name"],
+                "owner": squad["owner"],
+                "season": squad["season"],
+                "total_points": squad["total_points"],
+                "qb_count": squad["qb_count"]
+            })
+        return serialize_json({"season": season, "squads": result})
+
+    body = standings_cache.get_or_compute(db, season, "squads", build_squads)
+    return json_body_response(response, body)
+
 @router.get("/")
-def get_all_squads(season: int = 2026, db: Session = Depends(get_db)):
+async def get_all_squads(request: Request, response: Response, season: int = 2026, db=Depends(get_read_db)):
     """
     Get all squads for a season with their total points.
     """
-    squads = db.query(Squad).filter(Squad.season == season).all()
-
-    result = []
-    for squad in squads:
-        total_points = StandingsService.get_squad_total_points(squad)
-        result.append({
-            "id": squad.id,
-            "name": squad.name,
-            "owner": squad.owner,
-            "season": squad.season,
-            "total_points": total_points,
-            "qb_count": len(squad.quarterbacks)
+    return await run_read(db, _squads, request, response, season)
+
+def _squad_roster(db: Session, squad_id: int, request: Request, response: Response):
+    squad = db.query(Squad).filter(Squad.id == squad_id).first()
+
+    if not squad:
+        raise HTTPException(status_code=404, detail="Squad not found")
+
+    not_modified = conditional_get(request, response, db, squad.season, f"roster-{squad.id}")
+    if not_modified:
+        return not_modified
+
+    # Get all QBs with points, already sorted by squad rank
+    roster = []
+    for qb in StandingsService.get_ranked_qbs(db, squad.season, squad_id=squad.id):
+        roster.append({
+            "qb_id": qb["qb_id"],
+            "name": qb["name"],
+            "nfl_team": qb["nfl_team"],
+            "total_points": qb["total_points"],
+            "is_top_5": qb["squad_rank"] <= 5,
+            "rank": qb["squad_rank"]
         })
 
-    return {"season": season, "squads": result}
+    return {
+        "squad_id": squad.id,
+        "squad_name": squad.name,
+        "owner": squad.owner,
+        "season": squad.season,
+        "roster": roster
+    }
 
 @router.get("/{squad_id}/roster/")
-def get_squad_roster(squad_id: int, db: Session = Depends(get_db)):
+async def get_squad_roster(squad_id: int, request: Request, response: Response, db=Depends(get_read_db)):
     """
     Get a squad's roster (all QBs) with their individual points.
     Indicates which QBs are in the top 5 (counting toward standings).
     """
+    return await run_read(db, _squad_roster, squad_id, request, response)
+
+def _squad_details(db: Session, squad_id: int, request: Request, response: Response):
     squad = db.query(Squad).filter(Squad.id == squad_id).first()
 
     if not squad:
         raise HTTPException(status_code=404, detail="Squad not found")
 
-    # Get all QBs with points
-    roster = []
-    for qb in squad.quarterbacks:
-        total_points = StandingsService.get_qb_total_points(qb)
-        roster.append({
-            "qb_id": qb.id,
-            "name": qb.name,
-            "nfl_team": qb.nfl_team,
-            "total_points": total_points
-        })
-
-    # Sort by points descending
-    roster.sort(key=lambda x: x["total_points"], reverse=True)
+    not_modified = conditional_get(request, response, db, squad.season, f"squad-details-{squad.id}")
+    if not_modified:
+        return not_modified
 
-    # Mark top 5 QBs
-    for i, qb in enumerate(roster):
-        qb["is_top_5"] = i < 5
-        qb["rank"] = i + 1
+    quarterbacks = QuarterbackDetailService.load_quarterbacks(db, squad_id=squad.id)
 
     return {
         "squad_id": squad.id,
         "squad_name": squad.name,
         "owner": squad.owner,
         "season": squad.season,
-        "roster": roster
+        "quarterbacks": QuarterbackDetailService.get_details(db, quarterbacks)
     }
+
+@router.get("/{squad_id}/details/")
+async def get_squad_details(squad_id: int, request: Request, response: Response, db=Depends(get_read_db)):
+    """
+    Get the detailed scoring breakdown of every QB on a squad's roster,
+    keyed by QB ID.
+    """
+    return await run_read(db, _squad_details, squad_id, request, response)
@@ -1,24 +1,74 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.database.config import get_db
+from app.database.async_config import get_read_db, run_read
 from app.services.standings import StandingsService
+from app.services.cache import standings_cache
+from app.services.http_cache import conditional_get, json_body_response, serialize_json
+from app.services.standings_stream import StreamFullError, standings_broadcaster
 
 router = APIRouter(prefix="/api/standings", tags=["standings"])
 
+# Served uncompressed (see SelectiveGZipMiddleware in main.py)
+STREAM_ROUTE = "/stream/"
+STREAM_PATH = router.prefix + STREAM_ROUTE
+
+def _standings(db: Session, request: Request, response: Response, season: int):
+    not_modified = conditional_get(request, response, db, season, "standings")
+    if not_modified:
+        return not_modified
+
+    body = standings_cache.get_or_compute(
+        db, season, "standings",
+        lambda: serialize_json({"season": season, "standings": StandingsService.get_league_standings(db, season)})
+    )
+    return json_body_response(response, body)
+
 @router.get("/")
-def get_standings(season: int = 2026, db: Session = Depends(get_db)):
+async def get_standings(request: Request, response: Response, season: int = 2026, db=Depends(get_read_db)):
     """
     Get league standings for a season.
     Squads are ranked by total points (sum of top 5 QBs).
     """
-    standings = StandingsService.get_league_standings(db, season)
-    return {"season": season, "standings": standings}
+    return await run_read(db, _standings, request, response, season)
+
+def _worst_qb(db: Session, request: Request, response: Response, season: int):
+    not_modified = conditional_get(request, response, db, season, "worst-qb")
+    if not_modified:
+        return not_modified
+
+    body = standings_cache.get_or_compute(
+        db, season, "worst_qb",
+        lambda: serialize_json({"season": season, "worst_qb": StandingsService.get_worst_qb(db, season)})
+    )
+    return json_body_response(response, body)
 
 @router.get("/worst-qb/")
-def get_worst_qb(season: int = 2026, db: Session = Depends(get_db)):
+async def get_worst_qb(request: Request, response: Response, season: int = 2026, db=Depends(get_read_db)):
     """
     Get the worst QB (lowest points > 0) for the season.
     Used for league naming tradition.
     """
-    worst_qb = StandingsService.get_worst_qb(db, season)
-    return {"season": season, "worst_qb": worst_qb}
+    return await run_read(db, _worst_qb, request, response, season)
+
+@router.get(STREAM_ROUTE)
+async def stream_standings(season: int = 2026):
+    """
+    Server-Sent Events stream of a season's standings: the full standings
+    on connect, then an update with the changed squads, rank moves and any
+    worst-QB change after each write that moves them.
+    """
+    try:
+        standings_broadcaster.check_capacity()
+    except StreamFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(
+        standings_broadcaster.events(season),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Keeps proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no",
+        }
+    )
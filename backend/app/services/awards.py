@@ -0,0 +1,238 @@
+"""
+Season award data (Player of the Week/Month, MVP voting, Rookie of the Year).
+
+Award lists live in versioned data files, backend/data/awards/<season>.json,
+or arrive through the admin upload endpoint, in the same format:
+
+    {
+      "season": 2025,
+      "source": "Pro-Football-Reference.com",
+      "awards": [
+        {"award": "CONF_POW", "period": "Week 1", "name": "Josh Allen"},
+        {"award": "MVP", "name": "Josh Allen"}
+      ]
+    }
+
+"award" is a BonusType name. "period" tells repeat awards apart (a QB can
+win POW several times) and is stored as SeasonBonus.award_period. A data set
+is the complete list for every award type it covers: POW and POM always,
+plus any other type it mentions. Applying it diffs against the stored
+bonuses of those types, so re-seeding the same data changes nothing.
+"""
+from sqlalchemy.orm import Session
+from app.database.upsert import upsert
+from app.models.models import Quarterback, Squad, SeasonBonus, BonusType, SEASON_BONUS_KEY
+from app.services.roster_index import normalize_name
+from app.services.scoring import ScoringEngine
+from app.services.scoring_rules import ScoringRuleService
+from app.services.totals import TotalsService
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+
+AWARDS_DIR = Path(__file__).resolve().parents[2] / "data" / "awards"
+
+# Award types every data set covers, even when it lists none of them
+ALWAYS_COVERED = {BonusType.CONF_POW, BonusType.CONF_POM}
+
+class AwardService:
+    """
+    Loads award data sets and applies them to a season's bonuses.
+    """
+
+    @staticmethod
+    def path(season: int) -> Path:
+        return AWARDS_DIR / f"{season}.json"
+
+    @staticmethod
+    def load(season: int) -> Dict:
+        """
+        Read a season's award data file.
+
+        Raises:
+            LookupError: No data file for the season
+        """
+        path = AwardService.path(season)
+        if not path.exists():
+            raise LookupError(f"No award data for {season} (expected {path.name} in data/awards)")
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def parse(payload: Dict, season: int) -> List[Dict]:
+        """
+        Validate an award data set.
+
+        Raises:
+            ValueError: Wrong season, unknown award types, missing names or
+                the same award listed twice
+
+        Returns:
+            Award entries with bonus_type, period and name
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get("awards"), list):
+            raise ValueError('Award data must be an object with an "awards" list')
+        if payload.get("season", season) != season:
+            raise ValueError(f"Award data is for {payload['season']}, not {season}")
+
+        entries, seen = [], set()
+        for i, award in enumerate(payload["awards"], start=1):
+            if not isinstance(award, dict) or not award.get("name"):
+                raise ValueError(f"Award {i}: expected an object with a name")
+            try:
+                bonus_type = BonusType[award.get("award", "")]
+            except KeyError:
+                raise ValueError(f"Award {i}: invalid award type {award.get('award')!r}")
+            period = award.get("period")
+            period = str(period).strip() if period not in (None, "") else None
+            key = (normalize_name(award["name"]), bonus_type, period)
+            if key in seen:
+                raise ValueError(f"Award {i}: {award['name']} {bonus_type.value} {period or ''} is listed twice")
+            seen.add(key)
+            entries.append({"bonus_type": bonus_type, "period": period, "name": award["name"]})
+        return entries
+
+    @staticmethod
+    def resolve_names(db: Session, season: int, names: List[str]) -> Dict[str, Tuple[int, Optional[str]]]:
+        """
+        Match award names to the season's roster with one QB/squad join,
+        comparing normalized names ("CJ Stroud" finds "C.J. Stroud").
+
+        Returns:
+            name -> (qb_id, squad name) for every name that matched
+        """
+        roster = {}
+        for qb_id, qb_name, squad_name in db.query(Quarterback.id, Quarterback.name, Squad.name).outerjoin(
+            Squad, Squad.id == Quarterback.squad_id
+        ).filter(Quarterback.season == season):
+            roster.setdefault(normalize_name(qb_name), (qb_id, squad_name))
+        return {name: roster[normalize_name(name)] for name in names if normalize_name(name) in roster}
+
+    @staticmethod
+    def empty_report(season: int, dry_run: bool = False) -> Dict:
+        """apply's report for a season with no award data: nothing changed."""
+        return {
+            "season": season,
+            "source": None,
+            "dry_run": dry_run,
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+            "unchanged": 0,
+            "unmatched_names": [],
+            "awards": {},
+            "total_awards": 0,
+            "total_points": 0.0,
+            "points_by_team": {},
+        }
+
+    @staticmethod
+    def apply(db: Session, season: int, payload: Dict, dry_run: bool = False) -> Dict:
+        """
+        Make a season's award bonuses match a data set: delete awards no
+        longer listed, then upsert new awards and awards whose value changed
+        under the season's scoring rules with a batched bulk upsert.
+
+        Args:
+            db: Database session
+            season: Season year
+            payload: Award data set (see module docstring)
+            dry_run: Report the diff, then roll back
+
+        Raises:
+            ValueError: Invalid award data (see parse)
+
+        Returns:
+            Counts of inserted/updated/deleted/unchanged awards, names not
+            on the roster, and award totals by type and squad. "unchanged"
+            counts listed awards already stored with the same points
+            (stored matches minus updated); entries whose name isn't on the
+            roster are only in unmatched_names.
+        """
+        entries = AwardService.parse(payload, season)
+        covered = ALWAYS_COVERED | {entry["bonus_type"] for entry in entries}
+        rules = ScoringRuleService.get_rules(db, season)
+        matches = AwardService.resolve_names(db, season, [entry["name"] for entry in entries])
+
+        desired = {}
+        unmatched = []
+        for entry in entries:
+            if entry["name"] not in matches:
+                unmatched.append(entry["name"])
+                continue
+            qb_id, squad_name = matches[entry["name"]]
+            desired[(qb_id, entry["bonus_type"], entry["period"])] = {
+                "points": ScoringEngine.get_bonus_points(entry["bonus_type"], rules),
+                "squad_name": squad_name,
+            }
+
+        # Pair stored bonuses with listed awards; everything else of a
+        # covered type (including duplicate copies from older seeds) goes
+        existing, deletes = {}, []
+        for bonus_id, qb_id, bonus_type, period, points in db.query(
+            SeasonBonus.id, SeasonBonus.qb_id, SeasonBonus.bonus_type, SeasonBonus.award_period, SeasonBonus.points
+        ).filter(SeasonBonus.season == season, SeasonBonus.bonus_type.in_(covered)).order_by(SeasonBonus.id):
+            key = (qb_id, bonus_type, period)
+            if key in desired and key not in existing:
+                existing[key] = (bonus_id, points)
+            else:
+                deletes.append((bonus_id, qb_id, points))
+
+        deltas: Dict[int, float] = {}
+        for _, qb_id, points in deletes:
+            deltas[qb_id] = deltas.get(qb_id, 0.0) - points
+
+        writes, inserted, updated = [], 0, 0
+        for key, award in desired.items():
+            qb_id, bonus_type, period = key
+            previous_points = existing[key][1] if key in existing else None
+            if previous_points == award["points"]:
+                continue
+            if previous_points is None:
+                inserted += 1
+            else:
+                updated += 1
+            writes.append({
+                "qb_id": qb_id, "season": season, "bonus_type": bonus_type,
+                "award_period": period, "points": award["points"]
+            })
+            deltas[qb_id] = deltas.get(qb_id, 0.0) + award["points"] - (previous_points or 0.0)
+
+        # Deletes go first so a re-listed award never collides with a stale copy
+        if deletes:
+            db.query(SeasonBonus).filter(
+                SeasonBonus.id.in_([bonus_id for bonus_id, _, _ in deletes])
+            ).delete(synchronize_session=False)
+        # New and re-valued awards, UPSERT_BATCH_SIZE rows per statement
+        upsert(db, SeasonBonus, writes, SEASON_BONUS_KEY, ["points"])
+        if deltas:
+            TotalsService.apply_qb_deltas(db, deltas)
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+        awards_by_type: Dict[str, Dict] = {}
+        team_points: Dict[str, float] = {}
+        for (_, bonus_type, _), award in desired.items():
+            totals = awards_by_type.setdefault(bonus_type.value, {"awards": 0, "points": 0.0})
+            totals["awards"] += 1
+            totals["points"] += award["points"]
+            if award["squad_name"]:
+                team_points[award["squad_name"]] = team_points.get(award["squad_name"], 0.0) + award["points"]
+
+        return {
+            "season": season,
+            "source": payload.get("source"),
+            "dry_run": dry_run,
+            "inserted": inserted,
+            "updated": updated,
+            "deleted": len(deletes),
+            "unchanged": len(existing) - updated,
+            "unmatched_names": sorted(set(unmatched)),
+            "awards": awards_by_type,
+            "total_awards": len(desired),
+            "total_points": sum(award["points"] for award in desired.values()),
+            "points_by_team": team_points,
+        }
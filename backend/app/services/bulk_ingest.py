@@ -0,0 +1,266 @@
+"""
+Bulk admin ingestion: many weekly stat lines, bonuses or playoff results in
+one request.
+
+Rows arrive already validated field-by-field (see the admin router). Each
+batch checks every QB id with one query, finds existing rows with one
+query, writes everything in one transaction and applies the point deltas
+to the materialized totals once. Every input row gets a result: created,
+updated, unchanged or error. Rows with errors are skipped; the rest are
+written.
+"""
+from sqlalchemy.orm import Session
+from app.models.models import (
+    Quarterback, WeeklyStat, SeasonBonus, PlayoffAppearance, BonusType, PlayoffRound, SEASON_BONUS_KEY
+)
+from app.database.upsert import upsert
+from app.services.scoring import ScoringEngine, WEEKLY_SCORING_COLUMNS
+from app.services.scoring_rules import ScoringRuleService
+from app.services.totals import TotalsService
+from typing import Dict, List, Tuple
+import csv
+import io
+import json
+
+# Largest batch one request may carry
+MAX_BULK_ROWS = 5000
+
+WEEKLY_KEY = ("qb_id", "season", "week")
+WEEKLY_VALUE_COLUMNS = list(WEEKLY_SCORING_COLUMNS)
+
+def _error(row: int, message: str) -> Dict:
+    return {"row": row, "status": "error", "error": message}
+
+class BulkIngestService:
+    """
+    Batch counterparts of the single-record admin endpoints.
+    """
+
+    @staticmethod
+    def parse_rows(body: bytes, content_type: str) -> List[Dict]:
+        """
+        Parse a request body into row dicts: a JSON array of objects, or
+        CSV with a header row when the content type is text/csv. Empty CSV
+        cells are dropped so the field defaults apply.
+
+        Raises:
+            ValueError: Unparseable body, not a list, or too many rows
+        """
+        if "csv" in (content_type or "").lower():
+            try:
+                text = body.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                raise ValueError("CSV body must be UTF-8")
+            rows = [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in csv.DictReader(io.StringIO(text))
+            ]
+        else:
+            try:
+                rows = json.loads(body or b"null")
+            except ValueError:
+                raise ValueError("Body must be a JSON array of objects or text/csv")
+            if not isinstance(rows, list):
+                raise ValueError("Body must be a JSON array of objects or text/csv")
+
+        if not rows:
+            raise ValueError("No rows to ingest")
+        if len(rows) > MAX_BULK_ROWS:
+            raise ValueError(f"Too many rows ({len(rows)}); the limit is {MAX_BULK_ROWS} per request")
+        return rows
+
+    @staticmethod
+    def _check_rows(db: Session, rows: List[Tuple[int, Dict]], key: Tuple[str, ...]):
+        """
+        Resolve every QB id with one query and reject unknown QBs and rows
+        repeating an earlier row's key.
+
+        Returns:
+            (accepted rows, error results, qb_id -> QB name)
+        """
+        qb_ids = {data["qb_id"] for _, data in rows}
+        names = dict(db.query(Quarterback.id, Quarterback.name).filter(Quarterback.id.in_(qb_ids)).all())
+
+        accepted, errors, seen = [], [], {}
+        for row, data in rows:
+            row_key = tuple(data[column] for column in key)
+            if data["qb_id"] not in names:
+                errors.append(_error(row, "Quarterback not found"))
+            elif row_key in seen:
+                errors.append(_error(row, f"Duplicate of row {seen[row_key]}"))
+            else:
+                seen[row_key] = row
+                accepted.append((row, data))
+        return accepted, errors, names
+
+    @staticmethod
+    def _rules(db: Session, rows: List[Tuple[int, Dict]]) -> Dict[int, Dict]:
+        return {season: ScoringRuleService.get_rules(db, season) for season in {data["season"] for _, data in rows}}
+
+    @staticmethod
+    def _finish(db: Session, results: List[Dict], deltas: Dict[int, float], dry_run: bool) -> List[Dict]:
+        if deltas:
+            TotalsService.apply_qb_deltas(db, deltas)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+        return sorted(results, key=lambda result: result["row"])
+
+    @staticmethod
+    def weekly_stats(db: Session, rows: List[Tuple[int, Dict]], dry_run: bool = False) -> List[Dict]:
+        """
+        Create or update many weekly stat lines, keyed by (qb, season, week).
+
+        Args:
+            db: Database session
+            rows: (row number, validated WeeklyStatCreate dict) pairs
+            dry_run: Report the results, then roll back
+
+        Returns:
+            One result per row, ordered by row number
+        """
+        accepted, results, names = BulkIngestService._check_rows(db, rows, WEEKLY_KEY)
+        if not accepted:
+            return BulkIngestService._finish(db, results, {}, dry_run)
+
+        existing = {
+            (stat.qb_id, stat.season, stat.week): stat
+            for stat in db.query(WeeklyStat).filter(
+                WeeklyStat.qb_id.in_({data["qb_id"] for _, data in accepted}),
+                WeeklyStat.season.in_({data["season"] for _, data in accepted})
+            )
+        }
+
+        # Score each season's rows in one pass with that season's rules
+        points = {}
+        for season, rules in BulkIngestService._rules(db, accepted).items():
+            season_rows = [(row, data) for row, data in accepted if data["season"] == season]
+            batch = ScoringEngine.calculate_batch(
+                {column: [data[column] for _, data in season_rows] for column in WEEKLY_VALUE_COLUMNS},
+                rules
+            )
+            points.update(zip((row for row, _ in season_rows), batch.to_list()))
+
+        writes, deltas = [], {}
+        for row, data in accepted:
+            current = existing.get(tuple(data[column] for column in WEEKLY_KEY))
+            result = {"row": row, "qb_id": data["qb_id"], "qb_name": names[data["qb_id"]],
+                      "week": data["week"], "points": points[row]}
+            if current is None:
+                result["status"] = "created"
+                previous_points = 0.0
+            elif all(
+                (getattr(current, column) if getattr(current, column) is not None else default) == data[column]
+                for column, default in WEEKLY_SCORING_COLUMNS.items()
+            ) and ScoringEngine.same_points(current.points, points[row]):
+                result["status"] = "unchanged"
+                results.append(result)
+                continue
+            else:
+                result["status"] = "updated"
+                previous_points = current.points or 0.0
+            writes.append({**data, "points": points[row]})
+            deltas[data["qb_id"]] = deltas.get(data["qb_id"], 0.0) + points[row] - previous_points
+            results.append(result)
+
+        upsert(db, WeeklyStat, writes, WEEKLY_KEY, WEEKLY_VALUE_COLUMNS + ["points"])
+        return BulkIngestService._finish(db, results, deltas, dry_run)
+
+    @staticmethod
+    def bonuses(db: Session, rows: List[Tuple[int, Dict]], dry_run: bool = False) -> List[Dict]:
+        """
+        Add many season bonuses. A bonus the QB already has is reported as
+        unchanged, so a batch can be re-sent safely.
+
+        Args:
+            db: Database session
+            rows: (row number, validated SeasonBonusCreate dict) pairs
+            dry_run: Report the results, then roll back
+
+        Returns:
+            One result per row, ordered by row number
+        """
+        valid, results = [], []
+        for row, data in rows:
+            try:
+                valid.append((row, {**data, "bonus_type": BonusType[data["bonus_type"]]}))
+            except KeyError:
+                results.append(_error(row, f"Invalid bonus type: {data['bonus_type']}"))
+
+        key = ("qb_id", "season", "bonus_type")
+        accepted, errors, names = BulkIngestService._check_rows(db, valid, key)
+        results += errors
+        existing = set(
+            db.query(SeasonBonus.qb_id, SeasonBonus.season, SeasonBonus.bonus_type).filter(
+                SeasonBonus.qb_id.in_({data["qb_id"] for _, data in accepted}),
+                # Bulk bonuses are season-long; per-period awards are separate rows
+                SeasonBonus.award_period.is_(None)
+            ).all()
+        ) if accepted else set()
+        rules = BulkIngestService._rules(db, accepted)
+
+        inserts, deltas = [], {}
+        for row, data in accepted:
+            points = ScoringEngine.get_bonus_points(data["bonus_type"], rules[data["season"]])
+            status = "unchanged" if tuple(data[column] for column in key) in existing else "created"
+            results.append({"row": row, "status": status, "qb_id": data["qb_id"], "qb_name": names[data["qb_id"]],
+                            "bonus_type": data["bonus_type"].value, "points": points})
+            if status == "created":
+                inserts.append({**data, "points": points})
+                deltas[data["qb_id"]] = deltas.get(data["qb_id"], 0.0) + points
+
+        upsert(db, SeasonBonus, inserts, SEASON_BONUS_KEY, [])
+        return BulkIngestService._finish(db, results, deltas, dry_run)
+
+    @staticmethod
+    def playoffs(db: Session, rows: List[Tuple[int, Dict]], dry_run: bool = False) -> List[Dict]:
+        """
+        Create or update many playoff appearances, keyed by (qb, season,
+        round); an existing appearance takes the row's won_super_bowl.
+
+        Args:
+            db: Database session
+            rows: (row number, validated PlayoffAppearanceCreate dict) pairs
+            dry_run: Report the results, then roll back
+
+        Returns:
+            One result per row, ordered by row number
+        """
+        valid, results = [], []
+        for row, data in rows:
+            try:
+                valid.append((row, {**data, "round": PlayoffRound[data["round"]]}))
+            except KeyError:
+                results.append(_error(row, f"Invalid playoff round: {data['round']}"))
+
+        key = ("qb_id", "season", "round")
+        accepted, errors, names = BulkIngestService._check_rows(db, valid, key)
+        results += errors
+        existing = {
+            (qb_id, season, playoff_round): (won_super_bowl, points)
+            for qb_id, season, playoff_round, won_super_bowl, points in db.query(
+                PlayoffAppearance.qb_id, PlayoffAppearance.season,
+                PlayoffAppearance.round, PlayoffAppearance.won_super_bowl, PlayoffAppearance.points
+            ).filter(PlayoffAppearance.qb_id.in_({data["qb_id"] for _, data in accepted}))
+        } if accepted else {}
+        rules = BulkIngestService._rules(db, accepted)
+
+        writes, deltas = [], {}
+        for row, data in accepted:
+            points = ScoringEngine.get_playoff_points(data["round"], data["won_super_bowl"], rules[data["season"]])
+            current = existing.get(tuple(data[column] for column in key))
+            if current is None:
+                status, previous_points = "created", 0.0
+            elif bool(current[0]) == data["won_super_bowl"] and ScoringEngine.same_points(current[1], points):
+                status, previous_points = "unchanged", points
+            else:
+                status, previous_points = "updated", current[1] or 0.0
+            results.append({"row": row, "status": status, "qb_id": data["qb_id"], "qb_name": names[data["qb_id"]],
+                            "round": data["round"].value, "points": points})
+            if status != "unchanged":
+                writes.append({**data, "points": points})
+                deltas[data["qb_id"]] = deltas.get(data["qb_id"], 0.0) + points - previous_points
+
+        upsert(db, PlayoffAppearance, writes, ("qb_id", "season", "round"), ["won_super_bowl", "points"])
+        return BulkIngestService._finish(db, results, deltas, dry_run)
@@ -0,0 +1,107 @@
+"""
+Per-season cache for computed standings payloads, keyed by data generation.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+from app.models.models import SeasonVersion
+from typing import Any, Callable, Dict, Iterable
+import threading
+
+# Session.info key collecting the seasons a transaction bumped, so listeners
+# can act on them once it commits (see standings_stream)
+BUMPED_SEASONS_KEY = "bumped_seasons"
+
+class SeasonVersionService:
+    """
+    Reads and bumps the per-season data generation counter.
+    """
+
+    @staticmethod
+    def get_version(db: Session, season: int) -> int:
+        """Return the current data generation for a season (0 if never written)."""
+        version = db.query(SeasonVersion.version).filter(SeasonVersion.season == season).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(db: Session, seasons: Iterable[int]) -> None:
+        """
+        Increment the data generation for each season. Must be called inside
+        the write's transaction so the new version commits with the data.
+        """
+        now = datetime.now(timezone.utc)
+        seasons = set(seasons)
+        db.info.setdefault(BUMPED_SEASONS_KEY, set()).update(seasons)
+        for season in seasons:
+            row = db.get(SeasonVersion, season)
+            if row is None:
+                db.add(SeasonVersion(season=season, version=1, updated_at=now))
+            else:
+                row.version = SeasonVersion.version + 1
+                row.updated_at = now
+
+class StandingsCache:
+    """
+    In-process LRU cache of computed payloads, one slot per season.
+
+    Every lookup reads the season's data generation from the database, so a
+    write committed by any process invalidates the slot for the next request.
+    """
+
+    def __init__(self, max_seasons: int = 8):
+        self.max_seasons = max_seasons
+        self._seasons: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, db: Session, season: int, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached payload for (season, key) at the current data
+        generation, computing and storing it on a miss.
+        """
+        version = SeasonVersionService.get_version(db, season)
+
+        with self._lock:
+            slot = self._seasons.get(season)
+            if slot is not None and slot["version"] == version and key in slot["payloads"]:
+                self._seasons.move_to_end(season)
+                self.hits += 1
+                return slot["payloads"][key]
+            self.misses += 1
+
+        payload = compute()
+
+        with self._lock:
+            slot = self._seasons.get(season)
+            if slot is None or slot["version"] < version:
+                slot = {"version": version, "payloads": {}}
+                self._seasons[season] = slot
+            if slot["version"] == version:
+                slot["payloads"][key] = payload
+            self._seasons.move_to_end(season)
+            while len(self._seasons) > self.max_seasons:
+                self._seasons.popitem(last=False)
+                self.evictions += 1
+
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seasons.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "max_seasons": self.max_seasons,
+                "seasons": {
+                    season: {"version": slot["version"], "keys": sorted(slot["payloads"])}
+                    for season, slot in self._seasons.items()
+                },
+            }
+
+standings_cache = StandingsCache()
@@ -0,0 +1,9 @@
+"""
+Exceptions shared by the services and the routers that report them.
+
+Kept in a module with no imports, so the API can catch them without loading
+the sync services (and Polars) that raise them.
+"""
+
+class StaleChangeSetError(Exception):
+    """A change set was applied after its season's data changed."""
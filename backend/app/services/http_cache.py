@@ -0,0 +1,129 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for read endpoints.
+
+ETags are derived from the per-season data version, so a client revalidating
+an unchanged season gets a 304 without the payload being recomputed.
+
+Cached payloads are stored already serialized (serialize_json) and sent with
+json_body_response, skipping FastAPI's encoding on every hit.
+
+SelectiveGZipMiddleware compresses responses like Starlette's GZipMiddleware,
+except on the paths it is told to leave alone (streams that must not be
+buffered).
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from sqlalchemy.orm import Session
+from app.models.models import SeasonVersion
+from typing import Any, Iterable, Optional
+import orjson
+
+# Bump when a response shape changes so clients don't keep stale bodies.
+ETAG_SCHEMA_VERSION = 1
+
+# Browsers may store responses but must revalidate before reusing them.
+CACHE_CONTROL = "no-cache"
+
+# Headers conditional_get sets, copied onto prebuilt responses
+VALIDATOR_HEADERS = ("etag", "last-modified", "cache-control")
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix.
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session,
+    season: int,
+    resource: str
+) -> Optional[Response]:
+    """
+    Set ETag / Last-Modified / Cache-Control on the response and check the
+    request's validators.
+
+    Args:
+        request: Incoming request (for If-None-Match / If-Modified-Since)
+        response: Response whose headers should carry the validators
+        db: Database session
+        season: Season whose data the payload is built from
+        resource: Identifies the payload (e.g. "standings", "roster-3")
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    row = db.query(SeasonVersion).filter(SeasonVersion.season == season).first()
+    version = row.version if row else 0
+
+    headers = {
+        # Weak: GZipMiddleware may send the same payload gzipped or not
+        "ETag": f'W/"{resource}-{season}-v{version}-s{ETAG_SCHEMA_VERSION}"',
+        "Cache-Control": CACHE_CONTROL,
+    }
+    last_modified = None
+    if row and row.updated_at:
+        updated_at = row.updated_at
+        if updated_at.tzinfo is None:
+            # SQLite drops the timezone; versions are always written in UTC.
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        # Last-Modified has whole seconds, so it only identifies the version
+        # once its second is over: until then another write could land in
+        # the same second, and clients revalidate with the ETag alone.
+        if datetime.now(timezone.utc).replace(microsecond=0) > updated_at:
+            last_modified = updated_at.replace(microsecond=0)
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is not None and last_modified <= since:
+            return Response(status_code=304, headers=headers)
+
+    return None
+
+def serialize_json(payload: Any) -> bytes:
+    """Serialize a payload once, for caching (int dict keys become strings)."""
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+def json_body_response(response: Response, body: bytes) -> Response:
+    """
+    Send pre-serialized JSON, carrying over the validator headers
+    conditional_get set on the endpoint's response.
+    """
+    headers = {name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that passes excluded paths straight through. The gzip
+    responder buffers a streaming body until it has minimum_size bytes,
+    which would hold Server-Sent Events back.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        # Compared without trailing slashes, so /stream and /stream/ match
+        self.exclude_paths = {path.rstrip("/") for path in exclude_paths}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].rstrip("/") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,328 @@
+"""
+Background runner for NFL sync jobs.
+
+Sync endpoints enqueue a job and return immediately; a thread pool runs it
+with its own database session. Jobs for the same season run one at a time,
+and submitting a (kind, season, dry_run) that is already queued or running
+returns that job instead of starting another. Every job is kept in sync_jobs
+as the sync history; a dry run's change set stays on its row until applied.
+
+Each job records the runner (host:pid) that queued it, so a process starting
+up only fails the jobs its own predecessors left behind, never the jobs of
+other workers still running them.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from sqlalchemy.orm import Session
+from app.database.config import SessionLocal
+from app.models.models import SyncJob
+from app.services.errors import StaleChangeSetError
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> (NFLStatsService method, keyword arguments, success message).
+# The sync services (and Polars) are imported when the first job runs.
+JOB_KINDS = {
+    "stats": ("sync_qb_season_stats", {}, "Successfully synced season stats for {season}"),
+    "wins": ("sync_qb_wins", {}, "Successfully synced QB wins for {season}"),
+    "playoffs": ("sync_playoff_appearances", {}, "Successfully synced playoff wins for {season}"),
+    "all": ("sync_all", {}, "Successfully synced stats, wins and playoffs for {season}"),
+    "weekly": ("sync_all", {"incremental": True}, "Successfully synced new weeks for {season}"),
+}
+
+# Kinds that run the multi-stage sync_all pipeline and report its stages
+STAGED_KINDS = ("all", "weekly")
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# A queued/running job from another host older than this is taken to be
+# left behind by a worker that is gone (its host never restarts to clean up)
+STALE_JOB_SECONDS = int(os.getenv("SYNC_JOB_STALE_SECONDS", 6 * 60 * 60))
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # SQLite drops the timezone; job times are always written in UTC.
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+def _runner_id() -> str:
+    # Read per call: worker processes fork after this module is imported
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    except OSError:
+        return False
+    return True
+
+class JobRunner:
+    """
+    Thread-pool runner for sync jobs, with per-season serialization and
+    coalescing of duplicate submissions.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("SYNC_JOB_WORKERS", 2))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # (kind, season, dry_run) -> id of its queued/running job
+        self._active: Dict[Tuple[str, int, bool], int] = {}
+        # job id -> current stage, kept in memory so progress updates never
+        # write to the database while the sync's transaction is open
+        self._stages: Dict[int, str] = {}
+        self._season_locks: Dict[int, threading.Lock] = {}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sync-job")
+        return self._executor
+
+    def submit(self, db: Session, kind: str, season: int, dry_run: bool = False) -> Tuple[Dict, bool]:
+        """
+        Enqueue a sync job, or return the matching job already in progress.
+
+        Args:
+            db: Database session
+            kind: One of JOB_KINDS
+            season: Season year
+            dry_run: Only plan the change set (see apply())
+
+        Returns:
+            (job, coalesced) where coalesced is True if an existing job was
+            returned instead of a new one being queued
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown sync job kind: {kind}")
+
+        with self._lock:
+            active_id = self._active.get((kind, season, dry_run))
+            if active_id is None:
+                job = SyncJob(
+                    kind=kind, season=season, status="queued", dry_run=dry_run,
+                    created_at=_now(), runner=_runner_id()
+                )
+                db.add(job)
+                db.commit()
+                db.refresh(job)
+
+                self._active[(kind, season, dry_run)] = job.id
+                self._stages[job.id] = "queued"
+                self._season_locks.setdefault(season, threading.Lock())
+
+        if active_id is not None:
+            return self.get(db, active_id), True
+
+        self._pool().submit(self._run, job.id, kind, season, dry_run)
+        return self._to_dict(job), False
+
+    def _set_stage(self, job_id: int, stage: str) -> None:
+        with self._lock:
+            self._stages[job_id] = stage
+
+    def _update(self, job_id: int, **fields) -> None:
+        with SessionLocal() as db:
+            db.query(SyncJob).filter(SyncJob.id == job_id).update(fields)
+            db.commit()
+
+    def _run(self, job_id: int, kind: str, season: int, dry_run: bool) -> None:
+        method, sync_kwargs, message = JOB_KINDS[kind]
+        try:
+            from app.services.nfl_stats import NFLStatsService
+            sync = partial(getattr(NFLStatsService, method), **sync_kwargs)
+
+            # One job per season at a time: concurrent syncs of a season would
+            # race on the same stat rows
+            with self._season_locks[season]:
+                self._update(job_id, status="running", started_at=_now())
+                self._set_stage(job_id, "fetch" if kind in STAGED_KINDS else kind)
+
+                kwargs = {"dry_run": dry_run}
+                if kind in STAGED_KINDS:
+                    kwargs["on_stage"] = lambda stage: self._set_stage(job_id, stage)
+
+                with SessionLocal() as db:
+                    result = sync(db, season, **kwargs)
+
+                if dry_run:
+                    message = "Planned changes (dry run): " + message[0].lower() + message[1:]
+                self._update(
+                    job_id,
+                    status="succeeded",
+                    finished_at=_now(),
+                    result={"message": message.format(season=season), **result}
+                )
+        except Exception as e:
+            logger.exception("Sync job %s (%s %s) failed", job_id, kind, season)
+            try:
+                self._update(job_id, status="failed", finished_at=_now(), error=str(e))
+            except Exception:
+                logger.exception("Could not record failure of sync job %s", job_id)
+        finally:
+            with self._lock:
+                self._active.pop((kind, season, dry_run), None)
+                self._stages.pop(job_id, None)
+
+    def _to_dict(self, job: SyncJob, include_change_set: bool = True) -> Dict:
+        with self._lock:
+            stage = self._stages.get(job.id)
+
+        progress = None
+        if job.status == "succeeded":
+            progress = 1.0
+        elif job.status == "running" and job.kind in STAGED_KINDS and stage is not None:
+            # Fraction of sync-all stages completed (a staged job is running,
+            # so the sync services are already loaded)
+            from app.services.nfl_stats import NFLStatsService
+            stages = NFLStatsService.SYNC_ALL_STAGES
+            progress = round(stages.index(stage) / len(stages), 2) if stage in stages else 0.0
+        elif job.status in ACTIVE_STATUSES:
+            progress = 0.0
+
+        result = job.result
+        if not include_change_set and result and "change_set" in result:
+            result = {key: value for key, value in result.items() if key != "change_set"}
+
+        duration = None
+        if job.started_at is not None:
+            end = job.finished_at or _now().replace(tzinfo=job.started_at.tzinfo)
+            duration = round((end - job.started_at).total_seconds(), 3)
+
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "season": job.season,
+            "status": job.status,
+            "dry_run": bool(job.dry_run),
+            "applied_at": _isoformat(job.applied_at),
+            "stage": stage if job.status in ACTIVE_STATUSES else None,
+            "progress": progress,
+            "created_at": _isoformat(job.created_at),
+            "started_at": _isoformat(job.started_at),
+            "finished_at": _isoformat(job.finished_at),
+            "duration_seconds": duration,
+            "result": result,
+            "error": job.error,
+        }
+
+    def get(self, db: Session, job_id: int) -> Optional[Dict]:
+        """Return a job's status, progress, duration and result (None if unknown)."""
+        job = db.get(SyncJob, job_id)
+        if job is None:
+            return None
+        # Always read the row fresh: the worker commits from another session
+        db.refresh(job)
+        return self._to_dict(job)
+
+    def list(self, db: Session, season: Optional[int] = None, limit: int = 50) -> List[Dict]:
+        """
+        Return the most recent jobs (newest first), optionally for one
+        season. Dry-run change sets are left out; get() returns them.
+        """
+        query = db.query(SyncJob)
+        if season is not None:
+            query = query.filter(SyncJob.season == season)
+        return [
+            self._to_dict(job, include_change_set=False)
+            for job in query.order_by(SyncJob.id.desc()).limit(limit).all()
+        ]
+
+    def apply(self, db: Session, job_id: int) -> Dict:
+        """
+        Apply a succeeded dry-run job's change set in one transaction and
+        mark the job applied. Runs under the season's lock so no sync can
+        write in between.
+
+        Raises:
+            LookupError: Unknown job
+            ValueError: Not a succeeded dry run
+            StaleChangeSetError: Already applied, or the season changed
+                since the dry run
+
+        Returns:
+            Counts of the rows written and the per-QB / per-squad deltas
+        """
+        job = db.get(SyncJob, job_id)
+        if job is None:
+            raise LookupError(f"Sync job {job_id} not found")
+        if not job.dry_run:
+            raise ValueError(f"Sync job {job_id} is not a dry run")
+        if job.status != "succeeded":
+            raise ValueError(f"Sync job {job_id} has not succeeded (status: {job.status})")
+        if job.applied_at is not None:
+            raise StaleChangeSetError(f"Sync job {job_id} was already applied")
+
+        changes = job.result["change_set"]
+        with self._lock:
+            season_lock = self._season_locks.setdefault(job.season, threading.Lock())
+        from app.services.sync_changes import SyncChangeService
+        with season_lock:
+            try:
+                summary = SyncChangeService.apply(db, changes)
+                job.applied_at = _now()
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        return {
+            "job_id": job.id,
+            "season": job.season,
+            "applied_at": _isoformat(job.applied_at),
+            "changes": summary,
+            "qb_deltas": changes["qb_deltas"],
+            "squad_deltas": changes["squad_deltas"],
+        }
+
+    @staticmethod
+    def fail_interrupted(db: Session) -> int:
+        """
+        Mark jobs left queued/running by a process that is gone as failed:
+        jobs from this host whose process has exited (or had this process's
+        pid, reused after a container restart), jobs without a runner
+        (queued before runners were recorded), and jobs from other hosts
+        older than STALE_JOB_SECONDS. Jobs of other live workers are left
+        alone. Call once at startup, before any job is submitted.
+
+        Returns:
+            Number of jobs marked
+        """
+        host, pid = socket.gethostname(), os.getpid()
+        cutoff = _now() - timedelta(seconds=STALE_JOB_SECONDS)
+
+        def interrupted(job: SyncJob) -> bool:
+            if not job.runner:
+                return True
+            job_host, _, job_pid = job.runner.rpartition(":")
+            if job_host == host:
+                return not job_pid.isdigit() or int(job_pid) == pid or not _pid_alive(int(job_pid))
+            created_at = job.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            return created_at < cutoff
+
+        jobs = [job for job in db.query(SyncJob).filter(SyncJob.status.in_(ACTIVE_STATUSES)) if interrupted(job)]
+        for job in jobs:
+            job.status = "failed"
+            job.finished_at = _now()
+            job.error = "Interrupted by server restart"
+        db.commit()
+        return len(jobs)
+
+job_runner = JobRunner()
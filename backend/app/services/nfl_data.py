@@ -0,0 +1,189 @@
+"""
+On-disk Parquet cache for nflverse data files.
+
+Files are stored under NFL_CACHE_DIR as <dataset>/<season>.parquet with a JSON
+sidecar holding the upstream ETag / Last-Modified. Within NFL_CACHE_TTL_SECONDS
+a cached file is used without touching the network; after that it is
+revalidated with a conditional GET, so unchanged data is never re-downloaded.
+With NFL_OFFLINE=1 syncs read purely from the cache.
+
+Configuration (environment, read on every call):
+- NFLVERSE_BASE_URL: where data files live (default: nflverse-data releases,
+  the same source nflreadpy uses). Point it at a local HTTP server serving
+  the same layout to test without GitHub.
+- NFL_CACHE_DIR: cache directory (default: ./.nfl_cache). A pre-filled fixture
+  directory works with NFL_OFFLINE=1.
+- NFL_CACHE_TTL_SECONDS: how long a file is trusted without revalidating
+  (default: 900)
+- NFL_OFFLINE: "1"/"true" to never touch the network
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+import json
+import logging
+import os
+import threading
+import time
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://github.com/nflverse/nflverse-data/releases/download/"
+DEFAULT_CACHE_DIR = ".nfl_cache"
+DEFAULT_TTL_SECONDS = 900
+DOWNLOAD_TIMEOUT_SECONDS = 60
+
+class NFLDataCache:
+    """
+    Fetches nflverse Parquet files through a local cache with freshness checks.
+    """
+
+    # Dataset name -> path under the base URL (mirrors nflreadpy's layout).
+    # Schedules are one file for all seasons, so they are cached once.
+    DATASETS = {
+        "player_stats_reg": "stats_player/stats_player_reg_{season}.parquet",
+        "player_stats_week": "stats_player/stats_player_week_{season}.parquet",
+        "schedules": "schedules/games.parquet",
+    }
+
+    @staticmethod
+    def _settings() -> Dict:
+        return {
+            "base_url": os.getenv("NFLVERSE_BASE_URL", DEFAULT_BASE_URL).rstrip("/") + "/",
+            "cache_dir": Path(os.getenv("NFL_CACHE_DIR", DEFAULT_CACHE_DIR)),
+            "ttl": int(os.getenv("NFL_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            "offline": os.getenv("NFL_OFFLINE", "").lower() in ("1", "true", "yes"),
+        }
+
+    @staticmethod
+    def _file_paths(cache_dir: Path, dataset: str, season: Optional[int]):
+        name = str(season) if season is not None and "{season}" in NFLDataCache.DATASETS[dataset] else "all"
+        data_path = cache_dir / dataset / f"{name}.parquet"
+        return data_path, data_path.with_suffix(".json")
+
+    @staticmethod
+    def _read_meta(meta_path: Path) -> Dict:
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: Dict) -> None:
+        tmp_path = meta_path.with_suffix(f".json.{_tmp_suffix()}")
+        tmp_path.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def path(dataset: str, season: Optional[int] = None) -> Path:
+        """
+        Return the local path of a dataset file, downloading or revalidating
+        it first if the cached copy is missing or older than the TTL.
+
+        Args:
+            dataset: Key of DATASETS
+            season: Season year (ignored for all-season datasets)
+
+        Returns:
+            Path to a Parquet file
+        """
+        if dataset not in NFLDataCache.DATASETS:
+            raise ValueError(f"Unknown NFL dataset: {dataset}")
+
+        settings = NFLDataCache._settings()
+        data_path, meta_path = NFLDataCache._file_paths(settings["cache_dir"], dataset, season)
+        meta = NFLDataCache._read_meta(meta_path)
+        cached = data_path.exists()
+
+        if settings["offline"]:
+            if not cached:
+                raise FileNotFoundError(
+                    f"{dataset}/{data_path.stem} is not cached in {settings['cache_dir']} and NFL_OFFLINE is set"
+                )
+            return data_path
+
+        if cached and time.time() - meta.get("checked_at", 0) < settings["ttl"]:
+            return data_path
+
+        url = settings["base_url"] + NFLDataCache.DATASETS[dataset].format(season=season)
+        request = Request(url, headers={"User-Agent": "howell-league-sync"})
+        if cached and meta.get("url") == url:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urlopen(request, timeout=DOWNLOAD_TIMEOUT_SECONDS) as response:
+                content = response.read()
+                headers = response.headers
+        except HTTPError as e:
+            if e.code == 304:
+                meta["checked_at"] = time.time()
+                NFLDataCache._write_meta(meta_path, meta)
+                return data_path
+            if cached:
+                logger.warning("Revalidating %s failed (%s); using cached copy", url, e)
+                return data_path
+            raise ConnectionError(f"Failed to download {url}: {e}") from e
+        except (URLError, OSError) as e:
+            if cached:
+                logger.warning("Revalidating %s failed (%s); using cached copy", url, e)
+                return data_path
+            raise ConnectionError(f"Failed to download {url}: {e}") from e
+
+        # Write atomically so concurrent readers never see a partial file
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = data_path.with_suffix(f".parquet.{_tmp_suffix()}")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, data_path)
+
+        now = time.time()
+        NFLDataCache._write_meta(meta_path, {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": now,
+            "checked_at": now,
+            "bytes": len(content),
+        })
+        return data_path
+
+    @staticmethod
+    def scan(dataset: str, season: Optional[int] = None) -> pl.LazyFrame:
+        """
+        Lazily scan a cached dataset. Column projections and filters applied
+        to the result are pushed down into the Parquet read.
+        """
+        return pl.scan_parquet(NFLDataCache.path(dataset, season))
+
+    @staticmethod
+    def status() -> List[Dict]:
+        """
+        Describe every cached file (dataset, season, size, fetch/check times).
+        """
+        settings = NFLDataCache._settings()
+        entries = []
+        for meta_path in sorted(settings["cache_dir"].glob("*/*.json")):
+            meta = NFLDataCache._read_meta(meta_path)
+            entries.append({
+                "dataset": meta_path.parent.name,
+                "season": meta_path.stem,
+                "bytes": meta.get("bytes"),
+                "etag": meta.get("etag"),
+                "fetched_at": _isoformat(meta.get("fetched_at")),
+                "checked_at": _isoformat(meta.get("checked_at")),
+            })
+        return entries
+
+def _tmp_suffix() -> str:
+    # Unique per process and thread so concurrent downloads never share a temp file
+    return f"{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
@@ -1,157 +1,635 @@
 """
-NFL Stats service using nflreadpy to fetch season aggregate QB stats.
+NFL Stats service that syncs QB stats, wins and playoff appearances from
+nflverse data.
+
+Each sync matches the NFL rows to the season's roster and plans its writes
+as a change set (see sync_changes): per-week stat lines and wins go through
+plan_weekly, playoff appearances through plan_playoffs. The weekly stat and
+win syncs are incremental, reading only weeks after the season's watermark.
+Week-0 season aggregates are still supported for seasons not synced per
+week. A dry run returns the change set instead of applying it.
+
+Ingestion stays in Polars end to end: cached Parquet files are scanned lazily
+and projected to the columns a sync needs and filtered (position, season,
+game type) before materializing, with no pandas conversion.
 """
-import nflreadpy as nfl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import polars as pl
 from sqlalchemy.orm import Session
-from app.models.models import Quarterback, WeeklyStat, PlayoffAppearance, PlayoffRound
+from app.models.models import PlayoffRound
+from app.services.nfl_data import NFLDataCache
+from app.services.roster_index import RosterIndex
 from app.services.scoring import ScoringEngine
-from typing import Dict
-from datetime import datetime
+from app.services.scoring_rules import ScoringRuleService
+from app.services.sync_changes import SyncChangeService
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, so RSS is reported as None
+    resource = None
+
+def _peak_rss_mb():
+    """Process peak resident set size in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+@contextmanager
+def sync_metrics() -> Iterator[Dict]:
+    """
+    Measure wall time and peak RSS of a sync. The yielded dict is filled in
+    on exit and is meant to be returned as the sync's "metrics" entry.
+    """
+    metrics: Dict = {}
+    peak_before = _peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics["seconds"] = round(time.perf_counter() - start, 3)
+        metrics["peak_rss_mb"] = _peak_rss_mb()
+        if peak_before is not None:
+            metrics["peak_rss_growth_mb"] = round(metrics["peak_rss_mb"] - peak_before, 1)
 
 class NFLStatsService:
     """
-    Service to fetch and sync NFL stats from nflreadpy.
+    Service to fetch and sync NFL stats from nflverse data.
     """
 
     @staticmethod
-    def _get_qb_name_map(db: Session, season: int) -> Dict[str, Quarterback]:
+    def _project(frame: pl.LazyFrame, columns: List[str]) -> pl.LazyFrame:
+        """Select the wanted columns that exist (missing ones are left out)."""
+        available = set(frame.collect_schema().names())
+        return frame.select([column for column in columns if column in available])
+
+    @staticmethod
+    def fetch_season_stats(season: int) -> pl.DataFrame:
         """
-        Load rostered QBs and return a name->QB mapping.
+        Fetch season aggregate stats for all QBs from NFL data.
 
         Args:
-            db: Database session
-            season: Season year
+            season: NFL season year
 
         Returns:
-            Dictionary mapping QB names to Quarterback objects
+            Polars DataFrame with QB season totals, projected to the columns
+            the sync uses
         """
-        rostered_qbs = db.query(Quarterback).filter(Quarterback.season == season).all()
-        return {qb.name: qb for qb in rostered_qbs}
+        # Regular season summary file = season totals for the regular season
+        player_stats = NFLDataCache.scan("player_stats_reg", season)
+
+        columns = [
+            'player_id', 'player_name', 'player_display_name', 'position',
+            *NFLStatsService.SEASON_STAT_COLUMNS
+        ]
+        return (
+            NFLStatsService._project(player_stats, columns)
+            .filter(pl.col('position') == 'QB')
+            .collect()
+        )
 
     @staticmethod
-    def fetch_season_stats(season: int):
+    def fetch_weekly_stats(season: int, after_week: int = 0) -> pl.DataFrame:
         """
-        Fetch season aggregate stats for all QBs from NFL data.
+        Fetch per-week regular season stats for all QBs from NFL data.
 
         Args:
             season: NFL season year
+            after_week: Only weeks after this one are read (the filter is
+                pushed into the Parquet scan)
 
         Returns:
-            DataFrame with QB season totals (pandas)
+            Polars DataFrame with one row per QB per week, projected to the
+            columns the sync uses
         """
-        # Load player stats with regular season summary
-        # summary_level="reg" gives us season totals for regular season
-        player_stats = nfl.load_player_stats(seasons=[season], summary_level="reg")
+        player_stats = NFLDataCache.scan("player_stats_week", season)
+
+        columns = [
+            'player_id', 'player_name', 'player_display_name', 'position',
+            'season_type', 'week', *NFLStatsService.SEASON_STAT_COLUMNS
+        ]
+        return (
+            NFLStatsService._project(player_stats, columns)
+            .filter(
+                (pl.col('position') == 'QB')
+                & (pl.col('season_type') == 'REG')
+                & (pl.col('week') > after_week)
+            )
+            .collect()
+        )
 
-        # Convert from Polars to pandas for compatibility
-        return player_stats.to_pandas()
+    @staticmethod
+    def fetch_last_completed_week(season: int) -> int:
+        """
+        Return the last regular season week whose games have all been
+        played, and every week before it too (0 if none).
+        """
+        weeks = (
+            NFLDataCache.scan("schedules")
+            .filter((pl.col('season') == season) & (pl.col('game_type') == 'REG'))
+            .group_by('week')
+            .agg(pl.col('home_score').is_not_null().all().alias('complete'))
+            .sort('week')
+            .collect()
+        )
+        last_completed = 0
+        for week, complete in weeks.iter_rows():
+            if not complete:
+                break
+            last_completed = int(week)
+        return last_completed
 
     @staticmethod
-    def sync_qb_season_stats(db: Session, season: int) -> Dict:
+    def fetch_completed_games(season: int, game_types: List[str]) -> pl.DataFrame:
+        """
+        Fetch completed games of the given types (e.g. REG, WC) from the
+        NFL schedule, with the winning starting QB resolved per game.
+
+        Args:
+            season: NFL season year
+            game_types: nflverse game_type values to keep
+
+        Returns:
+            Polars DataFrame with one row per completed game, including
+            winning_qb_id / winning_qb_name (null for ties) and is_prime_time
+        """
+        # One schedule file covers every season
+        schedules = NFLDataCache.scan("schedules").filter(pl.col('season') == season)
+
+        columns = [
+            'game_id', 'game_type', 'week', 'gametime',
+            'home_team', 'away_team', 'home_score', 'away_score',
+            'home_qb_id', 'away_qb_id', 'home_qb_name', 'away_qb_name'
+        ]
+        home_won = pl.col('home_score') > pl.col('away_score')
+        away_won = pl.col('away_score') > pl.col('home_score')
+
+        return (
+            NFLStatsService._project(schedules, columns)
+            .filter(pl.col('home_score').is_not_null() & pl.col('game_type').is_in(game_types))
+            .with_columns(
+                pl.when(home_won).then(pl.col('home_qb_id'))
+                .when(away_won).then(pl.col('away_qb_id'))
+                .alias('winning_qb_id'),
+                pl.when(home_won).then(pl.col('home_qb_name'))
+                .when(away_won).then(pl.col('away_qb_name'))
+                .alias('winning_qb_name'),
+                # Prime time = games starting at 5 PM or later; unparseable
+                # or missing times count as non-prime time
+                (
+                    pl.col('gametime').cast(pl.Utf8).str.split(':').list.first()
+                    .cast(pl.Int64, strict=False) >= 17
+                ).fill_null(False).alias('is_prime_time')
+            )
+            .collect()
+        )
+
+    # Stages of sync_all, in order ("commit" is skipped by dry runs)
+    SYNC_ALL_STAGES = ["fetch", "stats", "wins", "playoffs", "diff", "commit"]
+
+    # nflverse playoff game_type -> PlayoffRound
+    PLAYOFF_GAME_TYPES = {
+        'WC': PlayoffRound.WILD_CARD,
+        'DIV': PlayoffRound.DIVISIONAL,
+        'CON': PlayoffRound.CONF_CHAMPIONSHIP,
+        'SB': PlayoffRound.SUPER_BOWL,
+    }
+
+    # nflverse season-stat column -> WeeklyStat column
+    SEASON_STAT_COLUMNS = {
+        'passing_yards': 'passing_yards',
+        'rushing_yards': 'rushing_yards',
+        'passing_tds': 'passing_tds',
+        'rushing_tds': 'rushing_tds',
+        'passing_interceptions': 'interceptions',
+        'sack_fumbles_lost': 'fumbles',
+    }
+
+    @staticmethod
+    def get_watermark(db: Session, season: int, source: str) -> Optional[int]:
+        """
+        Return the last fully synced week for a source ("weekly_stats" or
+        "wins"), or None if the source has never synced the season
+        incrementally.
+        """
+        return SyncChangeService.get_watermark(db, season, source)
+
+    @staticmethod
+    def uses_weekly_stats(db: Session, season: int) -> bool:
+        """Whether a season's stats are synced per week rather than as week 0."""
+        return NFLStatsService.get_watermark(db, season, "weekly_stats") is not None
+
+    @staticmethod
+    def _match_roster(
+        frame: pl.DataFrame,
+        roster: RosterIndex,
+        keys: List[str]
+    ) -> Tuple[pl.DataFrame, Dict]:
+        """
+        Attach qb_id to NFL stat rows through the roster index (player ID,
+        then normalized display name / player_name, then alias), keeping the
+        last row per key. QBs matched by name learn their player ID (kept on
+        the roster index until the change set is applied).
+
+        Returns:
+            (matched rows, report of unmatched players, unmatched rostered
+            QBs and IDs learned)
+        """
+        labelled = roster.match(
+            frame,
+            id_column='player_id',
+            name_columns=['player_display_name', 'player_name'],
+            abbreviated_column='player_name'
+        )
+        matched = (
+            labelled
+            .filter(pl.col('qb_id').is_not_null())
+            .unique(keys, keep='last', maintain_order=True)
+        )
+        unmatched_names = labelled.filter(pl.col('qb_id').is_null()).select(
+            pl.coalesce(*[column for column in ('player_display_name', 'player_name') if column in labelled.columns])
+        ).to_series()
+        report = {
+            "unmatched_players": sorted(unmatched_names.drop_nulls().unique().to_list()),
+            "unmatched_roster": roster.unmatched_roster(matched['qb_id'].to_list()),
+            "ids_learned": len(roster.learn_ids(matched)),
+        }
+        return matched, report
+
+    @staticmethod
+    def _match_winners(games: pl.DataFrame, roster: RosterIndex) -> Tuple[pl.DataFrame, List[str]]:
+        """
+        Keep only games won by a rostered QB (matched by player ID, then
+        normalized name). Ties have no winner.
+
+        Returns:
+            (won games with qb_id, sorted names of unrostered winners)
+        """
+        labelled = roster.match(games, id_column='winning_qb_id', name_columns=['winning_qb_name'])
+        unmatched = labelled.filter(pl.col('qb_id').is_null() & pl.col('winning_qb_name').is_not_null())
+        return (
+            labelled.filter(pl.col('qb_id').is_not_null()),
+            sorted(unmatched['winning_qb_name'].unique().to_list())
+        )
+
+    @staticmethod
+    def _match_starters(games: pl.DataFrame, roster: RosterIndex) -> pl.DataFrame:
+        """
+        Both starting QBs of each game that are rostered, as game_type, week
+        and qb_id rows. Their stored wins for those games are authoritative.
+        """
+        sides = [
+            games.select(
+                'game_type', 'week',
+                pl.col(f'{side}_qb_id').alias('starter_id'),
+                pl.col(f'{side}_qb_name').alias('starter_name')
+            )
+            for side in ('home', 'away')
+        ]
+        starters = roster.match(pl.concat(sides), id_column='starter_id', name_columns=['starter_name'])
+        return starters.filter(pl.col('qb_id').is_not_null()).select('game_type', 'week', 'qb_id')
+
+    @staticmethod
+    def _stat_frame(matched: pl.DataFrame) -> pl.DataFrame:
+        """Matched NFL stat rows as qb_id, week and WeeklyStat stat columns."""
+        return matched.select(
+            pl.col('qb_id'),
+            pl.col('week').cast(pl.Int64),
+            *[
+                (
+                    pl.col(source).cast(pl.Int64, strict=False).fill_null(0)
+                    if source in matched.columns else pl.lit(0, dtype=pl.Int64)
+                ).alias(column)
+                for source, column in NFLStatsService.SEASON_STAT_COLUMNS.items()
+            ]
+        )
+
+    @staticmethod
+    def _season_stat_inputs(
+        db: Session,
+        season: int,
+        season_data: Optional[pl.DataFrame],
+        roster: Optional[RosterIndex]
+    ) -> Tuple[pl.DataFrame, Dict]:
+        if NFLStatsService.uses_weekly_stats(db, season):
+            raise ValueError(
+                f"Season {season} is synced per week; use the weekly sync instead "
+                "so stats aren't counted twice"
+            )
+
+        # Fetch NFL season aggregate data (already filtered to QBs)
+        if season_data is None:
+            season_data = NFLStatsService.fetch_season_stats(season)
+
+        # Match to rostered QBs by player ID, then normalized name
+        if roster is None:
+            roster = RosterIndex.build(db, season)
+        matched, report = NFLStatsService._match_roster(season_data, roster, ['qb_id'])
+
+        # Week 0 = season aggregate
+        return NFLStatsService._stat_frame(matched.with_columns(pl.lit(0).alias('week'))), report
+
+    @staticmethod
+    def _weekly_stat_inputs(
+        db: Session,
+        season: int,
+        weekly_data: Optional[pl.DataFrame],
+        last_completed_week: Optional[int],
+        roster: Optional[RosterIndex],
+        full: bool
+    ) -> Tuple[pl.DataFrame, Dict]:
+        watermark = NFLStatsService.get_watermark(db, season, "weekly_stats")
+        after_week = 0 if full or watermark is None else watermark
+
+        if weekly_data is None:
+            weekly_data = NFLStatsService.fetch_weekly_stats(season, after_week)
+        else:
+            weekly_data = weekly_data.filter(pl.col('week') > after_week)
+        if last_completed_week is None:
+            last_completed_week = NFLStatsService.fetch_last_completed_week(season)
+
+        if roster is None:
+            roster = RosterIndex.build(db, season)
+        matched, report = NFLStatsService._match_roster(weekly_data, roster, ['qb_id', 'week'])
+
+        weeks = sorted(weekly_data['week'].unique().to_list())
+        report.update({
+            "weeks_synced": weeks,
+            # The first weekly sync of a season clears its week-0 aggregate
+            "clear_aggregate": watermark is None,
+            "watermark": max(after_week, min(last_completed_week, weeks[-1] if weeks else 0)),
+        })
+        return NFLStatsService._stat_frame(matched), report
+
+    @staticmethod
+    def _win_inputs(
+        db: Session,
+        season: int,
+        completed_games: Optional[pl.DataFrame],
+        roster: Optional[RosterIndex],
+        incremental: bool,
+        last_completed_week: Optional[int]
+    ) -> Tuple[Dict, Dict]:
+        # Completed regular season games with the winning starting QB
+        if completed_games is None:
+            completed_games = NFLStatsService.fetch_completed_games(season, ['REG'])
+        completed_games = completed_games.filter(pl.col('game_type') == 'REG')
+
+        watermark = 0
+        if incremental:
+            watermark = NFLStatsService.get_watermark(db, season, "wins") or 0
+            completed_games = completed_games.filter(pl.col('week') > watermark)
+        if last_completed_week is None:
+            last_completed_week = NFLStatsService.fetch_last_completed_week(season)
+
+        # Keep only games won by a rostered QB (ties have no winner)
+        if roster is None:
+            roster = RosterIndex.build(db, season)
+        won_games, unmatched_winners = NFLStatsService._match_winners(completed_games, roster)
+
+        wins = {
+            "won": won_games.select('qb_id', 'week', pl.col('is_prime_time').alias('prime_time_win')),
+            "started": NFLStatsService._match_starters(completed_games, roster).select('qb_id', 'week'),
+        }
+        info = {
+            "games_checked": completed_games.height,
+            "unmatched_winners": unmatched_winners,
+            "watermark": max(watermark, last_completed_week),
+        }
+        return wins, info
+
+    @staticmethod
+    def _playoff_inputs(
+        db: Session,
+        season: int,
+        completed_games: Optional[pl.DataFrame],
+        roster: Optional[RosterIndex]
+    ) -> Tuple[pl.DataFrame, Dict]:
+        game_type_map = NFLStatsService.PLAYOFF_GAME_TYPES
+
+        # Completed playoff games with the winning starting QB
+        if completed_games is None:
+            completed_games = NFLStatsService.fetch_completed_games(season, list(game_type_map))
+        playoff_games = completed_games.filter(pl.col('game_type').is_in(list(game_type_map)))
+
+        # Appearance points go to every rostered QB who started the round,
+        # won or lost (league rules 6.4.1)
+        if roster is None:
+            roster = RosterIndex.build(db, season)
+        won_games, unmatched_winners = NFLStatsService._match_winners(playoff_games, roster)
+        starters = NFLStatsService._match_starters(playoff_games, roster)
+
+        rounds = {game_type: playoff_round.value for game_type, playoff_round in game_type_map.items()}
+        rules = ScoringRuleService.get_rules(db, season)
+        # Super Bowl win gets the extra 25 point bonus
+        points = {
+            playoff_round.value: ScoringEngine.get_playoff_points(playoff_round, False, rules)
+            for playoff_round in game_type_map.values()
+        }
+        super_bowl_win_points = ScoringEngine.get_playoff_points(PlayoffRound.SUPER_BOWL, True, rules)
+
+        round_expr = pl.col('game_type').replace_strict(rounds, return_dtype=pl.Utf8).alias('round')
+        super_bowl_winners = won_games.select('qb_id', round_expr).filter(
+            pl.col('round') == PlayoffRound.SUPER_BOWL.value
+        ).unique().with_columns(pl.lit(True).alias('won_super_bowl'))
+        appearances = (
+            pl.concat([starters.select('qb_id', round_expr), won_games.select('qb_id', round_expr)])
+            .unique(maintain_order=True)
+            .join(super_bowl_winners, on=['qb_id', 'round'], how='left')
+            .with_columns(pl.col('won_super_bowl').fill_null(False))
+            .with_columns(
+                pl.when(pl.col('won_super_bowl')).then(pl.lit(super_bowl_win_points))
+                .otherwise(pl.col('round').replace_strict(points, return_dtype=pl.Float64))
+                .alias('points')
+            )
+        )
+
+        info = {
+            "playoff_games_checked": playoff_games.height,
+            "unmatched_winners": unmatched_winners,
+        }
+        return appearances, info
+
+    @staticmethod
+    def _stats_summary(plan: pl.DataFrame) -> Dict:
+        synced = plan.filter(pl.col('has_stats'))
+        created = synced.filter(pl.col('action') == 'insert').height
+        return {
+            "total_synced": synced.height,
+            "created": created,
+            "updated": synced.height - created,
+        }
+
+    @staticmethod
+    def _wins_summary(plan: pl.DataFrame) -> Dict:
+        new_wins = plan.filter(pl.col('game_won') & ~pl.col('had_win'))
+        created = new_wins.filter(pl.col('action') == 'insert').height
+        return {
+            "total_wins_synced": new_wins.height,
+            "created": created,
+            "updated": new_wins.height - created,
+            "reversed": plan.filter(pl.col('had_win') & ~pl.col('game_won')).height,
+        }
+
+    @staticmethod
+    def _playoffs_summary(plan: pl.DataFrame) -> Dict:
+        created = plan.filter(pl.col('action') == 'insert').height
+        return {
+            "total_wins_synced": created,
+            "created": created,
+            "updated": plan.filter(pl.col('action') == 'update').height,
+            "skipped_existing": plan.filter(pl.col('desired') & pl.col('action').is_null()).height,
+        }
+
+    @staticmethod
+    def _finish(db: Session, changes: Dict, dry_run: bool, commit: bool) -> Dict:
+        """
+        Apply a freshly planned change set (unless dry_run) and describe it.
+        A dry run returns the full change set for review and later apply.
+        """
+        if dry_run:
+            return {
+                "dry_run": True,
+                "changes": SyncChangeService.summarize(changes),
+                "change_set": changes
+            }
+        summary = SyncChangeService.apply(db, changes, check_version=False)
+        if commit:
+            db.commit()
+        return {"dry_run": False, "changes": summary}
+
+    @staticmethod
+    def sync_qb_season_stats(
+        db: Session,
+        season: int,
+        season_data: Optional[pl.DataFrame] = None,
+        roster: Optional[RosterIndex] = None,
+        commit: bool = True,
+        dry_run: bool = False
+    ) -> Dict:
         """
         Sync season aggregate stats to our database.
         Stores as week=0 to represent season totals.
 
+        The NFL frame is joined to the roster and diffed against the stored
+        rows in vectorized steps, then written with a batched bulk upsert, so
+        the cost stays flat as the roster grows.
+
+        Args:
+            db: Database session
+            season: Season year
+            season_data: Preloaded fetch_season_stats frame (fetched if None)
+            roster: Preloaded RosterIndex (built if None)
+            commit: Commit when done (False leaves it to the caller)
+            dry_run: Only compute the change set; write nothing
+
+        Returns:
+            Summary of synced stats, including unmatched players and the
+            change set counts (the change set itself on dry runs)
+        """
+        with sync_metrics() as metrics:
+            if roster is None:
+                roster = RosterIndex.build(db, season)
+            stats, report = NFLStatsService._season_stat_inputs(db, season, season_data, roster)
+            plan = SyncChangeService.plan_weekly(db, season, stats=stats)
+            changes = SyncChangeService.build(db, season, weekly=plan, qb_ids=roster.learned)
+            result = NFLStatsService._finish(db, changes, dry_run, commit)
+
+        return {
+            "season": season,
+            **NFLStatsService._stats_summary(plan),
+            **report,
+            **result,
+            "metrics": metrics
+        }
+
+    @staticmethod
+    def sync_qb_weekly_stats(
+        db: Session,
+        season: int,
+        weekly_data: Optional[pl.DataFrame] = None,
+        last_completed_week: Optional[int] = None,
+        roster: Optional[RosterIndex] = None,
+        full: bool = False,
+        commit: bool = True,
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Incrementally sync per-week stats, one WeeklyStat row per QB per week.
+
+        Only weeks after the season's "weekly_stats" watermark are read and
+        written, so a late-season sync costs one week's work. The watermark
+        then advances to the last week that is both fully played and present
+        in the data; the week in progress is re-synced on the next run. The
+        first weekly sync of a season clears its week-0 aggregate stats.
+
         Args:
             db: Database session
             season: Season year
+            weekly_data: Preloaded fetch_weekly_stats frame (fetched if None)
+            last_completed_week: Preloaded fetch_last_completed_week value
+            roster: Preloaded RosterIndex (built if None)
+            full: Ignore the watermark and re-sync every week
+            commit: Commit when done (False leaves it to the caller)
+            dry_run: Only compute the change set; write nothing
 
         Returns:
-            Summary of synced stats
+            Summary of synced stats, including the weeks written, the new
+            watermark and the change set counts (the change set itself on
+            dry runs)
         """
-        # Fetch NFL season aggregate data
-        season_data = NFLStatsService.fetch_season_stats(season)
-
-        # Filter to only QBs
-        season_data = season_data[season_data['position'] == 'QB']
-
-        # Get rostered QB name mapping
-        qb_map = NFLStatsService._get_qb_name_map(db, season)
-
-        stats_synced = 0
-        stats_updated = 0
-        stats_created = 0
-
-        for _, row in season_data.iterrows():
-            # Get player name from the stats data
-            player_name = row.get('player_name')
-            player_display_name = row.get('player_display_name')
-
-            # Try to match by name (try both formats)
-            qb = None
-            if player_name in qb_map:
-                qb = qb_map[player_name]
-            elif player_display_name in qb_map:
-                qb = qb_map[player_display_name]
-
-            # Only sync if this QB is rostered in our league
-            if not qb:
-                continue
-
-            # Check if season stat already exists (week=0 represents season total)
-            existing_stat = db.query(WeeklyStat).filter(
-                WeeklyStat.qb_id == qb.id,
-                WeeklyStat.week == 0,
-                WeeklyStat.season == season
-            ).first()
-
-            # Extract stats from NFL data (season aggregates)
-            passing_yards = int(row.get('passing_yards', 0) or 0)
-            rushing_yards = int(row.get('rushing_yards', 0) or 0)
-            passing_tds = int(row.get('passing_tds', 0) or 0)
-            rushing_tds = int(row.get('rushing_tds', 0) or 0)
-            interceptions = int(row.get('passing_interceptions', 0) or 0)
-            fumbles_lost = int(row.get('sack_fumbles_lost', 0) or 0)
-
-            # Games won - will need manual entry or additional lookup
-            games_won = 0  # TODO: Implement game results lookup
-
-            if existing_stat:
-                # Update existing season stat
-                existing_stat.passing_yards = passing_yards
-                existing_stat.rushing_yards = rushing_yards
-                existing_stat.passing_tds = passing_tds
-                existing_stat.rushing_tds = rushing_tds
-                existing_stat.interceptions = interceptions
-                existing_stat.fumbles = fumbles_lost
-                # Note: game_won field is per-game, so we'll use manual entry for wins
-                existing_stat.points = ScoringEngine.calculate_weekly_points(existing_stat)
-                stats_updated += 1
-            else:
-                # Create new season stat entry
-                new_stat = WeeklyStat(
-                    qb_id=qb.id,
-                    week=0,  # Week 0 = season aggregate
-                    season=season,
-                    passing_yards=passing_yards,
-                    rushing_yards=rushing_yards,
-                    passing_tds=passing_tds,
-                    rushing_tds=rushing_tds,
-                    interceptions=interceptions,
-                    fumbles=fumbles_lost,
-                    game_won=False  # Will be updated manually for win totals
-                )
-                new_stat.points = ScoringEngine.calculate_weekly_points(new_stat)
-                db.add(new_stat)
-                stats_created += 1
-
-            stats_synced += 1
-
-        db.commit()
+        with sync_metrics() as metrics:
+            if roster is None:
+                roster = RosterIndex.build(db, season)
+            stats, report = NFLStatsService._weekly_stat_inputs(
+                db, season, weekly_data, last_completed_week, roster, full
+            )
+            clear_aggregate = report.pop("clear_aggregate")
+            plan = SyncChangeService.plan_weekly(db, season, stats=stats, clear_aggregate=clear_aggregate)
+            changes = SyncChangeService.build(
+                db, season, weekly=plan, qb_ids=roster.learned,
+                watermarks={"weekly_stats": report["watermark"]}
+            )
+            result = NFLStatsService._finish(db, changes, dry_run, commit)
 
         return {
             "season": season,
-            "total_synced": stats_synced,
-            "created": stats_created,
-            "updated": stats_updated
+            **NFLStatsService._stats_summary(plan),
+            "cleared_aggregate_rows": plan.filter(pl.col('week') == 0).height if clear_aggregate else 0,
+            **report,
+            **result,
+            "metrics": metrics
         }
 
     @staticmethod
-    def sync_qb_wins(db: Session, season: int) -> Dict:
+    def sync_qb_wins(
+        db: Session,
+        season: int,
+        completed_games: Optional[pl.DataFrame] = None,
+        roster: Optional[RosterIndex] = None,
+        commit: bool = True,
+        incremental: bool = False,
+        last_completed_week: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict:
         """
         Sync QB wins from NFL schedule/game results.
         Only credits wins to the starting QB for each game.
 
+        Stored wins that no result backs any more are reversed: for every
+        completed game both matched starters' rows are checked. QBs the
+        schedule can't be matched to the roster (see unmatched_winners) keep
+        their stored wins. Rows left empty are deleted.
+
+        In incremental mode only games after the season's "wins" watermark
+        are walked, and the watermark then advances to the last fully played
+        week.
+
         Awards:
         - 3 points for regular season win
         - 4 points for prime time win (games starting at 5 PM or later)
@@ -159,111 +637,59 @@ class NFLStatsService:
         Args:
             db: Database session
             season: Season year
+            completed_games: Preloaded fetch_completed_games frame; only its
+                REG games are used (fetched if None)
+            roster: Preloaded RosterIndex (built if None)
+            commit: Commit when done (False leaves it to the caller)
+            incremental: Only walk games after the watermark
+            last_completed_week: Preloaded fetch_last_completed_week value
+            dry_run: Only compute the change set; write nothing
 
         Returns:
-            Summary of synced wins
+            Summary of synced and reversed wins and the change set counts
+            (the change set itself on dry runs)
         """
-        # Load schedule data for the season
-        schedules = nfl.load_schedules(seasons=[season])
-        schedules_df = schedules.to_pandas()
-
-        # Filter to completed games only (regular season)
-        completed_games = schedules_df[
-            (schedules_df['home_score'].notna()) &
-            (schedules_df['game_type'] == 'REG')
-        ]
-
-        # Get rostered QB name mapping
-        qb_map = NFLStatsService._get_qb_name_map(db, season)
-
-        wins_synced = 0
-        wins_created = 0
-        wins_updated = 0
-
-        for _, game in completed_games.iterrows():
-            week = int(game['week'])
-
-            # Determine winner and starting QB
-            home_score = game['home_score']
-            away_score = game['away_score']
-
-            if home_score > away_score:
-                winning_qb_name = game['home_qb_name']
-                winning_team = game['home_team']
-            elif away_score > home_score:
-                winning_qb_name = game['away_qb_name']
-                winning_team = game['away_team']
-            else:
-                # Tie game, no winner
-                continue
-
-            # Check if winning QB is on our roster
-            if not winning_qb_name or winning_qb_name not in qb_map:
-                continue
-
-            qb = qb_map[winning_qb_name]
-
-            # Determine if prime time (games starting at 5 PM or later)
-            is_prime_time = False
-            if game['gametime']:
-                try:
-                    hour = int(str(game['gametime']).split(':')[0])
-                    is_prime_time = hour >= 17  # 5 PM or later
-                except (ValueError, TypeError, AttributeError):
-                    pass  # Invalid time format, default to non-prime time
-
-            # Check if we already have a stat for this week
-            existing_stat = db.query(WeeklyStat).filter(
-                WeeklyStat.qb_id == qb.id,
-                WeeklyStat.week == week,
-                WeeklyStat.season == season
-            ).first()
-
-            if existing_stat:
-                # Update existing stat with win
-                if not existing_stat.game_won:
-                    existing_stat.game_won = True
-                    existing_stat.prime_time_win = is_prime_time
-                    existing_stat.points = ScoringEngine.calculate_weekly_points(existing_stat)
-                    wins_updated += 1
-                    wins_synced += 1
-            else:
-                # Create new stat entry for this win
-                new_stat = WeeklyStat(
-                    qb_id=qb.id,
-                    week=week,
-                    season=season,
-                    passing_yards=0,
-                    rushing_yards=0,
-                    passing_tds=0,
-                    rushing_tds=0,
-                    interceptions=0,
-                    fumbles=0,
-                    game_won=True,
-                    prime_time_win=is_prime_time
-                )
-                new_stat.points = ScoringEngine.calculate_weekly_points(new_stat)
-                db.add(new_stat)
-                wins_created += 1
-                wins_synced += 1
-
-        db.commit()
+        with sync_metrics() as metrics:
+            if roster is None:
+                roster = RosterIndex.build(db, season)
+            wins, info = NFLStatsService._win_inputs(
+                db, season, completed_games, roster, incremental, last_completed_week
+            )
+            watermark = info.pop("watermark")
+            plan = SyncChangeService.plan_weekly(db, season, wins=wins)
+            changes = SyncChangeService.build(
+                db, season, weekly=plan,
+                watermarks={"wins": watermark} if incremental else None
+            )
+            result = NFLStatsService._finish(db, changes, dry_run, commit)
 
-        return {
+        summary = {
             "season": season,
-            "total_wins_synced": wins_synced,
-            "created": wins_created,
-            "updated": wins_updated,
-            "games_checked": len(completed_games)
+            **NFLStatsService._wins_summary(plan),
+            **info,
+            **result,
+            "metrics": metrics
         }
+        if incremental:
+            summary["watermark"] = watermark
+        return summary
 
     @staticmethod
-    def sync_playoff_appearances(db: Session, season: int) -> Dict:
+    def sync_playoff_appearances(
+        db: Session,
+        season: int,
+        completed_games: Optional[pl.DataFrame] = None,
+        roster: Optional[RosterIndex] = None,
+        commit: bool = True,
+        dry_run: bool = False
+    ) -> Dict:
         """
-        Sync playoff WINS from NFL schedule/game results.
-        Creates PlayoffAppearance entries for QBs who WON in each round.
+        Sync playoff appearances from NFL schedule/game results.
+        Creates PlayoffAppearance entries for QBs who STARTED each completed
+        round, whether they won or lost. Entries the results don't cover
+        (manual ones included) are left alone.
 
-        Points per playoff WIN:
+        Points per playoff appearance:
         - Wild Card: 3 points
         - Divisional: 6 points
         - Conference Championship: 10 points
@@ -272,93 +698,150 @@ class NFLStatsService:
         Args:
             db: Database session
             season: Season year
+            completed_games: Preloaded fetch_completed_games frame; only its
+                playoff games are used (fetched if None)
+            roster: Preloaded RosterIndex (built if None)
+            commit: Commit when done (False leaves it to the caller)
+            dry_run: Only compute the change set; write nothing
 
         Returns:
-            Summary of synced playoff wins
+            Summary of synced playoff appearances and the change set counts (the
+            change set itself on dry runs)
         """
-        # Load schedule data for the season
-        schedules = nfl.load_schedules(seasons=[season])
-        schedules_df = schedules.to_pandas()
-
-        # Map NFL game_type to our PlayoffRound enum
-        game_type_map = {
-            'WC': PlayoffRound.WILD_CARD,
-            'DIV': PlayoffRound.DIVISIONAL,
-            'CON': PlayoffRound.CONF_CHAMPIONSHIP,
-            'SB': PlayoffRound.SUPER_BOWL,
+        with sync_metrics() as metrics:
+            if roster is None:
+                roster = RosterIndex.build(db, season)
+            appearances, info = NFLStatsService._playoff_inputs(db, season, completed_games, roster)
+            plan = SyncChangeService.plan_playoffs(db, season, appearances)
+            changes = SyncChangeService.build(db, season, playoffs=plan)
+            result = NFLStatsService._finish(db, changes, dry_run, commit)
+
+        return {
+            "season": season,
+            **NFLStatsService._playoffs_summary(plan),
+            **info,
+            **result,
+            "metrics": metrics
         }
 
-        # Filter to completed playoff games only
-        playoff_games = schedules_df[
-            (schedules_df['home_score'].notna()) &
-            (schedules_df['game_type'].isin(['WC', 'DIV', 'CON', 'SB']))
-        ]
+    @staticmethod
+    def sync_all(
+        db: Session,
+        season: int,
+        on_stage: Optional[Callable[[str], None]] = None,
+        incremental: bool = False,
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Run the stats, wins and playoffs syncs as one pipeline.
 
-        # Get rostered QB name mapping
-        qb_map = NFLStatsService._get_qb_name_map(db, season)
-
-        wins_synced = 0
-        wins_created = 0
-        wins_skipped = 0
-
-        for _, game in playoff_games.iterrows():
-            game_type = game['game_type']
-            playoff_round = game_type_map.get(game_type)
-
-            if not playoff_round:
-                continue
-
-            home_score = game['home_score']
-            away_score = game['away_score']
-
-            # Determine the winning QB only
-            if home_score > away_score:
-                winning_qb_name = game['home_qb_name']
-            elif away_score > home_score:
-                winning_qb_name = game['away_qb_name']
-            else:
-                # Tie (shouldn't happen in playoffs)
-                continue
-
-            # Check if winning QB is on our roster
-            if not winning_qb_name or winning_qb_name not in qb_map:
-                continue
-
-            qb = qb_map[winning_qb_name]
-
-            # Super Bowl win gets the extra 25 point bonus
-            won_super_bowl = (playoff_round == PlayoffRound.SUPER_BOWL)
-
-            # Check if playoff win already exists
-            existing = db.query(PlayoffAppearance).filter(
-                PlayoffAppearance.qb_id == qb.id,
-                PlayoffAppearance.season == season,
-                PlayoffAppearance.round == playoff_round
-            ).first()
-
-            if existing:
-                wins_skipped += 1
-                continue
-
-            # Create new playoff win entry
-            points = ScoringEngine.get_playoff_points(playoff_round, won_super_bowl)
-            appearance = PlayoffAppearance(
-                qb_id=qb.id,
-                season=season,
-                round=playoff_round,
-                won_super_bowl=won_super_bowl,
-                points=points
-            )
-            db.add(appearance)
-            wins_created += 1
-            wins_synced += 1
+        Player stats and the schedule are fetched concurrently and loaded
+        once, the roster is loaded once, and all three stages are diffed
+        into one change set written in a single transaction: either
+        everything commits or nothing does.
+
+        Seasons synced per week (or any season when incremental is set) use
+        the weekly stats stage. Incremental runs only process weeks and games
+        after the season's watermarks; otherwise every week is re-synced.
+
+        Args:
+            db: Database session
+            season: Season year
+            on_stage: Called with each stage name (see SYNC_ALL_STAGES) as
+                it starts, for progress reporting
+            incremental: Sync per week, only past the watermarks
+            dry_run: Only compute the change set; write nothing
 
-        db.commit()
+        Returns:
+            Each stage's summary, the change set counts (the change set
+            itself on dry runs) and per-stage timings in seconds
+        """
+        timings = {}
+
+        @contextmanager
+        def stage(name: str) -> Iterator[None]:
+            if on_stage is not None:
+                on_stage(name)
+            start = time.perf_counter()
+            yield
+            timings[name] = round(time.perf_counter() - start, 3)
+
+        weekly = incremental or NFLStatsService.uses_weekly_stats(db, season)
+        after_week = 0
+        if incremental:
+            after_week = NFLStatsService.get_watermark(db, season, "weekly_stats") or 0
+
+        with sync_metrics() as metrics:
+            with stage("fetch"):
+                last_completed_week = None
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    if weekly:
+                        stats_future = pool.submit(NFLStatsService.fetch_weekly_stats, season, after_week)
+                    else:
+                        stats_future = pool.submit(NFLStatsService.fetch_season_stats, season)
+                    week_future = pool.submit(NFLStatsService.fetch_last_completed_week, season)
+                    games_future = pool.submit(
+                        NFLStatsService.fetch_completed_games,
+                        season,
+                        ['REG', *NFLStatsService.PLAYOFF_GAME_TYPES]
+                    )
+                    stats_data = stats_future.result()
+                    completed_games = games_future.result()
+                    last_completed_week = week_future.result()
+
+            try:
+                with stage("stats"):
+                    roster = RosterIndex.build(db, season)
+                    watermarks = {}
+                    if weekly:
+                        stat_rows, stats = NFLStatsService._weekly_stat_inputs(
+                            db, season, stats_data, last_completed_week, roster, full=not incremental
+                        )
+                        clear_aggregate = stats.pop("clear_aggregate")
+                        watermarks["weekly_stats"] = stats["watermark"]
+                    else:
+                        stat_rows, stats = NFLStatsService._season_stat_inputs(db, season, stats_data, roster)
+                        clear_aggregate = False
+                with stage("wins"):
+                    win_rows, wins = NFLStatsService._win_inputs(
+                        db, season, completed_games, roster, incremental, last_completed_week
+                    )
+                    wins_watermark = wins.pop("watermark")
+                    if incremental:
+                        wins["watermark"] = watermarks["wins"] = wins_watermark
+                with stage("playoffs"):
+                    appearances, playoffs = NFLStatsService._playoff_inputs(db, season, completed_games, roster)
+                    playoff_plan = SyncChangeService.plan_playoffs(db, season, appearances)
+                    playoffs.update(NFLStatsService._playoffs_summary(playoff_plan))
+
+                with stage("diff"):
+                    weekly_plan = SyncChangeService.plan_weekly(
+                        db, season, stats=stat_rows, clear_aggregate=clear_aggregate, wins=win_rows
+                    )
+                    stats.update(NFLStatsService._stats_summary(weekly_plan))
+                    if clear_aggregate:
+                        stats["cleared_aggregate_rows"] = weekly_plan.filter(pl.col('week') == 0).height
+                    wins.update(NFLStatsService._wins_summary(weekly_plan))
+                    changes = SyncChangeService.build(
+                        db, season, weekly=weekly_plan, playoffs=playoff_plan,
+                        qb_ids=roster.learned, watermarks=watermarks
+                    )
+
+                if dry_run:
+                    result = NFLStatsService._finish(db, changes, dry_run=True, commit=False)
+                else:
+                    with stage("commit"):
+                        result = NFLStatsService._finish(db, changes, dry_run=False, commit=True)
+            except Exception:
+                db.rollback()
+                raise
 
         return {
             "season": season,
-            "total_wins_synced": wins_synced,
-            "created": wins_created,
-            "skipped_existing": wins_skipped,
-            "playoff_games_checked": len(playoff_games)
+            "stats": stats,
+            "wins": wins,
+            "playoffs": playoffs,
+            **result,
+            "timings": timings,
+            "metrics": metrics
         }
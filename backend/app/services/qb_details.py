@@ -0,0 +1,154 @@
+"""
+Quarterback scoring breakdowns for one or many QBs at once.
+
+Aggregate stats and win counts come from one grouped query over the weekly
+stats; the weekly lines, bonuses and playoff appearances are each loaded
+with one query for the whole batch. The number of queries doesn't grow with
+the number of QBs.
+"""
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+from app.models.models import Squad, Quarterback, WeeklyStat, SeasonBonus, PlayoffAppearance
+from app.services.scoring_rules import ScoringRuleService
+from typing import Dict, Iterable, List, Optional
+
+# Largest batch one request may ask for
+MAX_DETAIL_IDS = 100
+
+AGGREGATE_COLUMNS = (
+    "passing_yards", "rushing_yards", "passing_tds", "rushing_tds",
+    "receiving_tds", "interceptions", "fumbles"
+)
+
+class QuarterbackDetailService:
+    """
+    Builds the QB detail payload served by the quarterbacks router.
+    """
+
+    @staticmethod
+    def load_quarterbacks(db: Session, qb_ids: Optional[Iterable[int]] = None, squad_id: Optional[int] = None) -> List:
+        """
+        Load the identity rows (with squad name) of the given QBs, or of a
+        squad's roster, ordered by id.
+
+        Returns:
+            Rows with id, name, nfl_team, season and squad_name
+        """
+        query = (
+            select(
+                Quarterback.id, Quarterback.name, Quarterback.nfl_team, Quarterback.season,
+                Squad.name.label("squad_name")
+            )
+            .outerjoin(Squad, Squad.id == Quarterback.squad_id)
+            .order_by(Quarterback.id)
+        )
+        if qb_ids is not None:
+            query = query.where(Quarterback.id.in_(set(qb_ids)))
+        if squad_id is not None:
+            query = query.where(Quarterback.squad_id == squad_id)
+        return db.execute(query).all()
+
+    @staticmethod
+    def _aggregates(db: Session, qb_ids: List[int]) -> Dict[int, Dict]:
+        # One row per QB: stat sums, weekly points and win counts
+        won = func.coalesce(WeeklyStat.game_won, False)
+        prime_time = func.coalesce(WeeklyStat.prime_time_win, False)
+        query = (
+            select(
+                WeeklyStat.qb_id,
+                *(func.coalesce(func.sum(getattr(WeeklyStat, column)), 0).label(column) for column in AGGREGATE_COLUMNS),
+                func.coalesce(func.sum(WeeklyStat.points), 0.0).label("weekly_total"),
+                func.sum(case((and_(won, ~prime_time), 1), else_=0)).label("regular_wins"),
+                func.sum(case((and_(won, prime_time), 1), else_=0)).label("primetime_wins"),
+            )
+            .where(WeeklyStat.qb_id.in_(qb_ids))
+            .group_by(WeeklyStat.qb_id)
+        )
+        return {row.qb_id: row._asdict() for row in db.execute(query)}
+
+    @staticmethod
+    def get_details(db: Session, quarterbacks: List) -> Dict[int, Dict]:
+        """
+        Build the scoring breakdown for each QB.
+
+        Args:
+            db: Database session
+            quarterbacks: Rows from load_quarterbacks
+
+        Returns:
+            QB id -> detail payload (same shape as GET /api/quarterbacks/{id}/)
+        """
+        qb_ids = [qb.id for qb in quarterbacks]
+        if not qb_ids:
+            return {}
+
+        aggregates = QuarterbackDetailService._aggregates(db, qb_ids)
+        rules = {season: ScoringRuleService.get_rules(db, season) for season in {qb.season for qb in quarterbacks}}
+
+        weekly_stats: Dict[int, List[Dict]] = {qb_id: [] for qb_id in qb_ids}
+        for stat in db.query(WeeklyStat).filter(WeeklyStat.qb_id.in_(qb_ids)).order_by(WeeklyStat.qb_id, WeeklyStat.id):
+            weekly_stats[stat.qb_id].append({
+                "week": stat.week,
+                "passing_yards": stat.passing_yards,
+                "rushing_yards": stat.rushing_yards,
+                "passing_tds": stat.passing_tds,
+                "rushing_tds": stat.rushing_tds,
+                "receiving_tds": stat.receiving_tds,
+                "interceptions": stat.interceptions,
+                "fumbles": stat.fumbles,
+                "game_won": stat.game_won,
+                "prime_time_win": stat.prime_time_win,
+                "points": stat.points
+            })
+
+        bonuses: Dict[int, List[Dict]] = {qb_id: [] for qb_id in qb_ids}
+        for qb_id, bonus_type, points in db.query(SeasonBonus.qb_id, SeasonBonus.bonus_type, SeasonBonus.points) \
+                .filter(SeasonBonus.qb_id.in_(qb_ids)).order_by(SeasonBonus.qb_id, SeasonBonus.id):
+            bonuses[qb_id].append({"type": bonus_type.value, "points": points})
+
+        playoffs: Dict[int, List[Dict]] = {qb_id: [] for qb_id in qb_ids}
+        for qb_id, playoff_round, won_super_bowl, points in db.query(
+            PlayoffAppearance.qb_id, PlayoffAppearance.round, PlayoffAppearance.won_super_bowl, PlayoffAppearance.points
+        ).filter(PlayoffAppearance.qb_id.in_(qb_ids)).order_by(PlayoffAppearance.qb_id, PlayoffAppearance.id):
+            playoffs[qb_id].append({"round": playoff_round.value, "won_super_bowl": won_super_bowl, "points": points})
+
+        details = {}
+        for qb in quarterbacks:
+            aggregate = aggregates.get(qb.id, {})
+            season_rules = rules[qb.season]
+            regular_wins = aggregate.get("regular_wins") or 0
+            primetime_wins = aggregate.get("primetime_wins") or 0
+            weekly_total = float(aggregate.get("weekly_total") or 0.0)
+            bonus_total = sum((bonus["points"] for bonus in bonuses[qb.id]), 0.0)
+            playoff_total = sum((playoff["points"] for playoff in playoffs[qb.id]), 0.0)
+
+            details[qb.id] = {
+                "qb_id": qb.id,
+                "name": qb.name,
+                "nfl_team": qb.nfl_team,
+                "squad_name": qb.squad_name or "Free Agent",
+                "season": qb.season,
+                "total_points": round(weekly_total + bonus_total + playoff_total, 2),
+                "breakdown": {
+                    "aggregate_stats": {
+                        **{column: aggregate.get(column) or 0 for column in AGGREGATE_COLUMNS},
+                        "regular_wins": regular_wins,
+                        "regular_wins_points": round(float(regular_wins * season_rules["win"]), 2),
+                        "primetime_wins": primetime_wins,
+                        "primetime_wins_points": round(float(primetime_wins * season_rules["prime_time_win"]), 2)
+                    },
+                    "weekly_stats": {
+                        "stats": weekly_stats[qb.id],
+                        "total": round(weekly_total, 2)
+                    },
+                    "bonuses": {
+                        "awards": bonuses[qb.id],
+                        "total": round(bonus_total, 2)
+                    },
+                    "playoffs": {
+                        "appearances": playoffs[qb.id],
+                        "total": round(playoff_total, 2)
+                    }
+                }
+            }
+        return details
@@ -0,0 +1,218 @@
+"""
+Roster index for matching nflverse rows to rostered quarterbacks.
+
+Rows are matched by nflverse player ID (gsis_id) first, then by normalized
+name: lowercased, accents and punctuation removed, generational suffixes
+dropped, so "C.J. Stroud", "CJ Stroud" and "Michael Penix Jr." / "Michael
+Penix" compare equal. Rows that carry only an abbreviated name ("C.Stroud")
+fall back to a first-initial + surname alias, used only when it is unique
+on the roster.
+"""
+from sqlalchemy.orm import Session
+from app.models.models import Quarterback
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+import re
+import unicodedata
+
+if TYPE_CHECKING:
+    import polars as pl
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+def _polars():
+    # Polars is imported on first use so the API starts without it
+    # (normalize_name is all the awards endpoints need from here)
+    import polars
+    return polars
+
+def _name_tokens(name: Optional[str], split_periods: bool = False) -> List[str]:
+    if not name:
+        return []
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    # Periods and apostrophes join initials ("C.J." -> "cj"); other
+    # punctuation separates words. Abbreviated names ("C.Stroud") need the
+    # period as a separator instead.
+    cleaned = re.sub(r"['`]" if split_periods else r"[.'`]", "", ascii_name.lower())
+    tokens = re.sub(r"[^a-z0-9]+", " ", cleaned).split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return tokens
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Return the comparison key for a full name (None if empty)."""
+    tokens = _name_tokens(name)
+    return "".join(tokens) or None
+
+def name_alias(name: Optional[str]) -> Optional[str]:
+    """
+    Return the first-initial + surname key ("C.J. Stroud" and "C.Stroud"
+    -> "cstroud").
+    """
+    tokens = _name_tokens(name, split_periods=True)
+    if len(tokens) < 2:
+        return None
+    return tokens[0][0] + tokens[-1]
+
+class RosterIndex:
+    """
+    A season's rostered QBs keyed by nflverse player ID, normalized name and
+    unambiguous alias, as Polars frames for vectorized joins. Build it once
+    per sync run and share it across stages.
+    """
+
+    def __init__(self, season: int, quarterbacks: Iterable):
+        pl = _polars()
+
+        self.season = season
+        self.names_by_id: Dict[int, str] = {}
+        self.gsis_by_id: Dict[int, Optional[str]] = {}
+        # IDs learned from name matches during this run, not yet stored
+        self.learned: List[Dict] = []
+        id_rows, name_rows = [], []
+        aliases: Dict[str, List[int]] = {}
+
+        for qb_id, name, gsis_id in quarterbacks:
+            self.names_by_id[qb_id] = name
+            self.gsis_by_id[qb_id] = gsis_id
+            if gsis_id:
+                id_rows.append((gsis_id, qb_id))
+            key = normalize_name(name)
+            if key:
+                name_rows.append((key, qb_id))
+            alias = name_alias(name)
+            if alias:
+                aliases.setdefault(alias, []).append(qb_id)
+
+        self.ids = pl.DataFrame(id_rows, schema={"key": pl.Utf8, "qb_id": pl.Int64}, orient="row").unique("key", keep="none")
+        self.names = pl.DataFrame(name_rows, schema={"key": pl.Utf8, "qb_id": pl.Int64}, orient="row").unique("key", keep="none")
+        self.aliases = pl.DataFrame(
+            [(alias, qb_ids[0]) for alias, qb_ids in aliases.items() if len(qb_ids) == 1],
+            schema={"key": pl.Utf8, "qb_id": pl.Int64},
+            orient="row"
+        )
+
+    @staticmethod
+    def build(db: Session, season: int) -> "RosterIndex":
+        """Load the season's roster and build its index."""
+        rows = db.query(Quarterback.id, Quarterback.name, Quarterback.gsis_id).filter(
+            Quarterback.season == season
+        ).all()
+        return RosterIndex(season, rows)
+
+    @staticmethod
+    def _keys(frame: "pl.DataFrame", column: Optional[str], normalize) -> "pl.Series":
+        pl = _polars()
+
+        if column is None or column not in frame.columns:
+            return pl.Series([None] * frame.height, dtype=pl.Utf8)
+        values = frame[column].cast(pl.Utf8)
+        # Normalize each distinct name once, then map the column
+        mapping = {value: normalize(value) for value in values.unique().drop_nulls().to_list()}
+        return values.replace_strict(mapping, default=None, return_dtype=pl.Utf8)
+
+    def match(
+        self,
+        frame: "pl.DataFrame",
+        id_column: Optional[str],
+        name_columns: List[str],
+        abbreviated_column: Optional[str] = None
+    ) -> "pl.DataFrame":
+        """
+        Add qb_id and matched_by ("id", "name", "alias" or null) columns to
+        an nflverse frame. Rows that match nobody keep a null qb_id.
+
+        Args:
+            frame: nflverse rows
+            id_column: Column holding the nflverse player ID, if any
+            name_columns: Full-name columns, tried in order
+            abbreviated_column: Abbreviated-name column ("C.Stroud"), used
+                via aliases only for rows with no full name
+        """
+        pl = _polars()
+
+        frame = frame.with_columns(self._keys(frame, id_column, lambda value: value).alias("_id_key"))
+        candidates = [("_id_key", self.ids, "id")]
+
+        for index, column in enumerate(name_columns):
+            frame = frame.with_columns(self._keys(frame, column, normalize_name).alias(f"_name_key_{index}"))
+            candidates.append((f"_name_key_{index}", self.names, "name"))
+
+        if abbreviated_column is not None:
+            full_name_columns = [
+                column for column in name_columns
+                if column in frame.columns and column != abbreviated_column
+            ]
+            has_full_name = pl.any_horizontal(
+                [pl.col(column).is_not_null() for column in full_name_columns] or [pl.lit(False)]
+            )
+            frame = frame.with_columns(
+                pl.when(has_full_name).then(None)
+                .otherwise(self._keys(frame, abbreviated_column, name_alias))
+                .alias("_alias_key")
+            )
+            candidates.append(("_alias_key", self.aliases, "alias"))
+
+        helper_columns = []
+        for position, (key_column, lookup, _) in enumerate(candidates):
+            frame = frame.join(
+                lookup.rename({"key": key_column, "qb_id": f"_qb_{position}"}),
+                on=key_column, how="left", maintain_order="left"
+            )
+            helper_columns += [key_column, f"_qb_{position}"]
+
+        qb_columns = [f"_qb_{position}" for position in range(len(candidates))]
+        matched_by = pl.lit(None, dtype=pl.Utf8)
+        for position in reversed(range(len(candidates))):
+            matched_by = pl.when(pl.col(qb_columns[position]).is_not_null()).then(
+                pl.lit(candidates[position][2])
+            ).otherwise(matched_by)
+
+        return frame.with_columns(
+            pl.coalesce(qb_columns).alias("qb_id"),
+            matched_by.alias("matched_by")
+        ).drop(helper_columns)
+
+    def unmatched_roster(self, matched_qb_ids: Iterable[int]) -> List[str]:
+        """Names of rostered QBs that matched no row, sorted."""
+        matched = set(matched_qb_ids)
+        return sorted(name for qb_id, name in self.names_by_id.items() if qb_id not in matched)
+
+    def learn_ids(self, matched: "pl.DataFrame", id_column: str = "player_id") -> List[Dict]:
+        """
+        Pick up the nflverse player ID of QBs matched by name that don't
+        have one yet, so later stages and syncs match them by ID. The index
+        is updated in memory; the IDs are written with the sync's change set.
+
+        Returns:
+            Newly learned {"qb_id", "gsis_id"} pairs (also appended to
+            self.learned)
+        """
+        pl = _polars()
+
+        if id_column not in matched.columns:
+            return []
+        known_ids = {gsis_id for gsis_id in self.gsis_by_id.values() if gsis_id}
+        learned = []
+        # Only IDs that point at a single QB in this frame are trusted
+        pairs = matched.filter(
+            pl.col("qb_id").is_not_null() & pl.col(id_column).is_not_null()
+        ).select("qb_id", id_column, "matched_by").unique(["qb_id", id_column])
+        unambiguous = pairs.filter(
+            (pl.len().over(id_column) == 1) & (pl.len().over("qb_id") == 1)
+        )
+        rows = unambiguous.filter(pl.col("matched_by") != "id").select("qb_id", id_column)
+        for qb_id, gsis_id in rows.iter_rows():
+            if self.gsis_by_id.get(qb_id) or gsis_id in known_ids:
+                continue
+            self.gsis_by_id[qb_id] = gsis_id
+            known_ids.add(gsis_id)
+            learned.append({"qb_id": qb_id, "gsis_id": gsis_id})
+        if learned:
+            self.learned.extend(learned)
+            # Keep the ID lookup in step for later stages of the same run
+            self.ids = pl.DataFrame(
+                [(gsis_id, qb_id) for qb_id, gsis_id in self.gsis_by_id.items() if gsis_id],
+                schema={"key": pl.Utf8, "qb_id": pl.Int64},
+                orient="row"
+            ).unique("key", keep="none")
+        return learned
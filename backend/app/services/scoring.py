@@ -1,16 +1,133 @@
 from app.models.models import WeeklyStat, BonusType, PlayoffRound
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import polars as pl
+
+# League scoring rules (league_rules.md Section 6.2). A season can override
+# them through ScoringRuleService; every value is a whole number of
+# hundredths of a point (and yards-per-point divides 100) so stored points
+# can be recomputed exactly, in Python, Polars or SQL.
+DEFAULT_SCORING_RULES = {
+    "passing_yards_per_point": 25,
+    "rushing_yards_per_point": 10,
+    "touchdown": 6,
+    "interception": -3,
+    "fumble": -3,
+    "win": 3,
+    "prime_time_win": 4,
+    "bonuses": {
+        BonusType.MVP.value: 50.0,
+        BonusType.MVP_RUNNER_UP.value: 40.0,
+        BonusType.MVP_3RD.value: 30.0,
+        BonusType.MVP_4TH.value: 20.0,
+        BonusType.MVP_5TH.value: 10.0,
+        BonusType.ROOKIE_OF_YEAR.value: 30.0,
+        BonusType.CONF_POW.value: 10.0,
+        BonusType.CONF_POM.value: 20.0,
+    },
+    "playoffs": {
+        PlayoffRound.WILD_CARD.value: 3.0,
+        PlayoffRound.DIVISIONAL.value: 6.0,
+        PlayoffRound.CONF_CHAMPIONSHIP.value: 10.0,
+        PlayoffRound.SUPER_BOWL.value: 15.0,
+    },
+    "super_bowl_win": 25.0,
+}
+
+# WeeklyStat columns that feed weekly points, with the value used when a
+# column is missing or NULL (the scalar path's "or 0")
+WEEKLY_SCORING_COLUMNS = {
+    'passing_yards': 0,
+    'rushing_yards': 0,
+    'passing_tds': 0,
+    'rushing_tds': 0,
+    'receiving_tds': 0,
+    'interceptions': 0,
+    'fumbles': 0,
+    'game_won': False,
+    'prime_time_win': False,
+}
+
+def _hundredths(points) -> int:
+    return int(round(points * 100))
 
 class ScoringEngine:
     """
-    Scoring engine based on AR15 League rules (league_rules.md Section 6.2)
+    Scoring engine based on AR15 League rules (league_rules.md Section 6.2).
+
+    Every method takes an optional rules dict (see DEFAULT_SCORING_RULES and
+    ScoringRuleService.get_rules); None means the league defaults.
     """
 
     @staticmethod
-    def calculate_weekly_points(stat: WeeklyStat) -> float:
+    def validate_rules(rules: Dict) -> Dict:
+        """
+        Merge a (partial) rule set over the defaults and check it.
+
+        Raises:
+            ValueError: Unknown keys, or values that aren't whole hundredths
+                of a point / yards-per-point values that don't divide 100
+
+        Returns:
+            The complete rule set
+        """
+        unknown = set(rules) - set(DEFAULT_SCORING_RULES)
+        if unknown:
+            raise ValueError(f"Unknown scoring rules: {', '.join(sorted(unknown))}")
+
+        merged = {**DEFAULT_SCORING_RULES, **rules}
+        for table in ("bonuses", "playoffs"):
+            unknown = set(rules.get(table, {})) - set(DEFAULT_SCORING_RULES[table])
+            if unknown:
+                raise ValueError(f"Unknown {table} entries: {', '.join(sorted(unknown))}")
+            merged[table] = {**DEFAULT_SCORING_RULES[table], **rules.get(table, {})}
+
+        for key in ("passing_yards_per_point", "rushing_yards_per_point"):
+            value = merged[key]
+            if not isinstance(value, int) or isinstance(value, bool) or value <= 0 or 100 % value:
+                raise ValueError(f"{key} must be a whole number that divides 100 (got {value!r})")
+
+        values = [
+            (key, merged[key])
+            for key in ("touchdown", "interception", "fumble", "win", "prime_time_win", "super_bowl_win")
+        ]
+        values += [(f"bonuses.{name}", value) for name, value in merged["bonuses"].items()]
+        values += [(f"playoffs.{name}", value) for name, value in merged["playoffs"].items()]
+        for key, value in values:
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or abs(value * 100 - round(value * 100)) > 1e-9:
+                raise ValueError(f"{key} must be a number with at most 2 decimal places (got {value!r})")
+        return merged
+
+    @staticmethod
+    def weekly_hundredths(rules: Optional[Dict] = None) -> Dict[str, int]:
+        """Weekly scoring rules as whole hundredths of a point per unit."""
+        rules = rules or DEFAULT_SCORING_RULES
+        return {
+            "passing_yard": 100 // rules["passing_yards_per_point"],
+            "rushing_yard": 100 // rules["rushing_yards_per_point"],
+            "touchdown": _hundredths(rules["touchdown"]),
+            "interception": _hundredths(rules["interception"]),
+            "fumble": _hundredths(rules["fumble"]),
+            "win": _hundredths(rules["win"]),
+            "prime_time_win": _hundredths(rules["prime_time_win"]),
+        }
+
+    @staticmethod
+    def same_points(a: Optional[float], b: Optional[float]) -> bool:
+        """
+        Whether two points values are equal to the hundredth (None counts
+        as 0). Stored and freshly computed floats can differ in the last
+        bits when they come from different paths (Python, Polars, SQL).
+        """
+        return _hundredths(a or 0.0) == _hundredths(b or 0.0)
+
+    @staticmethod
+    def calculate_weekly_points(stat: WeeklyStat, rules: Optional[Dict] = None) -> float:
         """
         Calculate points for a weekly stat line.
 
-        Scoring:
+        Scoring (defaults):
         - 25 passing yards = 1 point
         - 10 rushing yards = 1 point
         - Touchdowns (any type) = 6 points
@@ -18,39 +135,96 @@ class ScoringEngine:
         - Fumbles = -3 points
         - Regular season wins = 3 points (+1 for prime time)
         """
+        rules = rules or DEFAULT_SCORING_RULES
         points = 0.0
 
         # Passing yards: 25 yards = 1 point
-        points += (stat.passing_yards or 0) / 25.0
+        points += (stat.passing_yards or 0) / float(rules["passing_yards_per_point"])
 
         # Rushing yards: 10 yards = 1 point
-        points += (stat.rushing_yards or 0) / 10.0
+        points += (stat.rushing_yards or 0) / float(rules["rushing_yards_per_point"])
 
         # Touchdowns: 6 points each
         passing_tds = stat.passing_tds or 0
         rushing_tds = stat.rushing_tds or 0
         receiving_tds = stat.receiving_tds or 0
         total_tds = passing_tds + rushing_tds + receiving_tds
-        points += total_tds * 6
+        points += total_tds * rules["touchdown"]
 
         # Interceptions: -3 points each
-        points -= (stat.interceptions or 0) * 3
+        points += (stat.interceptions or 0) * rules["interception"]
 
         # Fumbles: -3 points each
-        points -= (stat.fumbles or 0) * 3
+        points += (stat.fumbles or 0) * rules["fumble"]
 
         # Game wins: 3 points (4 points if prime time)
         if stat.game_won:
-            points += 4 if stat.prime_time_win else 3
+            points += rules["prime_time_win"] if stat.prime_time_win else rules["win"]
 
         return round(points, 2)
 
     @staticmethod
-    def get_bonus_points(bonus_type: BonusType) -> float:
+    def weekly_points_expr(rules: Optional[Dict] = None) -> "pl.Expr":
+        """
+        calculate_weekly_points as a Polars expression over stat columns
+        (which must be non-null; see calculate_batch).
+
+        Every rule is a whole number of hundredths of a point, so the total
+        is summed exactly in integer hundredths. Polars divides by a constant
+        via its reciprocal, so the quotient is rounded to 2 places to land on
+        the same floats as the scalar path's round(points, 2).
+        """
+        # Polars is imported on first use; only batch scoring needs it
+        import polars as pl
+
+        rates = ScoringEngine.weekly_hundredths(rules)
+        hundredths = (
+            pl.col('passing_yards') * rates["passing_yard"]
+            + pl.col('rushing_yards') * rates["rushing_yard"]
+            + (pl.col('passing_tds') + pl.col('rushing_tds') + pl.col('receiving_tds')) * rates["touchdown"]
+            + pl.col('interceptions') * rates["interception"]
+            + pl.col('fumbles') * rates["fumble"]
+        )
+        win_hundredths = (
+            pl.when(pl.col('game_won'))
+            .then(pl.when(pl.col('prime_time_win')).then(rates["prime_time_win"]).otherwise(rates["win"]))
+            .otherwise(0)
+        )
+        return ((hundredths + win_hundredths) / 100.0).round(2)
+
+    @staticmethod
+    def calculate_batch(stats, rules: Optional[Dict] = None) -> "pl.Series":
+        """
+        Calculate points for many weekly stat lines at once, with the same
+        rules and the same rounded floats as calculate_weekly_points.
+
+        Args:
+            stats: Columnar stat lines: a Polars or pandas DataFrame, or a
+                mapping of column name -> NumPy array / list. Missing
+                columns and nulls count as 0 / False.
+            rules: Season rule set (defaults if None)
+
+        Returns:
+            Float64 "points" Series, one value per row
+        """
+        import polars as pl
+
+        frame = stats if isinstance(stats, pl.DataFrame) else pl.DataFrame(stats)
+        columns = []
+        for column, default in WEEKLY_SCORING_COLUMNS.items():
+            dtype = pl.Boolean if isinstance(default, bool) else pl.Int64
+            if column in frame.columns:
+                columns.append(pl.col(column).cast(dtype).fill_null(default))
+            else:
+                columns.append(pl.lit(default, dtype=dtype).alias(column))
+        return frame.select(columns).select(ScoringEngine.weekly_points_expr(rules).alias('points')).to_series()
+
+    @staticmethod
+    def get_bonus_points(bonus_type: BonusType, rules: Optional[Dict] = None) -> float:
         """
         Get points for season bonuses.
 
-        Scoring:
+        Scoring (defaults):
         - MVP = 50 points
         - MVP Runner-Up = 40 points
         - MVP 3rd Place = 30 points
@@ -60,41 +234,28 @@ class ScoringEngine:
         - Conference POW = 10 points
         - Conference POM = 20 points
         """
-        bonus_points = {
-            BonusType.MVP: 50.0,
-            BonusType.MVP_RUNNER_UP: 40.0,
-            BonusType.MVP_3RD: 30.0,
-            BonusType.MVP_4TH: 20.0,
-            BonusType.MVP_5TH: 10.0,
-            BonusType.ROOKIE_OF_YEAR: 30.0,
-            BonusType.CONF_POW: 10.0,
-            BonusType.CONF_POM: 20.0,
-        }
-        return bonus_points.get(bonus_type, 0.0)
+        bonus_points = (rules or DEFAULT_SCORING_RULES)["bonuses"]
+        return float(bonus_points.get(BonusType(bonus_type).value, 0.0))
 
     @staticmethod
-    def get_playoff_points(round: PlayoffRound, won_super_bowl: bool = False) -> float:
+    def get_playoff_points(round: PlayoffRound, won_super_bowl: bool = False, rules: Optional[Dict] = None) -> float:
         """
         Get points for playoff appearances (cumulative).
 
-        Scoring:
+        Scoring (defaults):
         - Wild Card Appearance = 3 points
         - Divisional Round Appearance = 6 points
         - Conference Championship Appearance = 10 points
         - Super Bowl Appearance = 15 points
         - Super Bowl Win = 25 points (additional)
         """
-        round_points = {
-            PlayoffRound.WILD_CARD: 3.0,
-            PlayoffRound.DIVISIONAL: 6.0,
-            PlayoffRound.CONF_CHAMPIONSHIP: 10.0,
-            PlayoffRound.SUPER_BOWL: 15.0,
-        }
+        rules = rules or DEFAULT_SCORING_RULES
+        round = PlayoffRound(round)
 
-        points = round_points.get(round, 0.0)
+        points = float(rules["playoffs"].get(round.value, 0.0))
 
         # Add Super Bowl win bonus
         if round == PlayoffRound.SUPER_BOWL and won_super_bowl:
-            points += 25.0
+            points += float(rules["super_bowl_win"])
 
         return points
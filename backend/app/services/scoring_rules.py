@@ -0,0 +1,206 @@
+"""
+Per-season scoring rule sets and retroactive rescoring.
+
+Rule sets are stored in scoring_rule_sets as overrides of
+DEFAULT_SCORING_RULES. Rescoring a season recomputes every stored points
+value (weekly stats, season bonuses, playoff appearances) with one set-based
+UPDATE per table, then rebuilds the season's materialized totals and reports
+how the standings moved.
+"""
+from sqlalchemy import Float, and_, case, cast, func, literal, update
+from sqlalchemy.orm import Session
+from app.models.models import (
+    Quarterback, Squad, WeeklyStat, SeasonBonus, PlayoffAppearance, BonusType, PlayoffRound,
+    QBSeasonTotal, SquadSeasonTotal, ScoringRuleSet
+)
+from app.services.scoring import DEFAULT_SCORING_RULES, ScoringEngine
+from app.services.totals import TotalsService
+from app.services.cache import SeasonVersionService
+from datetime import datetime, timezone
+from typing import Dict, List
+import copy
+
+class ScoringRuleService:
+    """
+    Loads, stores and applies season scoring rule sets.
+    """
+
+    @staticmethod
+    def get_rules(db: Session, season: int) -> Dict:
+        """Return a season's complete rule set (the defaults if none is stored)."""
+        stored = db.query(ScoringRuleSet.rules).filter(ScoringRuleSet.season == season).scalar()
+        if stored is None:
+            return copy.deepcopy(DEFAULT_SCORING_RULES)
+        return ScoringEngine.validate_rules(stored)
+
+    @staticmethod
+    def is_custom(db: Session, season: int) -> bool:
+        """Whether a season overrides the default rules."""
+        return db.query(ScoringRuleSet.season).filter(ScoringRuleSet.season == season).first() is not None
+
+    @staticmethod
+    def set_rules(db: Session, season: int, rules: Dict) -> Dict:
+        """
+        Store a season's rule overrides (merged over the defaults). Stored
+        points are not touched; run rescore() to apply the new rules.
+        Does not commit.
+
+        Raises:
+            ValueError: Invalid rules (see ScoringEngine.validate_rules)
+
+        Returns:
+            The complete rule set
+        """
+        merged = ScoringEngine.validate_rules(rules)
+        row = db.get(ScoringRuleSet, season)
+        if row is None:
+            row = ScoringRuleSet(season=season)
+            db.add(row)
+        row.rules = merged
+        row.updated_at = datetime.now(timezone.utc)
+        db.flush()
+        # Cached payloads (e.g. the QB win-points breakdown) read the rules
+        SeasonVersionService.bump(db, [season])
+        return merged
+
+    @staticmethod
+    def _weekly_points(rules: Dict):
+        # Integer hundredths divided by 100.0 gives exactly the float the
+        # scalar path's round(points, 2) returns
+        rates = ScoringEngine.weekly_hundredths(rules)
+
+        def value(column):
+            return func.coalesce(column, 0)
+
+        hundredths = (
+            value(WeeklyStat.passing_yards) * rates["passing_yard"]
+            + value(WeeklyStat.rushing_yards) * rates["rushing_yard"]
+            + (value(WeeklyStat.passing_tds) + value(WeeklyStat.rushing_tds) + value(WeeklyStat.receiving_tds))
+            * rates["touchdown"]
+            + value(WeeklyStat.interceptions) * rates["interception"]
+            + value(WeeklyStat.fumbles) * rates["fumble"]
+            + case(
+                (WeeklyStat.game_won.is_(True), case(
+                    (WeeklyStat.prime_time_win.is_(True), rates["prime_time_win"]),
+                    else_=rates["win"]
+                )),
+                else_=0
+            )
+        )
+        return cast(hundredths, Float) / literal(100.0, Float)
+
+    @staticmethod
+    def _bonus_points(rules: Dict):
+        return case(
+            {BonusType(name): float(points) for name, points in rules["bonuses"].items()},
+            value=SeasonBonus.bonus_type,
+            else_=SeasonBonus.points
+        )
+
+    @staticmethod
+    def _playoff_points(rules: Dict):
+        round_points = case(
+            {PlayoffRound(name): float(points) for name, points in rules["playoffs"].items()},
+            value=PlayoffAppearance.round,
+            else_=0.0
+        )
+        super_bowl_bonus = case(
+            (and_(
+                PlayoffAppearance.round == PlayoffRound.SUPER_BOWL,
+                PlayoffAppearance.won_super_bowl.is_(True)
+            ), float(rules["super_bowl_win"])),
+            else_=0.0
+        )
+        return round_points + super_bowl_bonus
+
+    @staticmethod
+    def _standings(db: Session, season: int):
+        qbs = {
+            qb_id: (name, squad_id, total)
+            for qb_id, name, squad_id, total in db.query(
+                Quarterback.id, Quarterback.name, Quarterback.squad_id, QBSeasonTotal.total_points
+            ).outerjoin(QBSeasonTotal, QBSeasonTotal.qb_id == Quarterback.id)
+            .filter(Quarterback.season == season)
+        }
+        squads = {
+            squad_id: (name, total, rank)
+            for squad_id, name, total, rank in db.query(
+                Squad.id, Squad.name, SquadSeasonTotal.total_points, SquadSeasonTotal.rank
+            ).outerjoin(SquadSeasonTotal, SquadSeasonTotal.squad_id == Squad.id)
+            .filter(Squad.season == season)
+        }
+        return qbs, squads
+
+    @staticmethod
+    def rescore(db: Session, season: int, dry_run: bool = False) -> Dict:
+        """
+        Recompute every stored points value of a season under its rule set
+        with set-based UPDATEs, rebuild the season's totals and commit.
+
+        Args:
+            db: Database session
+            season: Season year
+            dry_run: Compute the report, then roll everything back
+
+        Returns:
+            Rows changed per table, plus the standings deltas: QBs whose
+            total changed and every squad's total and rank before/after
+        """
+        rules = ScoringRuleService.get_rules(db, season)
+        qbs_before, squads_before = ScoringRuleService._standings(db, season)
+
+        rows_changed = {}
+        for table, model, points in (
+            ("weekly_stats", WeeklyStat, ScoringRuleService._weekly_points(rules)),
+            ("season_bonuses", SeasonBonus, ScoringRuleService._bonus_points(rules)),
+            ("playoff_appearances", PlayoffAppearance, ScoringRuleService._playoff_points(rules)),
+        ):
+            result = db.execute(
+                update(model)
+                .where(model.season == season, model.points.is_distinct_from(points))
+                .values(points=points)
+                .execution_options(synchronize_session=False)
+            )
+            rows_changed[table] = result.rowcount
+
+        if any(rows_changed.values()):
+            TotalsService.rebuild_season(db, season)
+        qbs_after, squads_after = ScoringRuleService._standings(db, season)
+
+        qb_deltas: List[Dict] = []
+        for qb_id, (name, squad_id, after) in sorted(qbs_after.items()):
+            before = qbs_before.get(qb_id, (name, squad_id, None))[2] or 0.0
+            delta = round((after or 0.0) - before, 2)
+            if delta:
+                qb_deltas.append({
+                    "qb_id": qb_id, "name": name, "squad_id": squad_id,
+                    "before": before, "after": after, "delta": delta
+                })
+
+        squad_deltas = []
+        for squad_id, (name, after, rank_after) in squads_after.items():
+            _, before, rank_before = squads_before.get(squad_id, (name, None, None))
+            squad_deltas.append({
+                "squad_id": squad_id,
+                "name": name,
+                "before": before,
+                "after": after,
+                "delta": round((after or 0.0) - (before or 0.0), 2),
+                "rank_before": rank_before,
+                "rank_after": rank_after,
+            })
+        squad_deltas.sort(key=lambda squad: (squad["rank_after"] is None, squad["rank_after"] or 0))
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+        return {
+            "season": season,
+            "dry_run": dry_run,
+            "rules": rules,
+            "rows_changed": rows_changed,
+            "qb_deltas": qb_deltas,
+            "squad_deltas": squad_deltas,
+        }
@@ -0,0 +1,75 @@
+"""
+Whole-season snapshot: standings, rosters, the QB leaderboard and the worst
+QB in one payload, for pages that would otherwise call several endpoints.
+"""
+from sqlalchemy.orm import Session
+from app.services.standings import StandingsService
+from typing import Dict, List
+
+class SnapshotService:
+    """
+    Builds a season snapshot from the materialized totals, with the same
+    StandingsService reads the single endpoints use.
+    """
+
+    @staticmethod
+    def build(db: Session, season: int) -> Dict:
+        """
+        Build the season snapshot. Each section has the same shape and
+        ranking as the matching single endpoint, from three queries: squad
+        totals, QB totals by squad rank, and the QB leaderboard.
+
+        Args:
+            db: Database session
+            season: Season year
+
+        Returns:
+            Dict with season, standings, worst_qb, squads, rosters
+            (one per squad, by squad id) and quarterbacks
+        """
+        squads = StandingsService.get_squad_totals(db, season)
+        ranked_qbs = StandingsService.get_ranked_qbs(db, season)
+        all_qbs = StandingsService.get_all_qbs(db, season)
+
+        # get_ranked_qbs is sorted by squad rank, so each roster comes out ranked
+        roster_qbs: Dict[int, List[Dict]] = {squad["id"]: [] for squad in squads}
+        for qb in ranked_qbs:
+            if qb["squad_id"] in roster_qbs:
+                roster_qbs[qb["squad_id"]].append({
+                    "qb_id": qb["qb_id"],
+                    "name": qb["name"],
+                    "nfl_team": qb["nfl_team"],
+                    "total_points": qb["total_points"],
+                    "is_top_5": qb["squad_rank"] <= 5,
+                    "rank": qb["squad_rank"]
+                })
+
+        return {
+            "season": season,
+            "standings": StandingsService.build_league_standings(season, squads, ranked_qbs),
+            "worst_qb": StandingsService.find_worst_qb(all_qbs),
+            "squads": [
+                {key: squad[key] for key in ("id", "name", "owner", "season", "total_points", "qb_count")}
+                for squad in squads
+            ],
+            "rosters": [
+                {
+                    "squad_id": squad["id"],
+                    "squad_name": squad["name"],
+                    "owner": squad["owner"],
+                    "season": squad["season"],
+                    "roster": roster_qbs[squad["id"]]
+                }
+                for squad in squads
+            ],
+            "quarterbacks": [
+                {
+                    "id": qb["qb_id"],
+                    "name": qb["name"],
+                    "nfl_team": qb["nfl_team"],
+                    "squad_name": qb["squad_name"],
+                    "total_points": qb["total_points"]
+                }
+                for qb in all_qbs
+            ]
+        }
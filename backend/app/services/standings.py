@@ -1,6 +1,10 @@
+from sqlalchemy import Float, Numeric, case, cast, func, select, union_all
 from sqlalchemy.orm import Session
-from app.models.models import Squad, Quarterback
-from typing import List, Dict
+from app.models.models import (
+    Squad, Quarterback, WeeklyStat, SeasonBonus, PlayoffAppearance,
+    QBSeasonTotal, SquadSeasonTotal
+)
+from typing import List, Dict, Optional
 
 class StandingsService:
     """
@@ -86,89 +90,277 @@ class StandingsService:
         return round(total, 2)
 
     @staticmethod
-    def get_squad_top_qbs(squad: Squad, limit: int = 5) -> List[Dict]:
+    def _qb_totals_subquery():
         """
-        Get top N QBs for a squad, sorted by total points.
+        Aggregate every scoring row (weekly stats + bonuses + playoffs) into
+        one total per QB. Rounded to 2 decimals in SQL so ordering and
+        tie-breaking match the Python totals exactly.
         """
-        qb_points = []
+        scoring_rows = union_all(
+            select(WeeklyStat.qb_id.label("qb_id"), WeeklyStat.points.label("points")),
+            select(SeasonBonus.qb_id, SeasonBonus.points),
+            select(PlayoffAppearance.qb_id, PlayoffAppearance.points),
+        ).subquery("scoring_rows")
 
-        for qb in squad.quarterbacks:
-            total_points = StandingsService.get_qb_total_points(qb)
-            qb_points.append({
-                "qb_id": qb.id,
-                "name": qb.name,
-                "nfl_team": qb.nfl_team,
-                "total_points": total_points
-            })
+        return (
+            select(
+                scoring_rows.c.qb_id,
+                func.round(cast(func.sum(scoring_rows.c.points), Numeric), 2, type_=Float).label("total_points"),
+            )
+            .group_by(scoring_rows.c.qb_id)
+            .subquery("qb_totals")
+        )
+
+    @staticmethod
+    def _ranked_qbs_subquery(season: int):
+        """
+        One row per QB in the season with its total points and its rank
+        within its squad (ROW_NUMBER partitioned by squad, ties by QB id).
+        """
+        totals = StandingsService._qb_totals_subquery()
+        total_points = func.coalesce(totals.c.total_points, 0)
+
+        return (
+            select(
+                Quarterback.id.label("qb_id"),
+                Quarterback.name,
+                Quarterback.nfl_team,
+                Quarterback.squad_id,
+                total_points.label("total_points"),
+                func.row_number().over(
+                    partition_by=Quarterback.squad_id,
+                    order_by=(total_points.desc(), Quarterback.id),
+                ).label("squad_rank"),
+            )
+            .outerjoin(totals, totals.c.qb_id == Quarterback.id)
+            .where(Quarterback.season == season)
+            .subquery("ranked_qbs")
+        )
+
+    @staticmethod
+    def _qb_row(row) -> Dict:
+        return {
+            "qb_id": row.qb_id,
+            "name": row.name,
+            "nfl_team": row.nfl_team,
+            "total_points": float(row.total_points),
+        }
+
+    @staticmethod
+    def compute_ranked_qbs(db: Session, season: int) -> List[Dict]:
+        """
+        Recompute every QB's total points and squad rank from raw scoring rows,
+        in one query. Used to rebuild and verify the materialized totals.
+        """
+        ranked = StandingsService._ranked_qbs_subquery(season)
+        query = select(ranked).order_by(ranked.c.squad_id, ranked.c.squad_rank)
+
+        result = []
+        for row in db.execute(query):
+            qb = StandingsService._qb_row(row)
+            qb["squad_id"] = row.squad_id
+            qb["squad_rank"] = row.squad_rank
+            result.append(qb)
+        return result
+
+    @staticmethod
+    def compute_squad_totals(db: Session, season: int) -> List[Dict]:
+        """
+        Recompute every squad's top-5 total, roster size and standings rank
+        from raw scoring rows, in one aggregate query. Sorted by squad id.
+        """
+        ranked = StandingsService._ranked_qbs_subquery(season)
+        top_5_points = case((ranked.c.squad_rank <= 5, ranked.c.total_points), else_=0)
+
+        squad_points = (
+            select(
+                ranked.c.squad_id,
+                func.round(func.sum(top_5_points), 2, type_=Float).label("total_points"),
+                func.count(ranked.c.qb_id).label("qb_count"),
+            )
+            .group_by(ranked.c.squad_id)
+            .subquery("squad_points")
+        )
+        total_points = func.coalesce(squad_points.c.total_points, 0)
 
-        # Sort by points descending
-        qb_points.sort(key=lambda x: x["total_points"], reverse=True)
+        query = (
+            select(
+                Squad.id,
+                Squad.name,
+                Squad.owner,
+                Squad.season,
+                total_points.label("total_points"),
+                func.coalesce(squad_points.c.qb_count, 0).label("qb_count"),
+                func.row_number().over(order_by=(total_points.desc(), Squad.id)).label("rank"),
+            )
+            .outerjoin(squad_points, squad_points.c.squad_id == Squad.id)
+            .where(Squad.season == season)
+            .order_by(Squad.id)
+        )
 
-        # Return top N
-        return qb_points[:limit]
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "owner": row.owner,
+                "season": row.season,
+                "total_points": float(row.total_points),
+                "qb_count": row.qb_count,
+                "rank": row.rank,
+            }
+            for row in db.execute(query)
+        ]
 
     @staticmethod
-    def get_squad_total_points(squad: Squad) -> float:
+    def get_ranked_qbs(db: Session, season: int, squad_id: Optional[int] = None) -> List[Dict]:
         """
-        Calculate total points for a squad (sum of top 5 QBs only).
+        Get every QB for a season with total points and squad rank from the
+        materialized totals. Sorted by squad, then by rank within the squad.
         """
-        top_qbs = StandingsService.get_squad_top_qbs(squad, limit=5)
-        return round(sum(qb["total_points"] for qb in top_qbs), 2)
+        query = (
+            select(
+                Quarterback.id.label("qb_id"),
+                Quarterback.name,
+                Quarterback.nfl_team,
+                QBSeasonTotal.squad_id,
+                QBSeasonTotal.total_points,
+                QBSeasonTotal.squad_rank,
+            )
+            .join(QBSeasonTotal, QBSeasonTotal.qb_id == Quarterback.id)
+            .where(QBSeasonTotal.season == season)
+            .order_by(QBSeasonTotal.squad_id, QBSeasonTotal.squad_rank)
+        )
+        if squad_id is not None:
+            query = query.where(QBSeasonTotal.squad_id == squad_id)
+
+        result = []
+        for row in db.execute(query):
+            qb = StandingsService._qb_row(row)
+            qb["squad_id"] = row.squad_id
+            qb["squad_rank"] = row.squad_rank
+            result.append(qb)
+        return result
+
+    @staticmethod
+    def get_squad_totals(db: Session, season: int) -> List[Dict]:
+        """
+        Get every squad for a season with its top-5 total, roster size and
+        standings rank from the materialized totals. Sorted by squad id.
+        """
+        query = (
+            select(
+                Squad.id,
+                Squad.name,
+                Squad.owner,
+                Squad.season,
+                SquadSeasonTotal.total_points,
+                SquadSeasonTotal.qb_count,
+                SquadSeasonTotal.rank,
+            )
+            .join(SquadSeasonTotal, SquadSeasonTotal.squad_id == Squad.id)
+            .where(SquadSeasonTotal.season == season)
+            .order_by(Squad.id)
+        )
+
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "owner": row.owner,
+                "season": row.season,
+                "total_points": row.total_points,
+                "qb_count": row.qb_count,
+                "rank": row.rank,
+            }
+            for row in db.execute(query)
+        ]
 
     @staticmethod
     def get_league_standings(db: Session, season: int) -> List[Dict]:
         """
         Get league standings for a season, ranked by total points.
         """
-        squads = db.query(Squad).filter(Squad.season == season).all()
+        return StandingsService.build_league_standings(
+            season,
+            StandingsService.get_squad_totals(db, season),
+            StandingsService.get_ranked_qbs(db, season)
+        )
 
-        standings = []
-        for squad in squads:
-            total_points = StandingsService.get_squad_total_points(squad)
-            top_qbs = StandingsService.get_squad_top_qbs(squad, limit=5)
+    @staticmethod
+    def build_league_standings(season: int, squads: List[Dict], ranked_qbs: List[Dict]) -> List[Dict]:
+        """
+        Assemble standings from already-loaded get_squad_totals and
+        get_ranked_qbs results.
+        """
+        top_qbs_by_squad: Dict[int, List[Dict]] = {}
+        for qb in ranked_qbs:
+            if qb["squad_id"] is not None and qb["squad_rank"] <= 5:
+                top_qbs_by_squad.setdefault(qb["squad_id"], []).append({
+                    "qb_id": qb["qb_id"],
+                    "name": qb["name"],
+                    "nfl_team": qb["nfl_team"],
+                    "total_points": qb["total_points"]
+                })
 
+        standings = []
+        for squad in sorted(squads, key=lambda x: x["rank"]):
             standings.append({
-                "squad_id": squad.id,
-                "squad_name": squad.name,
-                "owner": squad.owner,
-                "total_points": total_points,
-                "top_qbs": top_qbs
+                "squad_id": squad["id"],
+                "squad_name": squad["name"],
+                "owner": squad["owner"],
+                "total_points": squad["total_points"],
+                "top_qbs": top_qbs_by_squad.get(squad["id"], []),
+                "rank": squad["rank"],
+                "projected_payout": StandingsService.get_projected_payout(squad["rank"], season)
             })
 
-        # Sort by total points descending
-        standings.sort(key=lambda x: x["total_points"], reverse=True)
+        return standings
 
-        # Add rank and projected payout
-        for i, standing in enumerate(standings):
-            rank = i + 1
-            standing["rank"] = rank
-            standing["projected_payout"] = StandingsService.get_projected_payout(rank, season)
+    @staticmethod
+    def get_all_qbs(db: Session, season: int) -> List[Dict]:
+        """
+        Get every QB for a season with total points and squad name,
+        sorted by points descending (ties by QB id).
+        """
+        query = (
+            select(
+                Quarterback.id.label("qb_id"),
+                Quarterback.name,
+                Quarterback.nfl_team,
+                Squad.name.label("squad_name"),
+                QBSeasonTotal.total_points,
+            )
+            .join(QBSeasonTotal, QBSeasonTotal.qb_id == Quarterback.id)
+            .outerjoin(Squad, Squad.id == Quarterback.squad_id)
+            .where(QBSeasonTotal.season == season)
+            .order_by(QBSeasonTotal.total_points.desc(), Quarterback.id)
+        )
 
-        return standings
+        result = []
+        for row in db.execute(query):
+            qb = StandingsService._qb_row(row)
+            qb["squad_name"] = row.squad_name or "Free Agent"
+            result.append(qb)
+        return result
 
     @staticmethod
-    def get_worst_qb(db: Session, season: int) -> Dict:
+    def get_worst_qb(db: Session, season: int) -> Optional[Dict]:
         """
         Get the QB with the lowest points (> 0) for the season.
         This is for the league name tradition (renaming after worst QB).
         """
-        qbs = db.query(Quarterback).filter(Quarterback.season == season).all()
-
-        worst_qb = None
-        lowest_points = float('inf')
+        return StandingsService.find_worst_qb(StandingsService.get_all_qbs(db, season))
 
-        for qb in qbs:
-            total_points = StandingsService.get_qb_total_points(qb)
-
-            # Only consider QBs with > 0 points
-            if total_points > 0 and total_points < lowest_points:
-                lowest_points = total_points
-                worst_qb = {
-                    "qb_id": qb.id,
-                    "name": qb.name,
-                    "nfl_team": qb.nfl_team,
-                    "squad_name": qb.squad.name if qb.squad else "Free Agent",
-                    "total_points": total_points
-                }
+    @staticmethod
+    def find_worst_qb(all_qbs: List[Dict]) -> Optional[Dict]:
+        """
+        Pick the worst QB from an already-loaded get_all_qbs result.
+        """
+        scoring_qbs = [qb for qb in all_qbs if qb["total_points"] > 0]
+        if not scoring_qbs:
+            return None
 
-        return worst_qb
+        # get_all_qbs is sorted by points desc then id, so the lowest
+        # total with the smallest id wins ties (matches the old loop).
+        lowest_points = scoring_qbs[-1]["total_points"]
+        return next(qb for qb in scoring_qbs if qb["total_points"] == lowest_points)
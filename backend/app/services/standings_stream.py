@@ -0,0 +1,301 @@
+"""
+Live standings pushed to clients over Server-Sent Events.
+
+A client gets the season's full standings when it connects, then one
+"standings-update" event per committed write that moved them: the squads
+whose total, rank or top 5 changed, their rank moves, and the worst QB if
+it changed. Writes that leave the standings as they were send nothing.
+
+Every write path bumps the season's data version inside its transaction
+(SeasonVersionService.bump); a session listener picks the bumped seasons up
+after the commit and schedules a refresh on the event loop. Writes made by
+another process are caught by a version check on each heartbeat.
+
+Each client has a bounded queue. A client too slow to drain it has its
+backlog replaced by one full standings event, so memory per client stays
+capped and the client still ends up current.
+
+Settings:
+    STREAM_QUEUE_SIZE          events buffered per client (default 16)
+    STREAM_HEARTBEAT_SECONDS   heartbeat and version check interval (default 15)
+    STREAM_MAX_CLIENTS         concurrent stream clients (default 500)
+    STREAM_MAX_SECONDS         a stream ends after this long and the browser
+                               reconnects (default 300), so open streams
+                               never hold up a server shutdown for longer
+"""
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.database.config import SessionLocal
+from app.models.models import SeasonVersion
+from app.services.cache import BUMPED_SEASONS_KEY, SeasonVersionService
+from app.services.http_cache import serialize_json
+from app.services.standings import StandingsService
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "16"))
+HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "500"))
+MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "300"))
+
+HEARTBEAT = b": heartbeat\n\n"
+
+class StreamFullError(Exception):
+    """The stream already has STREAM_MAX_CLIENTS clients."""
+
+def format_event(name: str, data: Dict) -> bytes:
+    """Encode one SSE event; the id is the season data version."""
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (name.encode(), data["version"], serialize_json(data))
+
+class StreamClient:
+    """One connected client: its season and its bounded event queue."""
+
+    def __init__(self, season: int):
+        self.season = season
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+class StandingsBroadcaster:
+    """
+    Tracks stream clients per season and the last standings sent to them.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[int, Set[StreamClient]] = {}
+        self._states: Dict[int, Dict] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._poller: Optional[asyncio.Task] = None
+        self.published = 0
+        self.resyncs = 0
+
+    @staticmethod
+    def load_state(season: int) -> Dict:
+        """
+        Read a season's standings and worst QB with their data version.
+        The version is read first, so a write landing in between shows up
+        as a newer version on the next check rather than being missed.
+        """
+        with SessionLocal() as db:
+            version = SeasonVersionService.get_version(db, season)
+            return {
+                "season": season,
+                "version": version,
+                "standings": StandingsService.get_league_standings(db, season),
+                "worst_qb": StandingsService.get_worst_qb(db, season),
+            }
+
+    @staticmethod
+    def diff(previous: Dict, current: Dict) -> Optional[Dict]:
+        """
+        Compare two standings states.
+
+        Returns:
+            The update event payload, or None if nothing visible changed
+        """
+        before = {row["squad_id"]: row for row in previous["standings"]}
+        current_ids = {row["squad_id"] for row in current["standings"]}
+        changed = [row for row in current["standings"] if before.get(row["squad_id"]) != row]
+        removed = [squad_id for squad_id in before if squad_id not in current_ids]
+        worst_qb_changed = previous["worst_qb"] != current["worst_qb"]
+        if not (changed or removed or worst_qb_changed):
+            return None
+
+        update = {
+            "season": current["season"],
+            "version": current["version"],
+            "changed": changed,
+            "rank_moves": [
+                {
+                    "squad_id": row["squad_id"],
+                    "squad_name": row["squad_name"],
+                    "from_rank": before[row["squad_id"]]["rank"] if row["squad_id"] in before else None,
+                    "to_rank": row["rank"],
+                }
+                for row in changed
+                if row["squad_id"] not in before or before[row["squad_id"]]["rank"] != row["rank"]
+            ],
+        }
+        if removed:
+            update["removed"] = removed
+        if worst_qb_changed:
+            update["worst_qb"] = current["worst_qb"]
+        return update
+
+    @staticmethod
+    def full_event(state: Dict) -> bytes:
+        return format_event("standings", state)
+
+    def _lock(self, season: int) -> asyncio.Lock:
+        if season not in self._locks:
+            self._locks[season] = asyncio.Lock()
+        return self._locks[season]
+
+    def client_count(self) -> int:
+        return sum(len(clients) for clients in self._clients.values())
+
+    def check_capacity(self) -> None:
+        """
+        Raises:
+            StreamFullError: Too many clients connected
+        """
+        if self.client_count() >= MAX_CLIENTS:
+            raise StreamFullError(f"Too many stream clients (limit {MAX_CLIENTS})")
+
+    async def subscribe(self, season: int) -> Tuple[StreamClient, bytes]:
+        """
+        Register a client for a season.
+
+        Raises:
+            StreamFullError: Too many clients connected
+
+        Returns:
+            (client, full standings event to send first)
+        """
+        self.check_capacity()
+        self._loop = asyncio.get_running_loop()
+
+        client = StreamClient(season)
+        async with self._lock(season):
+            if not self._clients.get(season):
+                # Nobody was watching this season, so any kept state is stale
+                self._states[season] = await run_in_threadpool(self.load_state, season)
+            self._clients.setdefault(season, set()).add(client)
+            first = self.full_event(self._states[season])
+
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return client, first
+
+    def unsubscribe(self, client: StreamClient) -> None:
+        clients = self._clients.get(client.season)
+        if clients is None:
+            return
+        clients.discard(client)
+        if not clients:
+            del self._clients[client.season]
+            self._states.pop(client.season, None)
+
+    def notify(self, seasons: Iterable[int]) -> None:
+        """
+        Schedule a refresh of the given seasons. Safe to call from any
+        thread; a no-op for seasons nobody is watching.
+        """
+        loop = self._loop
+        watched = [season for season in seasons if season in self._clients]
+        if loop is None or loop.is_closed() or not watched:
+            return
+        loop.call_soon_threadsafe(self._schedule, watched)
+
+    def _schedule(self, seasons: List[int]) -> None:
+        for season in seasons:
+            task = asyncio.ensure_future(self.refresh(season))
+            # Keep a reference until the task finishes
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def refresh(self, season: int) -> None:
+        """Reload a watched season and send the changes to its clients."""
+        async with self._lock(season):
+            previous = self._states.get(season)
+            if previous is None or not self._clients.get(season):
+                return
+            try:
+                current = await run_in_threadpool(self.load_state, season)
+            except Exception:
+                logger.exception("Could not refresh live standings for season %d", season)
+                return
+            if current["version"] == previous["version"] or not self._clients.get(season):
+                return
+            self._states[season] = current
+
+            update = self.diff(previous, current)
+            if update is None:
+                return
+            message = format_event("standings-update", update)
+            self.published += 1
+            for client in list(self._clients[season]):
+                self._deliver(client, message, current)
+
+    def _deliver(self, client: StreamClient, message: bytes, state: Dict) -> None:
+        try:
+            client.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow client: replace its backlog with the full standings
+            while not client.queue.empty():
+                client.queue.get_nowait()
+            client.queue.put_nowait(self.full_event(state))
+            self.resyncs += 1
+
+    @staticmethod
+    def _load_versions(seasons: List[int]) -> Dict[int, int]:
+        with SessionLocal() as db:
+            return dict(
+                db.query(SeasonVersion.season, SeasonVersion.version).filter(SeasonVersion.season.in_(seasons)).all()
+            )
+
+    async def _poll(self) -> None:
+        # Catch writes committed by other processes; stops with the last client
+        while self._clients:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            seasons = list(self._clients)
+            if not seasons:
+                break
+            try:
+                versions = await run_in_threadpool(self._load_versions, seasons)
+            except Exception:
+                logger.exception("Could not check season versions for live standings")
+                continue
+            for season in seasons:
+                state = self._states.get(season)
+                if state is not None and versions.get(season, 0) != state["version"]:
+                    await self.refresh(season)
+
+    async def events(self, season: int):
+        """
+        Yield a client's SSE stream: the full standings, then queued
+        updates, with a heartbeat comment whenever the queue stays empty for
+        STREAM_HEARTBEAT_SECONDS. Subscribes on the first iteration and
+        unsubscribes when the client goes away or STREAM_MAX_SECONDS pass.
+        """
+        client, first = await self.subscribe(season)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MAX_SECONDS
+        try:
+            # Reconnect after 5s if the connection drops
+            yield b"retry: 5000\n" + first
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    yield await asyncio.wait_for(client.queue.get(), timeout=min(HEARTBEAT_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            self.unsubscribe(client)
+
+    def stats(self) -> Dict:
+        return {
+            "clients": {season: len(clients) for season, clients in self._clients.items()},
+            "max_clients": MAX_CLIENTS,
+            "queue_size": QUEUE_SIZE,
+            "heartbeat_seconds": HEARTBEAT_SECONDS,
+            "max_stream_seconds": MAX_SECONDS,
+            "updates_published": self.published,
+            "slow_client_resyncs": self.resyncs,
+        }
+
+standings_broadcaster = StandingsBroadcaster()
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_committed_seasons(session: Session) -> None:
+    seasons = session.info.pop(BUMPED_SEASONS_KEY, None)
+    if seasons:
+        standings_broadcaster.notify(seasons)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back_seasons(session: Session) -> None:
+    session.info.pop(BUMPED_SEASONS_KEY, None)
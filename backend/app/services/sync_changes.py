@@ -0,0 +1,487 @@
+"""
+Change sets for NFL syncs.
+
+A sync first plans every row it would insert, update or delete as one
+vectorized diff of the NFL data against the season's current rows, then
+applies that plan in a single bulk write. A dry run stops after planning and
+returns the change set as JSON, with the point delta per QB and per squad;
+applying it later writes exactly those rows, as long as the season's data
+has not changed in between.
+"""
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.database.upsert import upsert
+from app.models.models import (
+    Quarterback, Squad, WeeklyStat, PlayoffAppearance, PlayoffRound, SyncWatermark
+)
+from app.services.cache import SeasonVersionService
+from app.services.errors import StaleChangeSetError
+from app.services.scoring import ScoringEngine
+from app.services.scoring_rules import ScoringRuleService
+from app.services.totals import TotalsService
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import polars as pl
+
+# WeeklyStat columns filled from nflverse stat rows
+WEEKLY_STAT_COLUMNS = ['passing_yards', 'rushing_yards', 'passing_tds', 'rushing_tds', 'interceptions', 'fumbles']
+
+# Every scored WeeklyStat column a change set carries
+WEEKLY_COLUMNS = [*WEEKLY_STAT_COLUMNS, 'receiving_tds', 'game_won', 'prime_time_win']
+
+WEEKLY_SCHEMA = {
+    **{column: pl.Int64 for column in WEEKLY_STAT_COLUMNS},
+    'receiving_tds': pl.Int64,
+    'game_won': pl.Boolean,
+    'prime_time_win': pl.Boolean,
+}
+
+ACTIONS = ("insert", "update", "delete")
+
+def _old(column: str) -> pl.Expr:
+    # Current value of a column (missing row or NULL -> the column's zero)
+    return pl.col(f'old_{column}').fill_null(False if WEEKLY_SCHEMA[column] == pl.Boolean else 0)
+
+class SyncChangeService:
+    """
+    Plans NFL sync writes as change sets and applies them.
+    """
+
+    @staticmethod
+    def get_watermark(db: Session, season: int, source: str) -> Optional[int]:
+        """
+        Return the last fully synced week for a source ("weekly_stats" or
+        "wins"), or None if the source has never synced the season
+        incrementally.
+        """
+        return db.query(SyncWatermark.last_week).filter(
+            SyncWatermark.season == season,
+            SyncWatermark.source == source
+        ).scalar()
+
+    @staticmethod
+    def _set_watermark(db: Session, season: int, source: str, last_week: int) -> None:
+        row = db.get(SyncWatermark, (season, source))
+        if row is None:
+            row = SyncWatermark(season=season, source=source)
+            db.add(row)
+        row.last_week = last_week
+        row.updated_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def plan_weekly(
+        db: Session,
+        season: int,
+        stats: Optional[pl.DataFrame] = None,
+        clear_aggregate: bool = False,
+        wins: Optional[Dict] = None
+    ) -> pl.DataFrame:
+        """
+        Diff the desired WeeklyStat rows against the season's current rows.
+
+        Stat columns come from stats where it has a row; other fields
+        (receiving TDs, and wins unless wins covers the row) keep their
+        current values. A row's win state is taken from wins only when its
+        QB is a matched starter of a completed game that week, so a stored
+        win that game's result doesn't back is reversed. QBs the schedule
+        couldn't be matched to keep their stored (possibly manual) wins.
+        Rows left with nothing in them after losing a win or the week-0
+        aggregate are deleted.
+
+        Args:
+            db: Database session
+            season: Season year
+            stats: Rows of qb_id, week and WEEKLY_STAT_COLUMNS
+            clear_aggregate: Zero the stat columns of week-0 aggregate rows
+            wins: {"won": qb_id, week, prime_time_win of games won;
+                "started": qb_id, week of matched starters of completed games}
+
+        Returns:
+            One row per (qb_id, week) touched with the id, the new values,
+            points, previous_points, action ("insert", "update", "delete" or
+            null), had_win and has_stats
+        """
+        keys = ['qb_id', 'week']
+        weeks = set()
+        if stats is not None:
+            weeks.update(stats['week'].unique().to_list())
+        if clear_aggregate:
+            weeks.add(0)
+        if wins is not None:
+            weeks.update(wins['won']['week'].unique().to_list())
+            weeks.update(wins['started']['week'].unique().to_list())
+
+        existing = pl.DataFrame(
+            db.query(
+                WeeklyStat.id,
+                WeeklyStat.qb_id,
+                WeeklyStat.week,
+                *[getattr(WeeklyStat, column) for column in WEEKLY_COLUMNS],
+                WeeklyStat.points
+            ).filter(
+                WeeklyStat.season == season,
+                WeeklyStat.week.in_(weeks)
+            ).all(),
+            schema={
+                'id': pl.Int64,
+                'qb_id': pl.Int64,
+                'week': pl.Int64,
+                **{f'old_{column}': dtype for column, dtype in WEEKLY_SCHEMA.items()},
+                'previous_points': pl.Float64
+            },
+            orient='row'
+        )
+
+        def key_frame(frame: pl.DataFrame) -> pl.DataFrame:
+            return frame.select(pl.col('qb_id').cast(pl.Int64), pl.col('week').cast(pl.Int64))
+
+        sources = [existing.select(keys)]
+        if stats is not None:
+            sources.append(key_frame(stats))
+        if wins is not None:
+            sources.append(key_frame(wins['won']))
+        plan = pl.concat(sources).unique(maintain_order=True).join(existing, on=keys, how='left')
+
+        columns = []
+        for column in WEEKLY_STAT_COLUMNS:
+            value = _old(column)
+            if clear_aggregate:
+                value = pl.when(pl.col('week') == 0).then(0).otherwise(value)
+            if stats is not None:
+                value = pl.when(pl.col('has_stats')).then(pl.col(f'new_{column}')).otherwise(value)
+            columns.append(value.alias(column))
+
+        if stats is not None:
+            plan = plan.join(
+                stats.select(
+                    pl.col('qb_id').cast(pl.Int64),
+                    pl.col('week').cast(pl.Int64),
+                    *[pl.col(column).cast(pl.Int64).alias(f'new_{column}') for column in WEEKLY_STAT_COLUMNS]
+                ).with_columns(pl.lit(True).alias('has_stats')),
+                on=keys, how='left'
+            )
+        else:
+            plan = plan.with_columns(pl.lit(None, dtype=pl.Boolean).alias('has_stats'))
+
+        game_won = _old('game_won')
+        prime_time_win = _old('prime_time_win')
+        if wins is not None:
+            won = wins['won'].select(
+                pl.col('qb_id').cast(pl.Int64),
+                pl.col('week').cast(pl.Int64),
+                pl.col('prime_time_win').cast(pl.Boolean).alias('won_prime_time'),
+                pl.lit(True).alias('source_won')
+            ).unique(keys, keep='last')
+            plan = plan.join(won, on=keys, how='left').join(
+                key_frame(wins['started']).unique().with_columns(pl.lit(True).alias('is_starter')),
+                on=keys, how='left'
+            ).with_columns(
+                pl.col('source_won').fill_null(False),
+                pl.col('won_prime_time').fill_null(False),
+                pl.col('is_starter').fill_null(False)
+            )
+            # Only matched starters' rows are overridden
+            authoritative = pl.col('source_won') | pl.col('is_starter')
+            game_won = pl.when(authoritative).then(pl.col('source_won')).otherwise(game_won)
+            prime_time_win = pl.when(authoritative).then(
+                pl.col('source_won') & pl.col('won_prime_time')
+            ).otherwise(prime_time_win)
+
+        plan = plan.with_columns(
+            *columns,
+            _old('receiving_tds').alias('receiving_tds'),
+            game_won.alias('game_won'),
+            prime_time_win.alias('prime_time_win'),
+            pl.col('has_stats').fill_null(False),
+            _old('game_won').alias('had_win'),
+            pl.col('previous_points').fill_null(0.0)
+        )
+        plan = plan.with_columns(ScoringEngine.calculate_batch(plan, ScoringRuleService.get_rules(db, season)))
+
+        empty = (
+            (pl.sum_horizontal([*WEEKLY_STAT_COLUMNS, 'receiving_tds']) == 0)
+            & ~pl.col('game_won')
+        )
+        emptied = pl.col('had_win') & ~pl.col('game_won')
+        if clear_aggregate:
+            emptied = emptied | (pl.col('week') == 0)
+        changed = pl.any_horizontal(
+            [pl.col(column) != _old(column) for column in WEEKLY_COLUMNS]
+            + [pl.col('points') != pl.col('previous_points')]
+        )
+        action = (
+            pl.when(pl.col('id').is_null()).then(pl.lit('insert'))
+            .when(empty & emptied).then(pl.lit('delete'))
+            .when(changed).then(pl.lit('update'))
+            .otherwise(pl.lit(None, dtype=pl.Utf8))
+        )
+
+        return plan.with_columns(action.alias('action')).select(
+            'id', *keys, *WEEKLY_COLUMNS, 'points', 'previous_points', 'action', 'had_win', 'has_stats'
+        )
+
+    @staticmethod
+    def plan_playoffs(db: Session, season: int, appearances: pl.DataFrame) -> pl.DataFrame:
+        """
+        Diff synced playoff appearances against the season's PlayoffAppearance
+        rows.
+
+        Appearances that aren't stored are inserted and stored ones with a
+        different Super Bowl flag or points are updated. Nothing is deleted:
+        every starter of a round keeps its appearance (league rules 6.4.1),
+        and rows the results don't cover, manual entries included, are left
+        alone.
+
+        Args:
+            db: Database session
+            season: Season year
+            appearances: qb_id, round (PlayoffRound value), won_super_bowl,
+                points of every rostered starter of a completed round
+
+        Returns:
+            One row per (qb_id, round) touched with the id, new values,
+            previous_points, action and desired
+        """
+        keys = ['qb_id', 'round']
+        existing = pl.DataFrame(
+            [
+                (row.id, row.qb_id, PlayoffRound(row.round).value, row.won_super_bowl, row.points)
+                for row in db.query(
+                    PlayoffAppearance.id,
+                    PlayoffAppearance.qb_id,
+                    PlayoffAppearance.round,
+                    PlayoffAppearance.won_super_bowl,
+                    PlayoffAppearance.points
+                ).filter(PlayoffAppearance.season == season).all()
+            ],
+            schema={
+                'id': pl.Int64,
+                'qb_id': pl.Int64,
+                'round': pl.Utf8,
+                'old_won_super_bowl': pl.Boolean,
+                'previous_points': pl.Float64
+            },
+            orient='row'
+        )
+        desired = appearances.select(
+            pl.col('qb_id').cast(pl.Int64),
+            pl.col('round').cast(pl.Utf8),
+            pl.col('won_super_bowl').cast(pl.Boolean),
+            pl.col('points').cast(pl.Float64)
+        ).unique(keys, keep='last').with_columns(pl.lit(True).alias('desired'))
+
+        plan = (
+            existing.join(desired, on=keys, how='full', coalesce=True)
+            .with_columns(
+                pl.col('desired').fill_null(False),
+                pl.col('old_won_super_bowl').fill_null(False),
+                pl.col('previous_points').fill_null(0.0)
+            )
+            .with_columns(
+                pl.when(pl.col('desired')).then(pl.col('won_super_bowl'))
+                .otherwise(pl.col('old_won_super_bowl')).alias('won_super_bowl'),
+                pl.when(pl.col('desired')).then(pl.col('points'))
+                .otherwise(pl.col('previous_points')).alias('points')
+            )
+        )
+        changed = (
+            (pl.col('won_super_bowl') != pl.col('old_won_super_bowl'))
+            | (pl.col('points') != pl.col('previous_points'))
+        )
+        action = (
+            pl.when(pl.col('id').is_null()).then(pl.lit('insert'))
+            .when(pl.col('desired') & changed).then(pl.lit('update'))
+            .otherwise(pl.lit(None, dtype=pl.Utf8))
+        )
+        return plan.with_columns(action.alias('action')).select(
+            'id', *keys, 'won_super_bowl', 'points', 'previous_points', 'action', 'desired'
+        )
+
+    @staticmethod
+    def build(
+        db: Session,
+        season: int,
+        weekly: Optional[pl.DataFrame] = None,
+        playoffs: Optional[pl.DataFrame] = None,
+        qb_ids: Optional[List[Dict]] = None,
+        watermarks: Optional[Dict[str, int]] = None
+    ) -> Dict:
+        """
+        Turn planned rows into a JSON-serializable change set.
+
+        Args:
+            db: Database session
+            season: Season year
+            weekly: plan_weekly result
+            playoffs: plan_playoffs result
+            qb_ids: Learned nflverse IDs as {"qb_id", "gsis_id"} dicts
+            watermarks: Sync source -> new last_week
+
+        Returns:
+            Change set with the season's base_version, rows to insert,
+            update and delete per table, QB IDs, watermarks and the point
+            delta per QB and per squad
+        """
+        changes = {
+            "season": season,
+            "base_version": SeasonVersionService.get_version(db, season),
+            "weekly_stats": {action: [] for action in ACTIONS},
+            "playoff_appearances": {action: [] for action in ACTIONS},
+            "qb_ids": qb_ids or [],
+            "watermarks": watermarks or {},
+        }
+
+        tables = [
+            ("weekly_stats", weekly, ['qb_id', 'week', *WEEKLY_COLUMNS, 'points']),
+            ("playoff_appearances", playoffs, ['qb_id', 'round', 'won_super_bowl', 'points']),
+        ]
+        for table, plan, columns in tables:
+            if plan is None:
+                continue
+            changes[table]["insert"] = plan.filter(pl.col('action') == 'insert').select(columns).to_dicts()
+            changes[table]["update"] = plan.filter(pl.col('action') == 'update').select(
+                'id', *columns, 'previous_points'
+            ).to_dicts()
+            changes[table]["delete"] = plan.filter(pl.col('action') == 'delete').select(
+                'id', *columns[:2], 'previous_points'
+            ).to_dicts()
+
+        changes["qb_deltas"], changes["squad_deltas"] = SyncChangeService._describe_deltas(
+            db, SyncChangeService.point_deltas(changes)
+        )
+        return changes
+
+    @staticmethod
+    def point_deltas(changes: Dict) -> Dict[int, float]:
+        """Points added per QB by a change set (negative for removals)."""
+        deltas: Dict[int, float] = {}
+        for table in ("weekly_stats", "playoff_appearances"):
+            rows = changes[table]
+            for row in rows["insert"]:
+                deltas[row["qb_id"]] = deltas.get(row["qb_id"], 0.0) + row["points"]
+            for row in rows["update"]:
+                deltas[row["qb_id"]] = deltas.get(row["qb_id"], 0.0) + row["points"] - row["previous_points"]
+            for row in rows["delete"]:
+                deltas[row["qb_id"]] = deltas.get(row["qb_id"], 0.0) - row["previous_points"]
+        return {qb_id: round(delta, 2) for qb_id, delta in deltas.items() if round(delta, 2) != 0}
+
+    @staticmethod
+    def _describe_deltas(db: Session, deltas: Dict[int, float]):
+        if not deltas:
+            return [], []
+        quarterbacks = db.query(Quarterback.id, Quarterback.name, Quarterback.squad_id).filter(
+            Quarterback.id.in_(deltas.keys())
+        ).all()
+        squad_names = dict(db.query(Squad.id, Squad.name).filter(
+            Squad.id.in_({qb.squad_id for qb in quarterbacks if qb.squad_id is not None})
+        ).all())
+
+        qb_deltas = []
+        squad_totals: Dict[Optional[int], float] = {}
+        for qb in sorted(quarterbacks, key=lambda qb: qb.id):
+            qb_deltas.append({"qb_id": qb.id, "name": qb.name, "squad_id": qb.squad_id, "delta": deltas[qb.id]})
+            squad_totals[qb.squad_id] = squad_totals.get(qb.squad_id, 0.0) + deltas[qb.id]
+
+        # QBs without a squad are grouped under squad_id None
+        squad_deltas = [
+            {"squad_id": squad_id, "name": squad_names.get(squad_id), "delta": round(delta, 2)}
+            for squad_id, delta in sorted(squad_totals.items(), key=lambda item: (item[0] is None, item[0] or 0))
+            if round(delta, 2) != 0
+        ]
+        return qb_deltas, squad_deltas
+
+    @staticmethod
+    def summarize(changes: Dict) -> Dict:
+        """Row counts of a change set per table and action."""
+        return {
+            "weekly_stats": {action: len(changes["weekly_stats"][action]) for action in ACTIONS},
+            "playoff_appearances": {action: len(changes["playoff_appearances"][action]) for action in ACTIONS},
+            "qb_ids": len(changes["qb_ids"]),
+            "qbs_affected": len(changes["qb_deltas"]),
+            "squads_affected": len(changes["squad_deltas"]),
+        }
+
+    @staticmethod
+    def apply(db: Session, changes: Dict, check_version: bool = True) -> Dict:
+        """
+        Write a change set in bulk and apply its point deltas to the
+        standings totals. Does not commit.
+
+        Args:
+            db: Database session
+            changes: build() result
+            check_version: Refuse a change set planned against an older
+                version of the season's data (for reviewed dry runs)
+
+        Returns:
+            summarize() counts of what was written
+        """
+        season = changes["season"]
+        if check_version:
+            current = SeasonVersionService.get_version(db, season)
+            if current != changes["base_version"]:
+                raise StaleChangeSetError(
+                    f"Season {season} changed since this change set was planned "
+                    f"(version {changes['base_version']} -> {current}); run the dry run again"
+                )
+
+        weekly = changes["weekly_stats"]
+        upsert(
+            db,
+            WeeklyStat,
+            [
+                {
+                    "qb_id": row["qb_id"],
+                    "week": row["week"],
+                    "season": season,
+                    **{column: row[column] for column in WEEKLY_COLUMNS},
+                    "points": row["points"],
+                }
+                for row in weekly["insert"] + weekly["update"]
+            ],
+            conflict_columns=['qb_id', 'season', 'week'],
+            update_columns=[*WEEKLY_COLUMNS, 'points']
+        )
+        if weekly["delete"]:
+            db.query(WeeklyStat).filter(
+                WeeklyStat.id.in_([row["id"] for row in weekly["delete"]])
+            ).delete(synchronize_session=False)
+
+        playoffs = changes["playoff_appearances"]
+        upsert(
+            db,
+            PlayoffAppearance,
+            [
+                {
+                    "qb_id": row["qb_id"],
+                    "season": season,
+                    "round": PlayoffRound(row["round"]),
+                    "won_super_bowl": row["won_super_bowl"],
+                    "points": row["points"],
+                }
+                for row in playoffs["insert"] + playoffs["update"]
+            ],
+            conflict_columns=['qb_id', 'season', 'round'],
+            update_columns=['won_super_bowl', 'points']
+        )
+        if playoffs["delete"]:
+            db.query(PlayoffAppearance).filter(
+                PlayoffAppearance.id.in_([row["id"] for row in playoffs["delete"]])
+            ).delete(synchronize_session=False)
+
+        if changes["qb_ids"]:
+            db.execute(update(Quarterback), [
+                {"id": row["qb_id"], "gsis_id": row["gsis_id"]} for row in changes["qb_ids"]
+            ])
+        for source, last_week in changes["watermarks"].items():
+            SyncChangeService._set_watermark(db, season, source, last_week)
+
+        summary = SyncChangeService.summarize(changes)
+        deltas = SyncChangeService.point_deltas(changes)
+        if deltas:
+            TotalsService.apply_qb_deltas(db, deltas)
+        elif any(count for table in ("weekly_stats", "playoff_appearances") for count in summary[table].values()):
+            # Rows changed without moving any totals; still a new data version
+            db.flush()
+            SeasonVersionService.bump(db, [season])
+        return summary
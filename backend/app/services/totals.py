@@ -0,0 +1,299 @@
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.database.config import SessionLocal
+from app.models.models import Quarterback, Squad, QBSeasonTotal, SquadSeasonTotal
+from app.services.standings import StandingsService
+from app.services.cache import SeasonVersionService
+from typing import Dict, Iterable, List, Optional
+
+# Session.info key: seasons that gained a QB or squad in this transaction
+NEW_ROSTER_SEASONS_KEY = "new_roster_seasons"
+
+class TotalsService:
+    """
+    Maintains the materialized qb_season_totals / squad_season_totals tables.
+
+    Every write path applies its point deltas here before committing, so the
+    totals change in the same transaction as the scoring rows. Only the
+    affected QBs, their squads and the season ranking are touched, and the
+    season's data version is bumped so cached payloads are invalidated.
+    """
+
+    @staticmethod
+    def apply_qb_delta(db: Session, qb: Quarterback, delta: float) -> None:
+        """
+        Apply a point change for a single QB (e.g. one stat line saved).
+        """
+        TotalsService.apply_qb_deltas(db, {qb.id: delta})
+
+    @staticmethod
+    def apply_qb_deltas(db: Session, deltas: Dict[int, float]) -> None:
+        """
+        Apply point changes for several QBs, then refresh their squads and
+        their seasons' rankings.
+
+        Args:
+            db: Database session
+            deltas: Mapping of QB id -> points added (negative for removals)
+        """
+        if not deltas:
+            return
+
+        db.flush()
+        totals = db.query(QBSeasonTotal).filter(QBSeasonTotal.qb_id.in_(deltas.keys())).all()
+        if len(totals) != len(deltas):
+            # A QB has no totals row yet (e.g. added outside the app), so
+            # rebuild its season from raw rows instead of guessing.
+            seasons = db.query(Quarterback.season).filter(Quarterback.id.in_(deltas.keys())).distinct()
+            for (season,) in seasons.all():
+                TotalsService.rebuild_season(db, season)
+            return
+
+        squads = set()
+        for total in totals:
+            total.total_points = round(total.total_points + deltas[total.qb_id], 2)
+            squads.add((total.season, total.squad_id))
+        db.flush()
+
+        for season, squad_id in squads:
+            TotalsService._refresh_squad(db, season, squad_id)
+        seasons = {season for season, _ in squads}
+        for season in seasons:
+            TotalsService._rerank_season(db, season)
+        SeasonVersionService.bump(db, seasons)
+
+    @staticmethod
+    def _refresh_squad(db: Session, season: int, squad_id: Optional[int]) -> None:
+        """
+        Re-rank a squad's QBs and recompute its top-5 total.
+        A squad_id of None re-ranks the season's free agents.
+        """
+        totals = (
+            db.query(QBSeasonTotal)
+            .filter(QBSeasonTotal.season == season, QBSeasonTotal.squad_id == squad_id)
+            .order_by(QBSeasonTotal.total_points.desc(), QBSeasonTotal.qb_id)
+            .all()
+        )
+        for i, total in enumerate(totals):
+            total.squad_rank = i + 1
+
+        if squad_id is None:
+            return
+
+        squad_total = db.get(SquadSeasonTotal, squad_id)
+        if squad_total is None:
+            squad_total = SquadSeasonTotal(squad_id=squad_id, season=season)
+            db.add(squad_total)
+        squad_total.total_points = round(sum(t.total_points for t in totals[:5]), 2)
+        squad_total.qb_count = len(totals)
+
+    @staticmethod
+    def _rerank_season(db: Session, season: int) -> None:
+        """
+        Re-assign standings ranks for every squad in the season.
+        """
+        db.flush()
+        squad_totals = (
+            db.query(SquadSeasonTotal)
+            .filter(SquadSeasonTotal.season == season)
+            .order_by(SquadSeasonTotal.total_points.desc(), SquadSeasonTotal.squad_id)
+            .all()
+        )
+        for i, squad_total in enumerate(squad_totals):
+            squad_total.rank = i + 1
+
+    @staticmethod
+    def rebuild_season(db: Session, season: int) -> None:
+        """
+        Rebuild a season's materialized totals from raw scoring rows.
+        Does not commit; the caller owns the transaction.
+        """
+        db.flush()
+        season_qb_ids = select(Quarterback.id).where(Quarterback.season == season)
+        db.query(QBSeasonTotal).filter(
+            (QBSeasonTotal.season == season) | QBSeasonTotal.qb_id.in_(season_qb_ids)
+        ).delete(synchronize_session=False)
+        db.query(SquadSeasonTotal).filter(
+            SquadSeasonTotal.season == season
+        ).delete(synchronize_session=False)
+
+        db.bulk_insert_mappings(QBSeasonTotal, [
+            {
+                "qb_id": qb["qb_id"],
+                "season": season,
+                "squad_id": qb["squad_id"],
+                "total_points": qb["total_points"],
+                "squad_rank": qb["squad_rank"],
+            }
+            for qb in StandingsService.compute_ranked_qbs(db, season)
+        ])
+        db.bulk_insert_mappings(SquadSeasonTotal, [
+            {
+                "squad_id": squad["id"],
+                "season": season,
+                "total_points": squad["total_points"],
+                "qb_count": squad["qb_count"],
+                "rank": squad["rank"],
+            }
+            for squad in StandingsService.compute_squad_totals(db, season)
+        ])
+        SeasonVersionService.bump(db, [season])
+
+    @staticmethod
+    def rebuild_stale_seasons(db: Session, seasons: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Rebuild totals for any season whose QBs or squads have no totals rows.
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            db: Database session
+            seasons: Seasons to check (default: every season)
+
+        Returns:
+            Seasons that were rebuilt
+        """
+        def counts(column):
+            query = db.query(column, func.count())
+            if seasons is not None:
+                query = query.filter(column.in_(seasons))
+            return dict(query.group_by(column).all())
+
+        stale = set()
+        for source, materialized in (
+            (Quarterback.season, QBSeasonTotal.season),
+            (Squad.season, SquadSeasonTotal.season),
+        ):
+            expected = counts(source)
+            actual = counts(materialized)
+            stale.update(season for season, n in expected.items() if actual.get(season) != n)
+
+        for season in sorted(stale):
+            TotalsService.rebuild_season(db, season)
+        return sorted(stale)
+
+    @staticmethod
+    def totals_missing(db: Session) -> bool:
+        """
+        Whether QBs or squads exist while their totals table is empty (e.g.
+        the tables were just created or emptied outside the app). Two cheap
+        EXISTS checks, for deciding whether startup needs ensure_all_seasons.
+        """
+        for source, materialized in ((Quarterback.id, QBSeasonTotal.qb_id), (Squad.id, SquadSeasonTotal.squad_id)):
+            has_rows = db.query(select(source).exists()).scalar()
+            if has_rows and not db.query(select(materialized).exists()).scalar():
+                return True
+        return False
+
+    @staticmethod
+    def ensure_all_seasons(db: Session) -> List[int]:
+        """
+        Rebuild totals for any season whose QBs or squads have no totals rows
+        (new tables, or rows created outside the app). Commits if anything
+        was rebuilt.
+
+        Returns:
+            Seasons that were rebuilt
+        """
+        stale = TotalsService.rebuild_stale_seasons(db)
+        if stale:
+            db.commit()
+        return stale
+
+    @staticmethod
+    def check_consistency(db: Session, season: int, repair: bool = False) -> Dict:
+        """
+        Compare the materialized totals with a from-scratch recomputation.
+
+        Args:
+            db: Database session
+            season: Season year
+            repair: Rebuild the season (and commit) if any drift is found
+
+        Returns:
+            Drift report listing every QB and squad whose stored values differ
+        """
+        stored_qbs = {qb["qb_id"]: qb for qb in StandingsService.get_ranked_qbs(db, season)}
+        stored_squads = {squad["id"]: squad for squad in StandingsService.get_squad_totals(db, season)}
+
+        qb_drift = []
+        for qb in StandingsService.compute_ranked_qbs(db, season):
+            stored = stored_qbs.pop(qb["qb_id"], None)
+            if (
+                stored is None
+                or stored["total_points"] != qb["total_points"]
+                or stored["squad_rank"] != qb["squad_rank"]
+            ):
+                qb_drift.append({
+                    "qb_id": qb["qb_id"],
+                    "name": qb["name"],
+                    "stored_points": stored["total_points"] if stored else None,
+                    "expected_points": qb["total_points"],
+                    "stored_squad_rank": stored["squad_rank"] if stored else None,
+                    "expected_squad_rank": qb["squad_rank"],
+                })
+        for qb_id, stored in stored_qbs.items():
+            qb_drift.append({
+                "qb_id": qb_id,
+                "name": stored["name"],
+                "stored_points": stored["total_points"],
+                "expected_points": None,
+                "stored_squad_rank": stored["squad_rank"],
+                "expected_squad_rank": None,
+            })
+
+        squad_drift = []
+        for squad in StandingsService.compute_squad_totals(db, season):
+            stored = stored_squads.pop(squad["id"], None)
+            if stored is None or any(
+                stored[key] != squad[key] for key in ("total_points", "qb_count", "rank")
+            ):
+                squad_drift.append({
+                    "squad_id": squad["id"],
+                    "name": squad["name"],
+                    "stored_points": stored["total_points"] if stored else None,
+                    "expected_points": squad["total_points"],
+                    "stored_rank": stored["rank"] if stored else None,
+                    "expected_rank": squad["rank"],
+                })
+        for squad_id, stored in stored_squads.items():
+            squad_drift.append({
+                "squad_id": squad_id,
+                "name": stored["name"],
+                "stored_points": stored["total_points"],
+                "expected_points": None,
+                "stored_rank": stored["rank"],
+                "expected_rank": None,
+            })
+
+        consistent = not qb_drift and not squad_drift
+        if repair and not consistent:
+            TotalsService.rebuild_season(db, season)
+            db.commit()
+
+        return {
+            "season": season,
+            "consistent": consistent,
+            "repaired": repair and not consistent,
+            "qb_drift": qb_drift,
+            "squad_drift": squad_drift,
+        }
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_new_roster_seasons(session: Session, flush_context) -> None:
+    seasons = {obj.season for obj in session.new if isinstance(obj, (Quarterback, Squad))}
+    if seasons:
+        session.info.setdefault(NEW_ROSTER_SEASONS_KEY, set()).update(seasons)
+
+@event.listens_for(SessionLocal, "before_commit")
+def _build_new_roster_totals(session: Session) -> None:
+    # A QB or squad created by any code path gets its totals rows in the same
+    # transaction, so the standings reads (which join the totals) see it.
+    # Seasons already rebuilt by the caller (e.g. seed-database) are skipped.
+    session.flush()
+    seasons = session.info.pop(NEW_ROSTER_SEASONS_KEY, None)
+    if seasons:
+        TotalsService.rebuild_stale_seasons(session, seasons)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_new_roster_seasons(session: Session) -> None:
+    session.info.pop(NEW_ROSTER_SEASONS_KEY, None)
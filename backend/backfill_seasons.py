@@ -0,0 +1,142 @@
+"""
+Backfill script: re-sync NFL stats, wins and playoff wins for several
+seasons at once.
+
+Each season runs the same pipeline as "Sync Everything" in the admin panel
+(NFLStatsService.sync_all) in its own worker process with its own database
+session, so a whole history can be rebuilt after a scoring fix in one go.
+Downloads go through the shared on-disk nflverse cache; the all-season
+schedule file is fetched once up front so workers don't race to download it.
+
+Usage:
+    python backfill_seasons.py                 # every season with a roster
+    python backfill_seasons.py 2021-2025       # a range
+    python backfill_seasons.py 2023 2025 -w 2  # specific seasons, 2 workers
+    python backfill_seasons.py --incremental   # per-week, past the watermarks
+
+On SQLite, concurrent seasons queue on the database write lock; use
+--workers 1 if you see "database is locked".
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+DEFAULT_MAX_WORKERS = 4
+
+def parse_seasons(values: List[str]) -> List[int]:
+    """Expand "2021-2024" ranges and single years into a sorted season list."""
+    seasons = set()
+    for value in values:
+        if "-" in value:
+            start, end = (int(part) for part in value.split("-", 1))
+            seasons.update(range(start, end + 1))
+        else:
+            seasons.add(int(value))
+    return sorted(seasons)
+
+def rostered_seasons() -> List[int]:
+    from app.database.config import SessionLocal
+    from app.models.models import Quarterback
+
+    with SessionLocal() as db:
+        return [season for (season,) in db.query(Quarterback.season).distinct().order_by(Quarterback.season)]
+
+def sync_season(season: int, incremental: bool) -> Dict:
+    """
+    Sync one season in a worker process. Imports happen here so each
+    process creates its own engine and connection pool.
+    """
+    from app.database.config import SessionLocal
+    from app.models.models import Quarterback, WeeklyStat, PlayoffAppearance, QBSeasonTotal
+    from app.services.nfl_stats import NFLStatsService
+    from sqlalchemy import func
+
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        if not db.query(Quarterback.id).filter(Quarterback.season == season).first():
+            return {"season": season, "status": "skipped", "error": "no roster"}
+        try:
+            result = NFLStatsService.sync_all(db, season, incremental=incremental)
+        except Exception as e:
+            return {"season": season, "status": "failed", "error": str(e), "seconds": round(time.perf_counter() - start, 1)}
+
+        return {
+            "season": season,
+            "status": "ok",
+            "seconds": round(time.perf_counter() - start, 1),
+            "timings": result["timings"],
+            "changes": result["changes"],
+            "weekly_rows": db.query(func.count(WeeklyStat.id)).filter(WeeklyStat.season == season).scalar(),
+            "playoff_rows": db.query(func.count(PlayoffAppearance.id)).filter(PlayoffAppearance.season == season).scalar(),
+            "total_points": round(
+                db.query(func.coalesce(func.sum(QBSeasonTotal.total_points), 0.0)).filter(
+                    QBSeasonTotal.season == season
+                ).scalar(),
+                2
+            ),
+        }
+
+def print_report(reports: List[Dict], wall_seconds: float) -> None:
+    print("\n" + "=" * 78)
+    print(f"{'Season':<8}{'Status':<9}{'Secs':>7}{'Ins':>7}{'Upd':>7}{'Del':>6}{'Playoff':>9}{'Rows':>7}{'Points':>12}")
+    print("-" * 78)
+    for report in sorted(reports, key=lambda report: report["season"]):
+        if report["status"] != "ok":
+            print(f"{report['season']:<8}{report['status']:<9}{report.get('seconds', ''):>7}  {report['error']}")
+            continue
+        weekly = report["changes"]["weekly_stats"]
+        playoffs = report["changes"]["playoff_appearances"]
+        playoff_changes = playoffs["insert"] + playoffs["update"] + playoffs["delete"]
+        print(
+            f"{report['season']:<8}{'ok':<9}{report['seconds']:>7}"
+            f"{weekly['insert']:>7}{weekly['update']:>7}{weekly['delete']:>6}"
+            f"{playoff_changes:>9}{report['weekly_rows']:>7}{report['total_points']:>12}"
+        )
+    print("-" * 78)
+    print("Ins/Upd/Del = weekly stat rows changed, Playoff = playoff rows changed,")
+    print("Rows = weekly stat rows stored after the sync")
+    print(f"Wall time: {wall_seconds:.1f}s")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-sync NFL data for several seasons in parallel.")
+    parser.add_argument("seasons", nargs="*", help="Seasons or ranges (e.g. 2021-2025); default: every season with a roster")
+    parser.add_argument("-w", "--workers", type=int, default=None, help=f"Worker processes (default: up to {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--incremental", action="store_true", help="Sync per week, only past each season's watermarks")
+    args = parser.parse_args()
+
+    from app.database.config import engine
+    from app.database.migrations import migrate
+    from app.services.nfl_data import NFLDataCache
+
+    migrate(engine)
+    seasons = parse_seasons(args.seasons) if args.seasons else rostered_seasons()
+    if not seasons:
+        print("No seasons to sync (no rosters in the database).")
+        return 0
+    workers = args.workers or min(len(seasons), os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+
+    print(f"Backfilling {len(seasons)} season(s) {seasons} with {workers} worker(s)...")
+    start = time.perf_counter()
+    # One schedule file covers every season: download it once, before the workers start
+    NFLDataCache.path("schedules")
+
+    reports = []
+    # Fresh interpreter per worker: no database connections or threads inherited
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(sync_season, season, args.incremental) for season in seasons]
+        for future in as_completed(futures):
+            report = future.result()
+            reports.append(report)
+            detail = f"{report.get('seconds', 0)}s" if report["status"] == "ok" else report["error"]
+            print(f"  {report['season']}: {report['status']} ({detail})")
+
+    print_report(reports, time.perf_counter() - start)
+    return 1 if any(report["status"] == "failed" for report in reports) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
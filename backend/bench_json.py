@@ -0,0 +1,85 @@
+"""
+Benchmark: JSON serialization time and bytes on the wire for the standings
+and QB detail endpoints.
+
+Serialization compares the old path (jsonable_encoder + stdlib json, what
+FastAPI's JSONResponse does), the default orjson response class, and the
+pre-serialized bytes the standings cache now stores (built once per data
+version, then reused). Bytes on the wire come from requesting each endpoint
+through the app with and without Accept-Encoding: gzip.
+
+Runs against the configured database (DATABASE_URL, or the local SQLite
+file); seed it first (python seed_data.py).
+
+Usage:
+    python bench_json.py
+    python bench_json.py --season 2025 -n 2000
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import sys
+import time
+
+def time_per_call(function: Callable[[], object], iterations: int) -> float:
+    """Average microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+def payloads(season: int) -> List[Tuple[str, Dict]]:
+    """(path, payload) for the standings and the top QB's details."""
+    from app.database.config import SessionLocal
+    from app.services.standings import StandingsService
+    from app.services.qb_details import QuarterbackDetailService
+
+    with SessionLocal() as db:
+        standings = {"season": season, "standings": StandingsService.get_league_standings(db, season)}
+        top = StandingsService.get_all_qbs(db, season)
+        if not top:
+            raise SystemExit(f"No quarterbacks for season {season}; seed the database first")
+        qb_id = top[0]["qb_id"]
+        details = QuarterbackDetailService.get_details(db, QuarterbackDetailService.load_quarterbacks(db, [qb_id]))[qb_id]
+    return [
+        (f"/api/standings/?season={season}", standings),
+        (f"/api/quarterbacks/{qb_id}/", details),
+    ]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON serialization and response sizes.")
+    parser.add_argument("--season", type=int, default=2026)
+    parser.add_argument("-n", "--iterations", type=int, default=5000, help="Serializations per measurement (default: 5000)")
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse, Response
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.http_cache import serialize_json
+
+    client = TestClient(app)
+
+    print(f"Serialization, microseconds per response ({args.iterations} iterations)")
+    print(f"{'Endpoint':<36}{'stdlib':>10}{'orjson':>10}{'cached':>10}")
+    sizes = []
+    for path, payload in payloads(args.season):
+        body = serialize_json(payload)
+        stdlib = time_per_call(lambda: JSONResponse(jsonable_encoder(payload)), args.iterations)
+        orjson = time_per_call(lambda: ORJSONResponse(jsonable_encoder(payload)), args.iterations)
+        # A cache hit only wraps the stored bytes in a response
+        cached = time_per_call(lambda: Response(content=body, media_type="application/json"), args.iterations)
+        print(f"{path:<36}{stdlib:>10.1f}{orjson:>10.1f}{cached:>10.1f}")
+
+        plain = client.get(path, headers={"Accept-Encoding": "identity"})
+        gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+        sizes.append((path, plain.num_bytes_downloaded, gzipped.num_bytes_downloaded,
+                      gzipped.headers.get("content-encoding", "none")))
+
+    print("\nBytes on the wire")
+    print(f"{'Endpoint':<36}{'identity':>10}{'gzip':>10}{'ratio':>8}  encoding")
+    for path, plain, gzipped, encoding in sizes:
+        print(f"{path:<36}{plain:>10}{gzipped:>10}{gzipped / plain:>8.2f}  {encoding}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark: read-endpoint throughput under concurrency, with the sync
+database stack and with the async one (ASYNC_DB=1).
+
+For each mode it starts the API with uvicorn against the configured
+database (DATABASE_URL, or the local SQLite file), warms it up, then keeps
+N requests in flight over the standings, squads and quarterback endpoints
+and reports requests per second and latency percentiles. Seed the
+database first (python seed_data.py) so the payloads aren't empty. Needs
+httpx (pip install httpx), which the app itself doesn't.
+
+Usage:
+    python bench_reads.py                        # both modes, 50 in flight, 2000 requests
+    python bench_reads.py -c 200 -n 10000
+    python bench_reads.py --modes async --season 2025
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+MODES = {"sync": "0", "async": "1"}
+
+def read_paths(client: httpx.Client, season: int) -> List[str]:
+    """The season's list endpoints plus a few QB details and rosters."""
+    paths = [
+        f"/api/standings/?season={season}",
+        f"/api/standings/worst-qb/?season={season}",
+        f"/api/squads/?season={season}",
+        f"/api/quarterbacks/?season={season}",
+    ]
+    quarterbacks = client.get(paths[3]).json()["quarterbacks"]
+    paths += [f"/api/quarterbacks/{qb['id']}/" for qb in quarterbacks[:5]]
+    squads = client.get(paths[2]).json()["squads"]
+    paths += [f"/api/squads/{squad['id']}/roster/" for squad in squads[:2]]
+    return paths
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "ASYNC_DB": MODES[mode]}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with status {server.returncode}")
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{mode} server did not start within 30s")
+
+async def run_load(base_url: str, paths: List[str], requests: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    next_request = 0
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors, next_request
+        while next_request < requests:
+            path = paths[next_request % len(paths)]
+            next_request += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare read throughput of the sync and async database stacks.")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="Requests in flight (default: 50)")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Requests per mode (default: 2000)")
+    parser.add_argument("--season", type=int, default=2026)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        print(f"Starting {mode} server...")
+        server = start_server(mode, args.port)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            with httpx.Client(base_url=base_url) as client:
+                paths = read_paths(client, args.season)
+                # Warm up connection pools and the payload cache
+                for path in paths * 5:
+                    client.get(path)
+            results[mode] = asyncio.run(run_load(base_url, paths, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\n{args.requests} requests, {args.concurrency} in flight, season {args.season}")
+    print(f"{'Mode':<8}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Errors':>8}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<8}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}"
+            f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>8}"
+        )
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Benchmark: API cold start, i.e. the time to import app.main in a fresh
+interpreter (imports, schema version check and startup backfills), as
+Railway and every test process pay it.
+
+Each run is a separate Python process against the configured database
+(DATABASE_URL, or the local SQLite file). One untimed run first applies any
+pending migrations, so the timed runs measure a current schema. It also
+reports which heavy data libraries the import pulled in (none should be:
+they load on first use).
+
+Pass --record to append the result to a CSV file, to track startup time
+across commits.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py -n 10 --record startup_history.csv
+"""
+from datetime import datetime, timezone
+from typing import Dict, List
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("polars", "pandas", "pyarrow", "numpy", "nflreadpy")
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+from app.database.config import engine
+from app.database.migrations import migrate
+start = time.perf_counter()
+migrate(engine)
+check = time.perf_counter() - start
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "schema_check_ms": check * 1000,
+    "heavy_modules": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+def run_once() -> Dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold-start time.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Timed runs (default: 5)")
+    parser.add_argument("--record", metavar="CSV", help="Append the result to this CSV file")
+    args = parser.parse_args()
+
+    # Untimed: applies pending migrations and warms the OS file cache
+    run_once()
+    runs: List[Dict] = [run_once() for _ in range(args.runs)]
+
+    imports = [run["import_ms"] for run in runs]
+    checks = [run["schema_check_ms"] for run in runs]
+    heavy = sorted({name for run in runs for name in run["heavy_modules"]})
+
+    print(f"{args.runs} runs")
+    print(f"import app.main   median {statistics.median(imports):8.1f} ms   min {min(imports):8.1f} ms")
+    print(f"schema check      median {statistics.median(checks):8.1f} ms")
+    print(f"heavy modules loaded at startup: {', '.join(heavy) or 'none'}")
+
+    if args.record:
+        is_new = not os.path.exists(args.record)
+        with open(args.record, "a", newline="") as handle:
+            writer = csv.writer(handle)
+            if is_new:
+                writer.writerow(["recorded_at", "commit", "python", "runs", "import_ms_median", "import_ms_min",
+                                 "schema_check_ms_median", "heavy_modules"])
+            writer.writerow([
+                datetime.now(timezone.utc).isoformat(timespec="seconds"), git_commit(),
+                "%d.%d" % sys.version_info[:2], args.runs, round(statistics.median(imports), 1),
+                round(min(imports), 1), round(statistics.median(checks), 2), " ".join(heavy)
+            ])
+        print(f"Recorded in {args.record}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
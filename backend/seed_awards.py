@@ -1,137 +1,47 @@
 """
-Seed script to add 2025 NFL season awards (Player of Week/Month) to the database.
-Data sourced from Pro-Football-Reference.com on January 20, 2026.
-"""
-from app.database.config import SessionLocal
-from app.models.models import Quarterback, SeasonBonus, BonusType
+Seed script to apply a season's NFL awards (Player of the Week/Month, MVP
+voting, Rookie of the Year) from backend/data/awards/<season>.json.
 
-SEASON = 2025
+Uses the same loader as the admin panel's "Seed Awards" action, so re-running
+it only adds, removes or re-values the awards that changed.
 
-# Players of the Week - 10 points each (CONF_POW)
-# Only includes QBs that are on league rosters
-PLAYERS_OF_WEEK = [
-    # AFC
-    {"name": "Josh Allen", "week": 1},
-    {"name": "Josh Allen", "week": 11},
-    {"name": "Josh Allen", "week": 14},
-    {"name": "Patrick Mahomes", "week": 4},
-    {"name": "Patrick Mahomes", "week": 6},
-    {"name": "C.J. Stroud", "week": 5},
-    {"name": "Lamar Jackson", "week": 9},
-    {"name": "Drake Maye", "week": 13},
-    {"name": "Trevor Lawrence", "week": 15},
-    {"name": "Joe Burrow", "week": 16},
-    # NFC
-    {"name": "J.J. McCarthy", "week": 1},
-    {"name": "Jared Goff", "week": 2},
-    {"name": "Caleb Williams", "week": 3},
-    {"name": "Jordan Love", "week": 8},
-    {"name": "Jordan Love", "week": 13},
-    {"name": "Bryce Young", "week": 11},
-    {"name": "Brock Purdy", "week": 16},
-    {"name": "Matthew Stafford", "week": 18},
-]
+Usage:
+    python seed_awards.py               # 2025
+    python seed_awards.py 2026 --dry-run
+"""
+from app.database.config import SessionLocal, engine
+from app.database.migrations import migrate
+from app.services.awards import AwardService
+import argparse
 
-# Players of the Month - 20 points each (CONF_POM)
-# Only includes QBs that are on league rosters
-PLAYERS_OF_MONTH = [
-    {"name": "Trevor Lawrence", "month": "December"},
-    {"name": "Matthew Stafford", "month": "November"},
-    {"name": "Matthew Stafford", "month": "December"},
-]
+DEFAULT_SEASON = 2025
 
 
-def seed_awards():
+def seed_awards(season: int = DEFAULT_SEASON, dry_run: bool = False):
+    migrate(engine)
     db = SessionLocal()
 
     try:
-        # Clear existing POW/POM bonuses for the season
-        print("Clearing existing POW/POM bonuses...")
-        db.query(SeasonBonus).filter(
-            SeasonBonus.season == SEASON,
-            SeasonBonus.bonus_type.in_([BonusType.CONF_POW, BonusType.CONF_POM])
-        ).delete(synchronize_session=False)
-        db.commit()
-
-        pow_count = 0
-        pom_count = 0
-        pow_points = 0
-        pom_points = 0
-
-        # Add Players of the Week
-        print("\nAdding Players of the Week (10 pts each)...")
-        for award in PLAYERS_OF_WEEK:
-            qb = db.query(Quarterback).filter(
-                Quarterback.name == award["name"],
-                Quarterback.season == SEASON
-            ).first()
-
-            if qb:
-                bonus = SeasonBonus(
-                    qb_id=qb.id,
-                    season=SEASON,
-                    bonus_type=BonusType.CONF_POW,
-                    points=10.0
-                )
-                db.add(bonus)
-                pow_count += 1
-                pow_points += 10
-                print(f"  + {award['name']} (Week {award['week']}) - 10 pts")
-            else:
-                print(f"  ! {award['name']} not found in database")
-
-        # Add Players of the Month
-        print("\nAdding Players of the Month (20 pts each)...")
-        for award in PLAYERS_OF_MONTH:
-            qb = db.query(Quarterback).filter(
-                Quarterback.name == award["name"],
-                Quarterback.season == SEASON
-            ).first()
-
-            if qb:
-                bonus = SeasonBonus(
-                    qb_id=qb.id,
-                    season=SEASON,
-                    bonus_type=BonusType.CONF_POM,
-                    points=20.0
-                )
-                db.add(bonus)
-                pom_count += 1
-                pom_points += 20
-                print(f"  + {award['name']} ({award['month']}) - 20 pts")
-            else:
-                print(f"  ! {award['name']} not found in database")
-
-        db.commit()
+        payload = AwardService.load(season)
+        print(f"Applying {len(payload['awards'])} {season} awards from {AwardService.path(season).name}"
+              f"{' (dry run)' if dry_run else ''}...")
+        report = AwardService.apply(db, season, payload, dry_run=dry_run)
 
         print("\n" + "=" * 60)
-        print("Awards seeded successfully!")
+        print("Awards planned (dry run)" if dry_run else "Awards seeded successfully!")
         print("=" * 60)
-        print(f"Players of the Week: {pow_count} awards = {pow_points} total points")
-        print(f"Players of the Month: {pom_count} awards = {pom_points} total points")
-        print(f"Grand Total: {pow_count + pom_count} awards = {pow_points + pom_points} points")
+        print(f"Added: {report['inserted']}  Updated: {report['updated']}  "
+              f"Removed: {report['deleted']}  Unchanged: {report['unchanged']}")
+        for award, totals in sorted(report["awards"].items()):
+            print(f"{award}: {totals['awards']} awards = {totals['points']:g} points")
+        print(f"Grand Total: {report['total_awards']} awards = {report['total_points']:g} points")
 
-        # Show breakdown by team
-        print("\nPoints by Team:")
-        team_points = {}
-        for award in PLAYERS_OF_WEEK:
-            qb = db.query(Quarterback).filter(
-                Quarterback.name == award["name"],
-                Quarterback.season == SEASON
-            ).first()
-            if qb and qb.squad:
-                team_points[qb.squad.name] = team_points.get(qb.squad.name, 0) + 10
+        for name in report["unmatched_names"]:
+            print(f"  ! {name} not found in database")
 
-        for award in PLAYERS_OF_MONTH:
-            qb = db.query(Quarterback).filter(
-                Quarterback.name == award["name"],
-                Quarterback.season == SEASON
-            ).first()
-            if qb and qb.squad:
-                team_points[qb.squad.name] = team_points.get(qb.squad.name, 0) + 20
-
-        for team, points in sorted(team_points.items(), key=lambda x: -x[1]):
-            print(f"  {team}: +{points} pts")
+        print("\nPoints by Team:")
+        for team, points in sorted(report["points_by_team"].items(), key=lambda x: -x[1]):
+            print(f"  {team}: +{points:g} pts")
 
     except Exception as e:
         print(f"Error seeding awards: {e}")
@@ -142,4 +52,8 @@ def seed_awards():
 
 
 if __name__ == "__main__":
-    seed_awards()
+    parser = argparse.ArgumentParser(description="Apply a season's award data file.")
+    parser.add_argument("season", nargs="?", type=int, default=DEFAULT_SEASON)
+    parser.add_argument("--dry-run", action="store_true", help="Show the changes without saving them")
+    args = parser.parse_args()
+    seed_awards(args.season, args.dry_run)
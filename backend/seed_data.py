@@ -5,19 +5,24 @@ This is ADDITIVE and season-scoped: it only clears/reseeds the target SEASON,
 so prior seasons (e.g. 2025) are preserved for historical browsing.
 """
 from app.database.config import SessionLocal, engine
-from app.models.models import Base, Squad, Quarterback, WeeklyStat
+from app.database.migrations import migrate
+from app.models.models import (
+    Squad, Quarterback, WeeklyStat, QBSeasonTotal, SquadSeasonTotal
+)
+from app.services.totals import TotalsService
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Create all tables (applies any pending schema migrations)
+migrate(engine)
 
 # Season
 SEASON = 2026
 
 # 2026 league rosters (post Rookie/FA Draft).
-# NOTE: nfl_team is display-only. NFL stat/win sync matches QBs by NAME, so
-# these abbreviations do not affect scoring. Names use the spellings that
-# match nflreadpy's player_display_name (e.g. "C.J. Stroud", "J.J. McCarthy",
-# "Jaxson Dart") so the auto-sync can find them.
+# NOTE: nfl_team is display-only. NFL stat/win sync matches QBs by nflverse
+# player ID once known, otherwise by normalized NAME (case, punctuation and
+# Jr./III suffixes ignored), so these abbreviations do not affect scoring.
+# Names use nflverse's player_display_name spellings (e.g. "C.J. Stroud",
+# "J.J. McCarthy", "Jaxson Dart"); the first sync learns each QB's ID.
 # "TBD" = 2026 rookie whose NFL team still needs confirmation.
 ROSTERS = {
     "Team AP": {
@@ -109,6 +114,12 @@ def seed_database():
         season_qb_ids = [
             qb.id for qb in db.query(Quarterback).filter(Quarterback.season == SEASON).all()
         ]
+        db.query(QBSeasonTotal).filter(QBSeasonTotal.season == SEASON).delete(
+            synchronize_session=False
+        )
+        db.query(SquadSeasonTotal).filter(SquadSeasonTotal.season == SEASON).delete(
+            synchronize_session=False
+        )
         if season_qb_ids:
             db.query(WeeklyStat).filter(WeeklyStat.qb_id.in_(season_qb_ids)).delete(
                 synchronize_session=False
@@ -145,6 +156,7 @@ def seed_database():
                 db.add(qb)
                 print(f"  - {qb_data['name']} ({qb_data['nfl_team']})")
 
+        TotalsService.rebuild_season(db, SEASON)
         db.commit()
 
         print("\n" + "="*60)
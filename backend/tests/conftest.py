@@ -0,0 +1,136 @@
+"""
+Shared test setup. Tests never touch the local howell_league.db: the app's
+default engine points at a throwaway SQLite file, and the db fixture empties
+and re-migrates it for every test that uses it.
+"""
+from typing import Dict, List, Optional, Tuple
+import os
+import random
+import tempfile
+import pytest
+
+# Must be set before anything imports app.database.config
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+# Point values scoring rows are drawn from; few distinct values so QB and
+# squad totals tie often
+POINT_VALUES = [0.0, 0.01, 1.1, 2.2, 3.0, 3.3, 4.0, 7.04, 10.1, 12.36, 15.0, -3.0, -0.5]
+
+@pytest.fixture
+def db():
+    """Session on an empty, freshly migrated app database."""
+    from app.database.config import Base, SessionLocal, engine
+    from app.database.migrations import migrate, migration_metadata
+    from app.services.cache import standings_cache
+
+    Base.metadata.drop_all(bind=engine)
+    migration_metadata.drop_all(bind=engine)
+    migrate(engine)
+    standings_cache.clear()
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client(db):
+    """TestClient for the app, on the same empty database as db."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+def seed_league(db, seed: int, season: int = 2026, squads: int = 4) -> Dict[str, List[int]]:
+    """
+    Fill a season with random squads, rosters and scoring rows from a seeded
+    generator, then build its totals. Rosters run from empty to well past
+    the top-5 cutoff, some QBs score nothing, some copy another QB's rows
+    (tied totals) and a few are free agents.
+
+    Returns:
+        {"squads": squad ids, "quarterbacks": QB ids}
+    """
+    from app.models.models import (
+        Squad, Quarterback, WeeklyStat, SeasonBonus, PlayoffAppearance, BonusType, PlayoffRound
+    )
+    from app.services.totals import TotalsService
+
+    rng = random.Random(seed)
+    squad_rows = [Squad(name=f"Team {seed}-{i}", owner=f"Owner {i}", season=season) for i in range(squads)]
+    db.add_all(squad_rows)
+    db.flush()
+
+    owners = [squad.id for squad in squad_rows for _ in range(rng.randint(0, 9))] + [None] * rng.randint(0, 3)
+    rng.shuffle(owners)
+    quarterbacks = []
+    previous_rows = None
+    for i, squad_id in enumerate(owners):
+        qb = Quarterback(name=f"QB {seed}-{i}", nfl_team="NFL", squad_id=squad_id, season=season)
+        db.add(qb)
+        db.flush()
+        quarterbacks.append(qb.id)
+
+        if previous_rows is not None and rng.random() < 0.25:
+            rows = previous_rows
+        elif rng.random() < 0.2:
+            rows = ([], [], [])
+        else:
+            rows = (
+                [rng.choice(POINT_VALUES) for _ in range(rng.randint(0, 6))],
+                rng.sample(list(BonusType), rng.randint(0, 2)),
+                rng.sample(list(PlayoffRound), rng.randint(0, 2)),
+            )
+        weekly, bonuses, rounds = rows
+        db.add_all([
+            WeeklyStat(qb_id=qb.id, season=season, week=week + 1, points=points)
+            for week, points in enumerate(weekly)
+        ])
+        db.add_all([SeasonBonus(qb_id=qb.id, season=season, bonus_type=bonus, points=10.0) for bonus in bonuses])
+        db.add_all([PlayoffAppearance(qb_id=qb.id, season=season, round=r, points=3.0) for r in rounds])
+        previous_rows = rows
+
+    db.flush()
+    TotalsService.rebuild_season(db, season)
+    db.commit()
+    return {"squads": [squad.id for squad in squad_rows], "quarterbacks": quarterbacks}
+
+def weekly_frame(rows: List[Tuple[str, int, int, int]]):
+    """fetch_weekly_stats rows from (display name, week, passing yards, passing TDs)."""
+    import polars as pl
+
+    return pl.DataFrame(
+        [
+            {
+                "player_id": None, "player_name": None, "player_display_name": name,
+                "position": "QB", "season_type": "REG", "week": week,
+                "passing_yards": yards, "rushing_yards": 0, "passing_tds": tds,
+                "rushing_tds": 0, "passing_interceptions": 0, "sack_fumbles_lost": 0,
+            }
+            for name, week, yards, tds in rows
+        ],
+        schema={
+            "player_id": pl.Utf8, "player_name": pl.Utf8, "player_display_name": pl.Utf8,
+            "position": pl.Utf8, "season_type": pl.Utf8, "week": pl.Int64,
+            "passing_yards": pl.Int64, "rushing_yards": pl.Int64, "passing_tds": pl.Int64,
+            "rushing_tds": pl.Int64, "passing_interceptions": pl.Int64, "sack_fumbles_lost": pl.Int64,
+        }
+    )
+
+def games_frame(rows: List[Tuple[str, int, str, str, Optional[str], bool]]):
+    """fetch_completed_games rows from (game type, week, home QB, away QB, winner or None, prime time)."""
+    import polars as pl
+
+    return pl.DataFrame(
+        [
+            {
+                "game_type": game_type, "week": week,
+                "home_qb_id": None, "away_qb_id": None, "home_qb_name": home, "away_qb_name": away,
+                "winning_qb_id": None, "winning_qb_name": winner, "is_prime_time": prime_time,
+            }
+            for game_type, week, home, away, winner, prime_time in rows
+        ],
+        schema={
+            "game_type": pl.Utf8, "week": pl.Int64,
+            "home_qb_id": pl.Utf8, "away_qb_id": pl.Utf8, "home_qb_name": pl.Utf8, "away_qb_name": pl.Utf8,
+            "winning_qb_id": pl.Utf8, "winning_qb_name": pl.Utf8, "is_prime_time": pl.Boolean,
+        }
+    )
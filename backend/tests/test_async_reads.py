@@ -0,0 +1,81 @@
+"""
+Async database mode (ASYNC_DB=1) serves the read endpoints with exactly
+the payloads and validators of the default sync mode.
+
+Both modes read the same test database: the async one through aiosqlite,
+switched on per test by pointing async_config at a test AsyncEngine.
+"""
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.database import async_config
+from app.database.config import SQLALCHEMY_DATABASE_URL
+from app.services.cache import standings_cache
+from conftest import seed_league
+import asyncio
+import pytest
+
+SEASON = 2026
+
+@pytest.fixture
+def async_mode(monkeypatch):
+    """Switch the read routers to async mode; call it to turn it on."""
+    # NullPool: each TestClient request runs on its own event loop
+    engine = create_async_engine(async_config.async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+
+    def enable():
+        monkeypatch.setattr(async_config, "ASYNC_DB", True)
+        monkeypatch.setattr(async_config, "AsyncSessionLocal", async_sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False
+        ))
+
+    yield enable
+    asyncio.run(engine.dispose())
+
+def read_endpoints(league):
+    paths = [
+        "/api/standings/",
+        "/api/standings/worst-qb/",
+        "/api/squads/",
+        "/api/quarterbacks/",
+        f"/api/seasons/{SEASON}/snapshot",
+        "/api/quarterbacks/details/?ids=" + ",".join(map(str, league["quarterbacks"][:10])),
+    ]
+    paths += [f"/api/squads/{squad_id}/roster/" for squad_id in league["squads"]]
+    paths += [f"/api/squads/{squad_id}/details/" for squad_id in league["squads"]]
+    paths += [f"/api/quarterbacks/{qb_id}/" for qb_id in league["quarterbacks"][:5]]
+    return paths
+
+def read_all(client, paths):
+    # Empty the payload cache so every response is built in the current mode
+    standings_cache.clear()
+    responses = {}
+    for path in paths:
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.text)
+        responses[path] = (response.json(), response.headers.get("etag"))
+    return responses
+
+@pytest.mark.parametrize("seed", range(3))
+def test_async_mode_returns_sync_payloads(client, db, async_mode, seed):
+    league = seed_league(db, seed, SEASON)
+    for qb_id in league["quarterbacks"][:3]:
+        response = client.post("/api/admin/weekly-stats/", json={
+            "qb_id": qb_id, "season": SEASON, "week": 17, "passing_yards": 280, "passing_tds": 2, "game_won": True
+        })
+        assert response.status_code == 200, response.text
+    paths = read_endpoints(league)
+
+    sync_responses = read_all(client, paths)
+    async_mode()
+    async_responses = read_all(client, paths)
+
+    assert async_responses == sync_responses
+
+def test_async_mode_answers_conditional_gets(client, db, async_mode):
+    seed_league(db, 0, SEASON)
+    etag = client.get("/api/standings/").headers["etag"]
+
+    async_mode()
+
+    assert client.get("/api/standings/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/squads/9999/roster/").status_code == 404
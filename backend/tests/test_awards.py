@@ -0,0 +1,126 @@
+"""
+Award seeding through the admin endpoint, against the test database:
+applying a data set is an idempotent diff against the stored bonuses, and
+the totals move with every award added, dropped or re-valued.
+"""
+from app.models.models import Squad, Quarterback, SeasonBonus, BonusType
+from app.services.scoring import ScoringEngine
+from app.services.standings import StandingsService
+from app.services.totals import TotalsService
+import app.services.awards as awards
+import pytest
+
+SEASON = 2026
+
+AWARDS = {
+    "season": SEASON,
+    "source": "test",
+    "awards": [
+        {"award": "CONF_POW", "period": "Week 1", "name": "Josh Allen"},
+        {"award": "CONF_POW", "period": "Week 5", "name": "Josh Allen"},
+        {"award": "CONF_POM", "period": "October", "name": "CJ Stroud"},
+        {"award": "MVP", "name": "Jalen Hurts"},
+        # Not on the roster
+        {"award": "ROOKIE_OF_YEAR", "name": "Cam Ward"},
+    ],
+}
+
+@pytest.fixture
+def qbs(db):
+    squad = Squad(name="Team A", owner="A", season=SEASON)
+    db.add(squad)
+    db.flush()
+    rows = [Quarterback(name=name, nfl_team="NFL", squad_id=squad.id, season=SEASON)
+            for name in ("Josh Allen", "C.J. Stroud", "Jalen Hurts")]
+    db.add_all(rows)
+    db.commit()
+    return {qb.name: qb.id for qb in rows}
+
+def upload(client, payload, **params):
+    response = client.post("/api/admin/awards/", params={"season": SEASON, **params}, json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def counts(report):
+    return report["inserted"], report["updated"], report["deleted"], report["unchanged"]
+
+def qb_totals(db):
+    db.expire_all()
+    return {qb["qb_id"]: qb["total_points"] for qb in StandingsService.get_ranked_qbs(db, SEASON)}
+
+def test_applying_the_same_awards_twice_changes_nothing(client, db, qbs):
+    first = upload(client, AWARDS)
+    assert counts(first) == (4, 0, 0, 0)
+    assert first["unmatched_names"] == ["Cam Ward"]
+    totals = qb_totals(db)
+
+    again = upload(client, AWARDS)
+
+    # Unchanged counts stored awards the data set lists again; the
+    # unmatched name is in neither count
+    assert counts(again) == (0, 0, 0, 4)
+    assert again["unmatched_names"] == ["Cam Ward"]
+    assert db.query(SeasonBonus).count() == 4
+    assert qb_totals(db) == totals
+    assert totals[qbs["Josh Allen"]] == 2 * ScoringEngine.get_bonus_points(BonusType.CONF_POW)
+
+def test_dropped_award_is_deleted_and_totals_adjusted(client, db, qbs):
+    upload(client, AWARDS)
+    totals = qb_totals(db)
+
+    dropped = {**AWARDS, "awards": [award for award in AWARDS["awards"] if award.get("period") != "Week 5"]}
+    report = upload(client, dropped)
+
+    assert counts(report) == (0, 0, 1, 3)
+    periods = [bonus.award_period for bonus in db.query(SeasonBonus).filter(SeasonBonus.qb_id == qbs["Josh Allen"])]
+    assert periods == ["Week 1"]
+    after = qb_totals(db)
+    assert after[qbs["Josh Allen"]] == round(totals[qbs["Josh Allen"]] - ScoringEngine.get_bonus_points(BonusType.CONF_POW), 2)
+    assert after[qbs["Jalen Hurts"]] == totals[qbs["Jalen Hurts"]]
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_uncovered_types_are_left_alone(client, db, qbs):
+    upload(client, AWARDS)
+
+    # POW/POM are always covered; MVP isn't listed, so Hurts keeps it
+    report = upload(client, {"season": SEASON, "awards": []})
+
+    assert counts(report) == (0, 0, 3, 0)
+    db.expire_all()
+    assert [bonus.bonus_type for bonus in db.query(SeasonBonus)] == [BonusType.MVP]
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_re_valued_awards_are_updated(client, db, qbs):
+    upload(client, AWARDS)
+    response = client.put("/api/admin/scoring-rules/", params={"season": SEASON, "rescore": False},
+                          json={"rules": {"bonuses": {"MVP": 30.0}}})
+    assert response.status_code == 200, response.text
+
+    report = upload(client, AWARDS)
+
+    assert counts(report) == (0, 1, 0, 3)
+    assert qb_totals(db)[qbs["Jalen Hurts"]] == 30.0
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_dry_run_writes_nothing(client, db, qbs):
+    report = upload(client, AWARDS, dry_run=True)
+
+    assert counts(report) == (4, 0, 0, 0)
+    assert db.query(SeasonBonus).count() == 0
+    assert set(qb_totals(db).values()) == {0.0}
+
+def test_seed_awards_without_data_file_changes_nothing(client, tmp_path, monkeypatch):
+    # The Admin button seeds the default season, which may not have a file yet
+    monkeypatch.setattr(awards, "AWARDS_DIR", tmp_path)
+
+    response = client.post("/api/admin/seed-awards/")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["season"] == 2026
+    assert (report["inserted"], report["updated"], report["deleted"], report["total_awards"]) == (0, 0, 0, 0)
+    assert "nothing changed" in report["message"]
+
+def test_upload_awards_still_validates(client):
+    response = client.post("/api/admin/awards/?season=2026", json={"season": 2025, "awards": []})
+    assert response.status_code == 400
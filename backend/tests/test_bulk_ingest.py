@@ -0,0 +1,165 @@
+"""
+Bulk admin ingestion: every row gets a created / updated / unchanged /
+error result, repeated keys within a batch are rejected, CSV bodies parse
+like JSON ones, and the totals move by exactly the points written.
+"""
+from app.models.models import Squad, Quarterback, WeeklyStat, PlayoffAppearance, PlayoffRound
+from app.services import bulk_ingest
+from app.services.bulk_ingest import BulkIngestService
+from app.services.scoring import ScoringEngine
+from app.services.totals import TotalsService
+from app.services.standings import StandingsService
+import pytest
+
+SEASON = 2026
+
+@pytest.fixture
+def qbs(db):
+    squad = Squad(name="Team A", owner="A", season=SEASON)
+    db.add(squad)
+    db.flush()
+    rows = [Quarterback(name=name, nfl_team="NFL", squad_id=squad.id, season=SEASON)
+            for name in ("Josh Allen", "Jalen Hurts", "Bo Nix")]
+    db.add_all(rows)
+    db.commit()
+    return [qb.id for qb in rows]
+
+def qb_totals(db):
+    db.expire_all()
+    return {qb["qb_id"]: qb["total_points"] for qb in StandingsService.get_ranked_qbs(db, SEASON)}
+
+def line(qb_id, week, **stats):
+    return {"qb_id": qb_id, "season": SEASON, "week": week, **stats}
+
+def test_weekly_results_per_row(client, db, qbs):
+    allen, hurts, nix = qbs
+    first = client.post("/api/admin/weekly-stats/bulk/", json=[
+        line(allen, 1, passing_yards=250, passing_tds=2),
+        line(hurts, 1, rushing_yards=40, rushing_tds=1, game_won=True),
+    ]).json()
+    assert [result["status"] for result in first["results"]] == ["created", "created"]
+
+    totals = qb_totals(db)
+    response = client.post("/api/admin/weekly-stats/bulk/", json=[
+        line(allen, 1, passing_yards=250, passing_tds=2),
+        line(hurts, 1, rushing_yards=40, rushing_tds=1, game_won=True, prime_time_win=True),
+        line(nix, 2, interceptions=1),
+        line(9999, 1),
+        {"qb_id": allen, "season": SEASON},
+        "not an object",
+        line(nix, 2, interceptions=3),
+    ]).json()
+
+    statuses = [(result["row"], result["status"]) for result in response["results"]]
+    assert statuses == [
+        (1, "unchanged"), (2, "updated"), (3, "created"), (4, "error"), (5, "error"), (6, "error"), (7, "error")
+    ]
+    errors = {result["row"]: result["error"] for result in response["results"] if result["status"] == "error"}
+    assert errors[4] == "Quarterback not found"
+    assert errors[5].startswith("week:")
+    assert errors[6] == "Row must be an object"
+    assert errors[7] == "Duplicate of row 3"
+    assert (response["received"], response["created"], response["updated"], response["unchanged"], response["error"]) \
+        == (7, 1, 1, 1, 4)
+
+    # Totals move by the points written: +1 for the prime time upgrade, -3 for the interception
+    after = qb_totals(db)
+    assert after[allen] == totals[allen]
+    assert after[hurts] == round(totals[hurts] + 1, 2)
+    assert after[nix] == round(totals[nix] - 3, 2)
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_unchanged_compares_points_in_hundredths(client, db, qbs):
+    allen = qbs[0]
+    stat = WeeklyStat(qb_id=allen, season=SEASON, week=1, passing_yards=260, passing_tds=1, rushing_yards=7)
+    # Stored by another path with float noise, and NULLs where the request sends 0
+    stat.points = ScoringEngine.calculate_weekly_points(stat) + 1e-9
+    db.add(stat)
+    db.commit()
+
+    response = client.post("/api/admin/weekly-stats/bulk/", json=[
+        line(allen, 1, passing_yards=260, passing_tds=1, rushing_yards=7)
+    ]).json()
+
+    assert response["results"][0]["status"] == "unchanged"
+
+def test_dry_run_writes_nothing(client, db, qbs):
+    totals = qb_totals(db)
+    response = client.post("/api/admin/weekly-stats/bulk/", params={"dry_run": True}, json=[
+        line(qbs[0], 1, passing_yards=300)
+    ]).json()
+
+    assert response["dry_run"] is True
+    assert response["created"] == 1
+    assert db.query(WeeklyStat).count() == 0
+    assert qb_totals(db) == totals
+
+def test_csv_body(client, db, qbs):
+    allen, hurts, _ = qbs
+    body = (
+        "﻿qb_id,season,week,passing_yards,passing_tds,game_won\r\n"
+        f"{allen},{SEASON},1,275,3,true\r\n"
+        f"{hurts},{SEASON},1,, ,false\r\n"
+        f"{hurts},{SEASON},x,10,0,false\r\n"
+    ).encode()
+
+    response = client.post("/api/admin/weekly-stats/bulk/", content=body, headers={"Content-Type": "text/csv"}).json()
+
+    assert [result["status"] for result in response["results"]] == ["created", "created", "error"]
+    db.expire_all()
+    allen_line = db.query(WeeklyStat).filter(WeeklyStat.qb_id == allen).one()
+    assert (allen_line.passing_yards, allen_line.passing_tds, allen_line.game_won) == (275, 3, True)
+    # Empty cells take the field defaults
+    hurts_line = db.query(WeeklyStat).filter(WeeklyStat.qb_id == hurts).one()
+    assert (hurts_line.passing_yards, hurts_line.passing_tds, hurts_line.points) == (0, 0, 0.0)
+
+@pytest.mark.parametrize("body, content_type, message", [
+    (b"{not json", "application/json", "JSON array"),
+    (b'{"qb_id": 1}', "application/json", "JSON array"),
+    (b"[]", "application/json", "No rows"),
+    (b"qb_id,season,week\r\n", "text/csv", "No rows"),
+    (b"\xff\xfe", "text/csv", "UTF-8"),
+])
+def test_unparseable_bodies(body, content_type, message):
+    with pytest.raises(ValueError, match=message):
+        BulkIngestService.parse_rows(body, content_type)
+
+def test_row_limit(client, db, qbs, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "MAX_BULK_ROWS", 2)
+    response = client.post("/api/admin/weekly-stats/bulk/", json=[line(qbs[0], week) for week in (1, 2, 3)])
+    assert response.status_code == 400
+    assert "limit is 2" in response.json()["detail"]
+
+def test_bonus_and_playoff_results(client, db, qbs):
+    allen, hurts, _ = qbs
+    bonuses = [
+        {"qb_id": allen, "season": SEASON, "bonus_type": "MVP"},
+        {"qb_id": allen, "season": SEASON, "bonus_type": "MVP"},
+        {"qb_id": hurts, "season": SEASON, "bonus_type": "BEST_HAIR"},
+    ]
+    first = client.post("/api/admin/bonuses/bulk/", json=bonuses).json()
+    assert [result["status"] for result in first["results"]] == ["created", "error", "error"]
+    again = client.post("/api/admin/bonuses/bulk/", json=bonuses[:1]).json()
+    assert again["results"][0]["status"] == "unchanged"
+
+    playoffs = [
+        {"qb_id": allen, "season": SEASON, "round": "SUPER_BOWL"},
+        {"qb_id": hurts, "season": SEASON, "round": "SUPER_BOWL", "won_super_bowl": True},
+    ]
+    assert client.post("/api/admin/playoffs/bulk/", json=playoffs).json()["created"] == 2
+    # Float noise on the stored points still counts as unchanged
+    db.query(PlayoffAppearance).filter(PlayoffAppearance.qb_id == allen).update(
+        {"points": PlayoffAppearance.points + 1e-9}
+    )
+    db.commit()
+    response = client.post("/api/admin/playoffs/bulk/", json=[
+        playoffs[0],
+        {**playoffs[1], "won_super_bowl": False},
+        {"qb_id": hurts, "season": SEASON, "round": "PRESEASON"},
+    ]).json()
+    assert [result["status"] for result in response["results"]] == ["unchanged", "updated", "error"]
+
+    totals = qb_totals(db)
+    assert totals[allen] == 50.0 + ScoringEngine.get_playoff_points(PlayoffRound.SUPER_BOWL, False)
+    assert totals[hurts] == ScoringEngine.get_playoff_points(PlayoffRound.SUPER_BOWL, False)
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
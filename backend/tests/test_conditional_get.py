@@ -0,0 +1,88 @@
+"""
+Conditional GETs on the read endpoints: the weak season-version ETag
+answers a matching If-None-Match with a 304 whatever the encoding, a write
+changes it, and If-Modified-Since never hides a write made in the same
+second as the Last-Modified it was sent.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from app.models.models import SeasonVersion
+from conftest import seed_league
+import pytest
+
+SEASON = 2026
+
+PATHS = ["/api/standings/", "/api/squads/", "/api/quarterbacks/", f"/api/seasons/{SEASON}/snapshot"]
+
+@pytest.fixture
+def league(db):
+    return seed_league(db, 2, SEASON)
+
+def write(client, league, week=17):
+    response = client.post("/api/admin/weekly-stats/", json={
+        "qb_id": league["quarterbacks"][0], "season": SEASON, "week": week, "passing_yards": 310, "passing_tds": 3
+    })
+    assert response.status_code == 200, response.text
+
+def set_updated_at(db, when):
+    db.query(SeasonVersion).filter(SeasonVersion.season == SEASON).update({"updated_at": when})
+    db.commit()
+
+@pytest.mark.parametrize("path", PATHS)
+def test_matching_etag_gets_304(client, league, path):
+    etag = client.get(path).headers["etag"]
+    assert etag.startswith('W/"')
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        response = client.get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+def test_etag_is_shared_by_gzip_and_identity(client, league):
+    # The snapshot is above GZIP_MIN_BYTES on the seeded league
+    path = f"/api/seasons/{SEASON}/snapshot"
+    gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    # Same weak tag for both encodings, so either copy revalidates
+    assert gzipped.headers["etag"] == identity.headers["etag"]
+    assert client.get(path, headers={
+        "If-None-Match": gzipped.headers["etag"], "Accept-Encoding": "identity"
+    }).status_code == 304
+
+@pytest.mark.parametrize("path", PATHS)
+def test_write_changes_etag(client, league, path):
+    etag = client.get(path).headers["etag"]
+
+    write(client, league)
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_last_modified_waits_for_its_second_to_end(client, db, league):
+    # Written this second: a second write could still share the timestamp
+    set_updated_at(db, datetime.now(timezone.utc) + timedelta(seconds=5))
+    assert "last-modified" not in client.get("/api/standings/").headers
+
+    set_updated_at(db, datetime(2026, 9, 7, 13, 5, 30, 250000, tzinfo=timezone.utc))
+    last_modified = client.get("/api/standings/").headers["last-modified"]
+    assert last_modified == "Mon, 07 Sep 2026 13:05:30 GMT"
+
+    assert client.get("/api/standings/", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+def test_if_modified_since_sees_writes_after_last_modified(client, db, league):
+    set_updated_at(db, datetime(2026, 9, 7, 13, 5, 30, 250000, tzinfo=timezone.utc))
+    last_modified = client.get("/api/standings/").headers["last-modified"]
+
+    write(client, league)
+
+    response = client.get("/api/standings/", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+    # Unparseable or naive dates are ignored rather than trusted
+    for since in ("yesterday", format_datetime(datetime(2030, 1, 1))):
+        assert client.get("/api/standings/", headers={"If-Modified-Since": since}).status_code == 200
@@ -0,0 +1,38 @@
+"""
+Query timing listeners and settings from app.database.engine_config.
+"""
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.database.engine_config import PoolMetrics, configure_engine, pool_metrics
+import pytest
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/metrics.db")
+    configure_engine(engine)
+    pool_metrics.reset()
+    yield engine
+    engine.dispose()
+
+def test_failed_statement_leaves_no_timing_state(engine):
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        connection.execute(text("SELECT 1"))
+        leftovers = dict(connection.info)
+
+    stats = pool_metrics.snapshot()
+    # Only the statement that completed is timed
+    assert stats["queries"] == 1
+    assert stats["query_ms_max"] < 1000
+    assert not any("start" in key for key in leftovers)
+
+def test_slow_query_threshold_read_once(monkeypatch):
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "0")
+    metrics = PoolMetrics()
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "100000")
+
+    metrics.record_query(0.001)
+
+    assert metrics.snapshot()["slow_queries"] == 1
+    assert metrics.snapshot()["slow_query_ms"] == 0
@@ -0,0 +1,42 @@
+"""
+Response compression: large responses are gzipped, the standings stream
+is excluded so its events aren't buffered.
+"""
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers.standings import STREAM_PATH
+from app.services.http_cache import SelectiveGZipMiddleware
+import pytest
+
+def test_stream_path_is_excluded_in_app():
+    gzip = [middleware for middleware in app.user_middleware if middleware.cls is SelectiveGZipMiddleware]
+    assert len(gzip) == 1
+    assert gzip[0].kwargs["exclude_paths"] == [STREAM_PATH]
+
+@pytest.fixture
+def client():
+    test_app = FastAPI()
+    test_app.add_middleware(SelectiveGZipMiddleware, minimum_size=10, exclude_paths=["/events/"])
+
+    @test_app.get("/events/")
+    def events():
+        return StreamingResponse(iter([b"data: x\n\n"] * 50), media_type="text/event-stream")
+
+    @test_app.get("/large")
+    def large():
+        return PlainTextResponse("x" * 1000)
+
+    return TestClient(test_app)
+
+def test_excluded_stream_is_not_compressed(client):
+    for path in ("/events/", "/events"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"}, follow_redirects=True)
+        assert "content-encoding" not in response.headers
+        assert response.text == "data: x\n\n" * 50
+
+def test_other_responses_are_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "x" * 1000
@@ -0,0 +1,163 @@
+"""
+The unique indexes the upserts and standings reads rely on: EXPLAIN shows
+each hot lookup served by its index, every ON CONFLICT target resolves to
+one, and migrating a database with duplicate rows either removes them
+(scoring rows) or stops with DuplicateRowsError (quarterbacks, squads).
+
+Runs on a fresh SQLite database per test.
+"""
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.database.config import Base
+from app.database.migrations import current_version, migrate
+from app.database.schema import DuplicateRowsError, ensure_schema
+from app.database.upsert import upsert
+from app.models.models import (
+    SEASON_BONUS_KEY, Squad, Quarterback, WeeklyStat, SeasonBonus, PlayoffAppearance, BonusType, PlayoffRound
+)
+import pytest
+
+# (description, expected index, query) for each lookup the write paths and
+# standings reads rely on
+HOT_QUERIES = [
+    (
+        "weekly stat by (qb, season, week)",
+        "uq_weekly_stats_qb_season_week",
+        select(WeeklyStat.points).where(WeeklyStat.qb_id == 1, WeeklyStat.season == 2026, WeeklyStat.week == 1),
+    ),
+    (
+        "weekly stats of a QB",
+        "uq_weekly_stats_qb_season_week",
+        select(WeeklyStat).where(WeeklyStat.qb_id == 1),
+    ),
+    (
+        "bonus by (qb, season, type)",
+        "uq_season_bonuses_qb_season_type_period",
+        select(SeasonBonus.id).where(
+            SeasonBonus.qb_id == 1, SeasonBonus.season == 2026, SeasonBonus.bonus_type == BonusType.MVP
+        ),
+    ),
+    (
+        "playoff appearance by (qb, season, round)",
+        "uq_playoff_appearances_qb_season_round",
+        select(PlayoffAppearance.id).where(
+            PlayoffAppearance.qb_id == 1,
+            PlayoffAppearance.season == 2026,
+            PlayoffAppearance.round == PlayoffRound.WILD_CARD
+        ),
+    ),
+    (
+        "quarterback by (season, name)",
+        "uq_quarterbacks_season_name",
+        select(Quarterback.id).where(Quarterback.season == 2026, Quarterback.name == "Josh Allen"),
+    ),
+    (
+        "season roster (standings, QB leaderboard)",
+        "uq_quarterbacks_season_name",
+        select(Quarterback.id, Quarterback.name).where(Quarterback.season == 2026),
+    ),
+    (
+        "season squads (standings)",
+        "uq_squads_season_name",
+        select(Squad.id, Squad.name).where(Squad.season == 2026),
+    ),
+]
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/indexes.db")
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def migrated(engine):
+    migrate(engine)
+    return engine
+
+def explain(connection: Connection, query) -> str:
+    """Return the SQLite query plan as one string."""
+    sql = str(query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    return "\n".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all())
+
+@pytest.mark.parametrize("description, index, query", HOT_QUERIES, ids=[query[0] for query in HOT_QUERIES])
+def test_hot_query_uses_its_index(migrated, description, index, query):
+    with migrated.connect() as connection:
+        plan = explain(connection, query)
+    assert index in plan, plan
+
+def test_upserts_resolve_on_unique_indexes(migrated):
+    # SQLite rejects an ON CONFLICT target that matches no unique index, so
+    # each upsert running twice to one row proves its index is there
+    with Session(migrated) as db:
+        upsert(db, Squad, [{"name": "Team A", "owner": "A", "season": 2026}], [Squad.season, Squad.name], ["owner"])
+        squad_id = db.scalar(select(Squad.id))
+        qb = {"name": "Josh Allen", "nfl_team": "BUF", "season": 2026, "squad_id": squad_id}
+        upsert(db, Quarterback, [qb], [Quarterback.season, Quarterback.name], ["nfl_team"])
+        qb_id = db.scalar(select(Quarterback.id))
+
+        writes = [
+            (
+                WeeklyStat,
+                {"qb_id": qb_id, "season": 2026, "week": 1, "passing_yards": 250, "points": 10.0},
+                [WeeklyStat.qb_id, WeeklyStat.season, WeeklyStat.week],
+                ["passing_yards", "points"],
+            ),
+            (
+                SeasonBonus,
+                {"qb_id": qb_id, "season": 2026, "bonus_type": BonusType.CONF_POW, "points": 10.0,
+                 "award_period": "Week 5"},
+                SEASON_BONUS_KEY,
+                [],
+            ),
+            (
+                PlayoffAppearance,
+                {"qb_id": qb_id, "season": 2026, "round": PlayoffRound.WILD_CARD, "won_super_bowl": False,
+                 "points": 3.0},
+                [PlayoffAppearance.qb_id, PlayoffAppearance.season, PlayoffAppearance.round],
+                ["points"],
+            ),
+        ]
+        for model, row, conflict_columns, update_columns in writes:
+            upsert(db, model, [row], conflict_columns, update_columns)
+            upsert(db, model, [row], conflict_columns, update_columns)
+            assert db.scalar(select(func.count()).select_from(model)) == 1, model.__tablename__
+        upsert(db, Quarterback, [qb], [Quarterback.season, Quarterback.name], ["nfl_team"])
+        assert db.scalar(select(func.count()).select_from(Quarterback)) == 1
+
+def drop_index(engine, name: str) -> None:
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX {name}"))
+
+def test_migration_removes_duplicate_scoring_rows(engine):
+    # A database from before the unique index existed, with a repeated stat line
+    Base.metadata.create_all(bind=engine)
+    drop_index(engine, "uq_weekly_stats_qb_season_week")
+    with Session(engine) as db:
+        db.add(Squad(name="Team A", owner="A", season=2026))
+        db.add(Quarterback(name="Josh Allen", nfl_team="BUF", season=2026, squad_id=1))
+        db.add_all([WeeklyStat(qb_id=1, season=2026, week=1, points=10.0) for _ in range(2)])
+        db.commit()
+
+    ensure_schema(engine)
+
+    with Session(engine) as db:
+        assert db.scalar(select(func.count()).select_from(WeeklyStat)) == 1
+    with engine.connect() as connection:
+        assert "uq_weekly_stats_qb_season_week" in explain(connection, HOT_QUERIES[0][2])
+
+def test_migration_stops_on_duplicate_quarterbacks(engine):
+    Base.metadata.create_all(bind=engine)
+    drop_index(engine, "uq_quarterbacks_season_name")
+    with Session(engine) as db:
+        db.add_all([Quarterback(name="Josh Allen", nfl_team="BUF", season=2026) for _ in range(2)])
+        db.commit()
+
+    with pytest.raises(DuplicateRowsError, match="uq_quarterbacks_season_name"):
+        migrate(engine)
+    # Nothing recorded: the migration runs again once the duplicates are merged
+    assert current_version(engine) == 0
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE quarterbacks SET name = 'Josh Allen Jr.' WHERE id = 2"))
+    assert migrate(engine) == [1, 2]
@@ -0,0 +1,70 @@
+"""
+Sync job bookkeeping: startup only fails jobs whose runner is gone, and the
+job history leaves out dry-run change sets.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, inspect, text
+from app.database.migrations import migrate
+from app.models.models import SyncJob
+from app.services.jobs import STALE_JOB_SECONDS, JobRunner
+import os
+import socket
+import subprocess
+import sys
+
+HOST = socket.gethostname()
+
+def exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+def test_fail_interrupted_only_fails_jobs_of_gone_runners(db):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(seconds=STALE_JOB_SECONDS + 60)
+    jobs = {
+        # runner -> (created_at, status, expected status after startup)
+        None: (now, "running", "failed"),
+        f"{HOST}:{os.getpid()}": (now, "queued", "failed"),
+        f"{HOST}:{exited_pid()}": (now, "running", "failed"),
+        f"{HOST}:{os.getppid()}": (now, "running", "running"),
+        "other-host:1": (now, "running", "running"),
+        "other-host:2": (old, "queued", "failed"),
+        "other-host:3": (old, "succeeded", "succeeded"),
+    }
+    for runner, (created_at, status, _) in jobs.items():
+        db.add(SyncJob(kind="stats", season=2026, status=status, created_at=created_at, runner=runner))
+    db.commit()
+
+    assert JobRunner.fail_interrupted(db) == 4
+    db.expire_all()
+    assert {job.runner: job.status for job in db.query(SyncJob)} == {
+        runner: expected for runner, (_, _, expected) in jobs.items()
+    }
+
+def test_job_list_leaves_out_change_set(client, db):
+    change_set = {"season": 2026, "weekly_stats": {"insert": [], "update": [], "delete": []}}
+    job = SyncJob(
+        kind="all", season=2026, status="succeeded", dry_run=True, created_at=datetime.now(timezone.utc),
+        result={"message": "Planned", "changes": {"weekly_stats": {"insert": 0}}, "change_set": change_set}
+    )
+    db.add(job)
+    db.commit()
+
+    listed = client.get("/api/admin/jobs/").json()
+    assert [entry["id"] for entry in listed] == [job.id]
+    assert listed[0]["result"] == {"message": "Planned", "changes": {"weekly_stats": {"insert": 0}}}
+
+    assert client.get(f"/api/admin/jobs/{job.id}").json()["result"]["change_set"] == change_set
+
+def test_migration_adds_runner_column(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/jobs.db")
+    migrate(engine)
+    # A database migrated before the runner column existed
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE sync_jobs DROP COLUMN runner"))
+        connection.execute(text("DELETE FROM schema_migrations WHERE version = 2"))
+
+    assert migrate(engine) == [2]
+    assert "runner" in {column["name"] for column in inspect(engine).get_columns("sync_jobs")}
+    engine.dispose()
@@ -0,0 +1,68 @@
+"""
+orjson serialization (serialize_json and the app's ORJSONResponse default)
+must produce what the stdlib JSONResponse produced before, including dicts
+keyed by ints, floats, bools and None.
+"""
+from datetime import date, datetime, timezone
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.models.models import BonusType, PlayoffRound
+from app.services.http_cache import serialize_json
+from app.services.qb_details import QuarterbackDetailService
+from app.services.snapshot import SnapshotService
+from app.services.standings import StandingsService
+from conftest import seed_league
+import json
+import pytest
+
+SEASON = 2026
+
+def stdlib_body(payload) -> bytes:
+    """The body FastAPI sent before orjson: jsonable_encoder, then JSONResponse."""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+def orjson_bodies(payload):
+    return [serialize_json(payload), ORJSONResponse(jsonable_encoder(payload)).body]
+
+@pytest.mark.parametrize("payload", [
+    {1: "int key", 2: {3: [4, 5]}},
+    {True: "a", False: "b", None: "c"},
+    {1.5: 0.1 + 0.2, -2.25: -0.01},
+    {"season": SEASON, "points": [0.0, 1.1, 12.36, -3.0, 7.04, 100.0]},
+    {"round": PlayoffRound.SUPER_BOWL, "bonus": BonusType.MVP},
+    {"when": datetime(2026, 9, 7, 13, 5, tzinfo=timezone.utc), "day": date(2026, 9, 7)},
+    {"name": "José Núñez", "quote": "\"\\\n\t", "emoji": "🏈"},
+    [],
+    {},
+    None,
+])
+def test_orjson_matches_stdlib_bytes(payload):
+    for body in orjson_bodies(payload):
+        assert body == stdlib_body(payload)
+
+@pytest.mark.parametrize("value", [1e-05, 1e16, 123456789.123, 2 ** 60])
+def test_orjson_matches_stdlib_values(value):
+    # Exponent spelling can differ (1e-05 vs 0.00001); the parsed value can't
+    for body in orjson_bodies({7: value}):
+        assert json.loads(body) == json.loads(stdlib_body({7: value}))
+
+@pytest.mark.parametrize("seed", range(3))
+def test_read_payloads_match_stdlib(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    response = client.post("/api/admin/weekly-stats/", json={
+        "qb_id": league["quarterbacks"][0], "season": SEASON, "week": 18, "passing_yards": 317, "passing_tds": 2
+    })
+    assert response.status_code == 200, response.text
+    db.expire_all()
+
+    payloads = [
+        StandingsService.get_league_standings(db, SEASON),
+        StandingsService.get_worst_qb(db, SEASON),
+        StandingsService.get_all_qbs(db, SEASON),
+        SnapshotService.build(db, SEASON),
+        # Keyed by int QB id
+        QuarterbackDetailService.get_details(db, QuarterbackDetailService.load_quarterbacks(db, league["quarterbacks"])),
+    ]
+    for payload in payloads:
+        for body in orjson_bodies(payload):
+            assert body == stdlib_body(payload)
@@ -0,0 +1,117 @@
+"""
+NFLDataCache against a local stand-in for the nflverse release server: a
+fresh file is used without a request, a stale one is revalidated with a
+conditional GET (304 keeps it, a new ETag replaces it), and offline mode
+reads purely from the cache.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.services.nfl_data import NFLDataCache
+import io
+import threading
+import polars as pl
+import pytest
+
+PATH = "/stats_player/stats_player_week_2026.parquet"
+
+def parquet_bytes(frame: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.write_parquet(buffer)
+    return buffer.getvalue()
+
+class Upstream:
+    """Serves one Parquet file with an ETag and answers If-None-Match."""
+
+    def __init__(self):
+        self.requests = []
+        self.set_file(pl.DataFrame({"week": [1, 2]}), '"v1"')
+
+    def set_file(self, frame: pl.DataFrame, etag: str):
+        self.body, self.etag = parquet_bytes(frame), etag
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    state = Upstream()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requests.append((self.path, self.headers.get("If-None-Match")))
+            if self.path != PATH:
+                self.send_response(404)
+                self.end_headers()
+            elif self.headers.get("If-None-Match") == state.etag:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("ETag", state.etag)
+                self.send_header("Content-Length", str(len(state.body)))
+                self.end_headers()
+                self.wfile.write(state.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("NFLVERSE_BASE_URL", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setenv("NFL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("NFL_CACHE_TTL_SECONDS", "900")
+    monkeypatch.delenv("NFL_OFFLINE", raising=False)
+    yield state
+    server.shutdown()
+    server.server_close()
+
+def weeks(path) -> list:
+    return pl.read_parquet(path)["week"].to_list()
+
+def test_fresh_file_needs_no_request(upstream):
+    path = NFLDataCache.path("player_stats_week", 2026)
+    assert weeks(path) == [1, 2]
+    assert upstream.requests == [(PATH, None)]
+
+    assert NFLDataCache.path("player_stats_week", 2026) == path
+    assert NFLDataCache.scan("player_stats_week", 2026).collect()["week"].to_list() == [1, 2]
+    assert len(upstream.requests) == 1
+
+def test_stale_file_is_revalidated(upstream, monkeypatch):
+    NFLDataCache.path("player_stats_week", 2026)
+    fetched_at = NFLDataCache.status()[0]["fetched_at"]
+    monkeypatch.setenv("NFL_CACHE_TTL_SECONDS", "0")
+
+    # Unchanged upstream: 304, the cached file is kept
+    path = NFLDataCache.path("player_stats_week", 2026)
+    assert upstream.requests[-1] == (PATH, '"v1"')
+    assert weeks(path) == [1, 2]
+    assert NFLDataCache.status()[0]["fetched_at"] == fetched_at
+
+    # Changed upstream: downloaded again
+    upstream.set_file(pl.DataFrame({"week": [1, 2, 3]}), '"v2"')
+    path = NFLDataCache.path("player_stats_week", 2026)
+    assert upstream.requests[-1] == (PATH, '"v1"')
+    assert weeks(path) == [1, 2, 3]
+    assert NFLDataCache.status()[0]["etag"] == '"v2"'
+
+def test_offline_mode_reads_only_the_cache(upstream, monkeypatch):
+    NFLDataCache.path("player_stats_week", 2026)
+    monkeypatch.setenv("NFL_OFFLINE", "1")
+    monkeypatch.setenv("NFL_CACHE_TTL_SECONDS", "0")
+
+    assert weeks(NFLDataCache.path("player_stats_week", 2026)) == [1, 2]
+    with pytest.raises(FileNotFoundError, match="NFL_OFFLINE"):
+        NFLDataCache.path("schedules")
+    assert len(upstream.requests) == 1
+
+def test_unreachable_upstream_falls_back_to_cache(upstream, monkeypatch):
+    NFLDataCache.path("player_stats_week", 2026)
+    monkeypatch.setenv("NFL_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("NFLVERSE_BASE_URL", "http://127.0.0.1:1/")
+
+    assert weeks(NFLDataCache.path("player_stats_week", 2026)) == [1, 2]
+    with pytest.raises(ConnectionError):
+        NFLDataCache.path("schedules")
+
+def test_unknown_dataset_is_rejected(upstream):
+    with pytest.raises(ValueError, match="Unknown NFL dataset"):
+        NFLDataCache.path("rosters", 2026)
@@ -0,0 +1,64 @@
+"""
+Batch and per-squad QB details: every entry equals the single-QB endpoint's
+response, unknown IDs are listed as missing, and bad ID lists are rejected.
+"""
+from app.services import qb_details
+from conftest import seed_league
+import pytest
+
+SEASON = 2026
+
+def add_stat_lines(client, qb_ids):
+    """Full stat lines through the admin endpoint (seed_league's rows carry points only)."""
+    for i, qb_id in enumerate(qb_ids):
+        response = client.post("/api/admin/weekly-stats/", json={
+            "qb_id": qb_id, "season": SEASON, "week": 18, "passing_yards": 200 + i * 25,
+            "rushing_yards": i * 5, "passing_tds": i % 4, "interceptions": i % 2,
+            "game_won": i % 2 == 0, "prime_time_win": i % 3 == 0,
+        })
+        assert response.status_code == 200, response.text
+
+def single(client, qb_id):
+    response = client.get(f"/api/quarterbacks/{qb_id}/")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+@pytest.mark.parametrize("seed", range(4))
+def test_batch_entries_equal_single_endpoint(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    qb_ids = league["quarterbacks"]
+    add_stat_lines(client, qb_ids[:6])
+
+    response = client.get("/api/quarterbacks/details/", params={"ids": ",".join(map(str, qb_ids + [9999]))})
+    assert response.status_code == 200, response.text
+    batch = response.json()
+
+    assert batch["missing"] == [9999]
+    assert batch["quarterbacks"] == {str(qb_id): single(client, qb_id) for qb_id in qb_ids}
+
+@pytest.mark.parametrize("seed", range(4))
+def test_squad_details_equal_single_endpoint(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    add_stat_lines(client, league["quarterbacks"][:6])
+
+    for squad_id in league["squads"]:
+        details = client.get(f"/api/squads/{squad_id}/details/").json()
+        roster = client.get(f"/api/squads/{squad_id}/roster/").json()["roster"]
+
+        assert sorted(details["quarterbacks"]) == sorted(str(qb["qb_id"]) for qb in roster)
+        for qb_id, entry in details["quarterbacks"].items():
+            assert entry == single(client, qb_id)
+
+def test_batch_revalidates_like_single_endpoint(client, db):
+    league = seed_league(db, 1, SEASON)
+    params = {"ids": ",".join(map(str, league["quarterbacks"][:3]))}
+    etag = client.get("/api/quarterbacks/details/", params=params).headers["etag"]
+
+    assert client.get("/api/quarterbacks/details/", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    add_stat_lines(client, league["quarterbacks"][:1])
+    assert client.get("/api/quarterbacks/details/", params=params, headers={"If-None-Match": etag}).status_code == 200
+
+@pytest.mark.parametrize("ids", ["", " , ", "1,x", ",".join(map(str, range(1, qb_details.MAX_DETAIL_IDS + 2)))])
+def test_bad_id_lists_are_rejected(client, db, ids):
+    assert client.get("/api/quarterbacks/details/", params={"ids": ids}).status_code == 400
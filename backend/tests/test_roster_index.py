@@ -0,0 +1,120 @@
+"""
+Name normalization and RosterIndex.match: nflverse rows find their rostered
+QB by player ID, then full name, then (for abbreviated names only) a
+first-initial + surname alias that is unique on the roster.
+"""
+from app.services.roster_index import RosterIndex, name_alias, normalize_name
+import polars as pl
+import pytest
+
+@pytest.mark.parametrize("name, expected", [
+    ("C.J. Stroud", "cjstroud"),
+    ("CJ Stroud", "cjstroud"),
+    ("cj stroud", "cjstroud"),
+    ("Michael Penix Jr.", "michaelpenix"),
+    ("Michael Penix Jr", "michaelpenix"),
+    ("Robert Griffin III", "robertgriffin"),
+    ("Gardner Minshew II", "gardnerminshew"),
+    ("Aidan O'Connell", "aidanoconnell"),
+    ("José Núñez", "josenunez"),
+    ("Jaxson  Dart", "jaxsondart"),
+    # A lone suffix is the whole name, not a suffix
+    ("Jr.", "jr"),
+    ("", None),
+    ("...", None),
+    (None, None),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+@pytest.mark.parametrize("name, expected", [
+    ("C.J. Stroud", "cstroud"),
+    ("CJ Stroud", "cstroud"),
+    ("C.Stroud", "cstroud"),
+    ("Aa.Rodgers", "arodgers"),
+    ("Michael Penix Jr.", "mpenix"),
+    ("M.Penix Jr.", "mpenix"),
+    ("Robert Griffin III", "rgriffin"),
+    ("Stroud", None),
+    ("", None),
+    (None, None),
+])
+def test_name_alias(name, expected):
+    assert name_alias(name) == expected
+
+ROSTER = [
+    (1, "C.J. Stroud", None),
+    (2, "Michael Penix Jr.", "00-0039917"),
+    (3, "Robert Griffin III", None),
+    # Same alias ("jallen"): abbreviated rows can't tell them apart
+    (4, "Josh Allen", None),
+    (5, "Jordan Allen", None),
+    (6, "Patrick Mahomes II", "00-0033873"),
+]
+
+@pytest.mark.parametrize("player_id, full_name, abbreviated, expected_qb, expected_by", [
+    ("00-0039917", None, None, 2, "id"),
+    # The ID wins over a name that points at someone else
+    ("00-0033873", "C.J. Stroud", None, 6, "id"),
+    # An unknown ID falls back to the name
+    ("00-9999999", "CJ Stroud", None, 1, "name"),
+    (None, "Michael Penix", None, 2, "name"),
+    (None, "Robert Griffin", None, 3, "name"),
+    (None, "Patrick Mahomes", None, 6, "name"),
+    (None, None, "C.Stroud", 1, "alias"),
+    (None, None, "R.Griffin III", 3, "alias"),
+    # Ambiguous alias: no match rather than a guess
+    (None, None, "J.Allen", None, None),
+    # Aliases are only for rows without a full name
+    (None, "Jalen Allen", "J.Allen", None, None),
+    (None, "Joe Burrow", None, None, None),
+    (None, None, None, None, None),
+])
+def test_match(player_id, full_name, abbreviated, expected_qb, expected_by):
+    index = RosterIndex(2026, ROSTER)
+    frame = pl.DataFrame(
+        {"player_id": [player_id], "player_display_name": [full_name], "player_name": [abbreviated]},
+        schema={"player_id": pl.Utf8, "player_display_name": pl.Utf8, "player_name": pl.Utf8}
+    )
+
+    matched = index.match(frame, "player_id", ["player_display_name"], abbreviated_column="player_name")
+
+    assert matched.select("qb_id", "matched_by").row(0) == (expected_qb, expected_by)
+    assert matched.columns == ["player_id", "player_display_name", "player_name", "qb_id", "matched_by"]
+
+def test_match_keeps_row_order_and_count():
+    index = RosterIndex(2026, ROSTER)
+    names = ["Joe Burrow", "CJ Stroud", "Josh Allen", "CJ Stroud", None, "Jordan Allen"]
+    frame = pl.DataFrame({"name": names}, schema={"name": pl.Utf8})
+
+    matched = index.match(frame, None, ["name"])
+
+    assert matched["name"].to_list() == names
+    assert matched["qb_id"].to_list() == [None, 1, 4, 1, None, 5]
+
+def test_duplicate_names_and_ids_match_nobody():
+    index = RosterIndex(2026, [(1, "Josh Allen", "00-1"), (2, "Josh Allen Jr.", "00-1"), (3, "Tom Brady", None)])
+    frame = pl.DataFrame({"player_id": ["00-1", None], "name": ["Josh Allen", "Tom Brady"]})
+
+    assert index.match(frame, "player_id", ["name"])["qb_id"].to_list() == [None, 3]
+
+def test_learn_ids_from_name_matches():
+    index = RosterIndex(2026, ROSTER)
+    frame = pl.DataFrame({
+        "player_id": ["00-0000001", "00-0039917", "00-0000004", "00-0000005"],
+        "player_display_name": ["CJ Stroud", "Michael Penix", "Josh Allen", "Josh Allen"],
+    })
+    matched = index.match(frame, "player_id", ["player_display_name"])
+
+    # Stroud is learned; Penix already has his ID; Allen's name maps to two IDs
+    assert index.learn_ids(matched) == [{"qb_id": 1, "gsis_id": "00-0000001"}]
+    assert index.learned == [{"qb_id": 1, "gsis_id": "00-0000001"}]
+
+    again = pl.DataFrame({"player_id": ["00-0000001"], "player_display_name": [None]}, schema={
+        "player_id": pl.Utf8, "player_display_name": pl.Utf8
+    })
+    assert index.match(again, "player_id", ["player_display_name"])["matched_by"].to_list() == ["id"]
+
+def test_unmatched_roster():
+    index = RosterIndex(2026, ROSTER)
+    assert index.unmatched_roster([1, 2, 3, 6]) == ["Jordan Allen", "Josh Allen"]
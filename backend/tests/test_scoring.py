@@ -0,0 +1,96 @@
+"""
+ScoringEngine.calculate_batch must score every stat line exactly like the
+row-by-row calculate_weekly_points, for any valid rule set.
+
+Stat lines and rule sets are drawn from seeded random generators, so a
+failure always reproduces; the seed is in the test id.
+"""
+from app.models.models import WeeklyStat
+from app.services.scoring import DEFAULT_SCORING_RULES, WEEKLY_SCORING_COLUMNS, ScoringEngine
+from typing import Dict, List, Optional
+import random
+import polars as pl
+import pytest
+
+SEEDS = range(25)
+RULE_SETS_PER_SEED = 8
+ROWS_PER_RULE_SET = 60
+
+# Yards-per-point values must divide 100
+YARDS_PER_POINT = [1, 2, 4, 5, 10, 20, 25, 50, 100]
+
+STAT_RANGES = {
+    'passing_yards': (-30, 650),
+    'rushing_yards': (-40, 250),
+    'passing_tds': (0, 7),
+    'rushing_tds': (0, 4),
+    'receiving_tds': (0, 2),
+    'interceptions': (0, 6),
+    'fumbles': (0, 5),
+}
+
+def random_points(rng: random.Random, low: int, high: int) -> float:
+    """A rule value in whole hundredths of a point."""
+    return rng.randint(low * 100, high * 100) / 100
+
+def random_rules(rng: random.Random) -> Dict:
+    rules = {
+        "passing_yards_per_point": rng.choice(YARDS_PER_POINT),
+        "rushing_yards_per_point": rng.choice(YARDS_PER_POINT),
+        "touchdown": random_points(rng, 0, 12),
+        "interception": random_points(rng, -6, 0),
+        "fumble": random_points(rng, -6, 0),
+        "win": random_points(rng, 0, 6),
+        "prime_time_win": random_points(rng, 0, 8),
+    }
+    # Whole-number rules, like the league defaults, half the time
+    if rng.random() < 0.5:
+        rules.update({key: round(value) for key, value in rules.items() if key.endswith(("touchdown", "win"))})
+    return ScoringEngine.validate_rules(rules)
+
+def random_stat_line(rng: random.Random) -> Dict:
+    row = {column: rng.randint(low, high) for column, (low, high) in STAT_RANGES.items()}
+    row['game_won'] = rng.random() < 0.5
+    row['prime_time_win'] = row['game_won'] and rng.random() < 0.3
+    # NULLs count as 0 / False in both paths
+    for column in WEEKLY_SCORING_COLUMNS:
+        if rng.random() < 0.05:
+            row[column] = None
+    return row
+
+def scalar_points(rows: List[Dict], rules: Optional[Dict]) -> List[float]:
+    return [ScoringEngine.calculate_weekly_points(WeeklyStat(**row), rules) for row in rows]
+
+def hundredths(values) -> List[int]:
+    return [int(round(value * 100)) for value in values]
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batch_matches_row_by_row(seed):
+    rng = random.Random(seed)
+    for _ in range(RULE_SETS_PER_SEED):
+        rules = random_rules(rng)
+        rows = [random_stat_line(rng) for _ in range(ROWS_PER_RULE_SET)]
+        frame = pl.DataFrame(rows, schema={
+            column: pl.Boolean if isinstance(default, bool) else pl.Int64
+            for column, default in WEEKLY_SCORING_COLUMNS.items()
+        })
+
+        batch = ScoringEngine.calculate_batch(frame, rules).to_list()
+
+        assert hundredths(batch) == hundredths(scalar_points(rows, rules)), rules
+
+def test_batch_default_rules_and_missing_columns():
+    rng = random.Random(1000)
+    rows = [random_stat_line(rng) for _ in range(200)]
+    # A mapping without receiving_tds: the missing column counts as 0
+    columns = {
+        column: [row[column] for row in rows]
+        for column in WEEKLY_SCORING_COLUMNS if column != 'receiving_tds'
+    }
+    expected = scalar_points([{**row, 'receiving_tds': 0} for row in rows], None)
+
+    assert hundredths(ScoringEngine.calculate_batch(columns).to_list()) == hundredths(expected)
+    assert hundredths(ScoringEngine.calculate_batch(columns, DEFAULT_SCORING_RULES).to_list()) == hundredths(expected)
+
+def test_batch_empty_frame():
+    assert ScoringEngine.calculate_batch(pl.DataFrame({'passing_yards': []}, schema={'passing_yards': pl.Int64})).len() == 0
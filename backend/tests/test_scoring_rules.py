@@ -0,0 +1,137 @@
+"""
+Rescoring a season under a new rule set: every stored points value ends up
+equal to the row-by-row scoring functions under the new rules, the
+materialized totals match a rebuild, and a dry run leaves everything as it
+was.
+"""
+from app.models.models import WeeklyStat, SeasonBonus, PlayoffAppearance, QBSeasonTotal, SquadSeasonTotal
+from app.services.cache import SeasonVersionService
+from app.services.scoring import ScoringEngine
+from app.services.totals import TotalsService
+from conftest import seed_league
+from typing import Dict, Tuple
+import random
+import pytest
+
+SEASON = 2026
+
+NEW_RULES = {
+    "passing_yards_per_point": 20,
+    "touchdown": 4,
+    "interception": -2.5,
+    "win": 2.25,
+    "bonuses": {"CONF_POW": 12.5},
+    "playoffs": {"WILD_CARD": 4.0},
+    "super_bowl_win": 30.0,
+}
+
+def add_stat_lines(client, qb_ids, seed: int) -> None:
+    """Real stat lines through the admin endpoint (seed_league's rows carry points only)."""
+    rng = random.Random(seed)
+    for qb_id in rng.sample(qb_ids, min(6, len(qb_ids))):
+        for week in range(1, rng.randint(2, 4)):
+            won = rng.random() < 0.5
+            response = client.post("/api/admin/weekly-stats/", json={
+                "qb_id": qb_id, "season": SEASON, "week": week,
+                "passing_yards": rng.randint(0, 400), "rushing_yards": rng.randint(-10, 60),
+                "passing_tds": rng.randint(0, 4), "interceptions": rng.randint(0, 3),
+                "fumbles": rng.randint(0, 2), "game_won": won, "prime_time_win": won and rng.random() < 0.3,
+            })
+            assert response.status_code == 200, response.text
+
+def stored_points(db) -> Dict[Tuple[str, int], float]:
+    db.expire_all()
+    points = {}
+    for model in (WeeklyStat, SeasonBonus, PlayoffAppearance):
+        for row in db.query(model).filter(model.season == SEASON):
+            points[(model.__tablename__, row.id)] = row.points
+    return points
+
+def expected_points(db, rules: Dict) -> Dict[Tuple[str, int], float]:
+    db.expire_all()
+    points = {}
+    for row in db.query(WeeklyStat).filter(WeeklyStat.season == SEASON):
+        points[("weekly_stats", row.id)] = ScoringEngine.calculate_weekly_points(row, rules)
+    for row in db.query(SeasonBonus).filter(SeasonBonus.season == SEASON):
+        points[("season_bonuses", row.id)] = ScoringEngine.get_bonus_points(row.bonus_type, rules)
+    for row in db.query(PlayoffAppearance).filter(PlayoffAppearance.season == SEASON):
+        points[("playoff_appearances", row.id)] = ScoringEngine.get_playoff_points(row.round, row.won_super_bowl, rules)
+    return points
+
+def hundredths(points: Dict) -> Dict:
+    return {key: int(round(value * 100)) for key, value in points.items()}
+
+def totals(db) -> Dict:
+    db.expire_all()
+    return {
+        "qbs": sorted((t.qb_id, t.total_points, t.squad_rank) for t in db.query(QBSeasonTotal)),
+        "squads": sorted((t.squad_id, t.total_points, t.rank) for t in db.query(SquadSeasonTotal)),
+    }
+
+@pytest.mark.parametrize("seed", range(4))
+def test_rule_change_rescores_rows_and_totals(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    add_stat_lines(client, league["quarterbacks"], seed)
+    before = stored_points(db)
+    standings_before = client.get("/api/standings/", params={"season": SEASON}).json()
+
+    response = client.put("/api/admin/scoring-rules/", params={"season": SEASON}, json={"rules": NEW_RULES})
+    assert response.status_code == 200, response.text
+    report = response.json()
+
+    expected = expected_points(db, report["rules"])
+    assert hundredths(stored_points(db)) == hundredths(expected)
+    changed = {key for key in expected if round(expected[key], 2) != round(before[key], 2)}
+    assert sum(report["rows_changed"].values()) == len(changed)
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+    qb_totals = {qb_id: points for qb_id, points, _ in totals(db)["qbs"]}
+    for delta in report["qb_deltas"]:
+        assert delta["after"] == qb_totals[delta["qb_id"]]
+        assert delta["delta"] == round(delta["after"] - delta["before"], 2)
+
+    standings_after = client.get("/api/standings/", params={"season": SEASON}).json()
+    if changed:
+        assert standings_after != standings_before
+    assert client.get("/api/admin/scoring-rules/", params={"season": SEASON}).json()["custom"] is True
+
+def test_rescore_dry_run_changes_nothing(client, db):
+    league = seed_league(db, 3, SEASON)
+    add_stat_lines(client, league["quarterbacks"], 3)
+    response = client.put(
+        "/api/admin/scoring-rules/", params={"season": SEASON, "rescore": False}, json={"rules": NEW_RULES}
+    )
+    assert response.status_code == 200, response.text
+
+    points, state = stored_points(db), totals(db)
+    version = SeasonVersionService.get_version(db, SEASON)
+    standings = client.get("/api/standings/", params={"season": SEASON}).json()
+
+    report = client.post("/api/admin/rescore/", params={"season": SEASON, "dry_run": True}).json()
+
+    assert report["dry_run"] is True
+    assert sum(report["rows_changed"].values()) > 0
+    assert report["qb_deltas"]
+    assert stored_points(db) == points
+    assert totals(db) == state
+    assert SeasonVersionService.get_version(db, SEASON) == version
+    assert client.get("/api/standings/", params={"season": SEASON}).json() == standings
+
+    # The real run then applies what the dry run reported
+    applied = client.post("/api/admin/rescore/", params={"season": SEASON}).json()
+    assert (applied["rows_changed"], applied["qb_deltas"]) == (report["rows_changed"], report["qb_deltas"])
+    assert hundredths(stored_points(db)) == hundredths(expected_points(db, applied["rules"]))
+
+def test_invalid_rules_are_rejected(client, db):
+    response = client.put("/api/admin/scoring-rules/", json={"rules": {"passing_yards_per_point": 30}})
+    assert response.status_code == 400
+    assert client.get("/api/admin/scoring-rules/").json()["custom"] is False
+
+def test_cors_preflight_allows_put(client):
+    response = client.options("/api/admin/scoring-rules/", headers={
+        "Origin": "http://localhost:5173",
+        "Access-Control-Request-Method": "PUT",
+        "Access-Control-Request-Headers": "Content-Type",
+    })
+    assert response.status_code == 200
+    assert "PUT" in response.headers["access-control-allow-methods"]
@@ -0,0 +1,41 @@
+"""
+Every section of the season snapshot equals the single endpoint it
+replaces, including after writes move QBs past each other.
+"""
+from conftest import seed_league
+import pytest
+
+SEASON = 2026
+
+def assert_sections_match(client, squad_ids):
+    snapshot = client.get(f"/api/seasons/{SEASON}/snapshot").json()
+    params = {"season": SEASON}
+
+    assert snapshot["season"] == SEASON
+    assert snapshot["standings"] == client.get("/api/standings/", params=params).json()["standings"]
+    assert snapshot["worst_qb"] == client.get("/api/standings/worst-qb/", params=params).json()["worst_qb"]
+    assert snapshot["squads"] == client.get("/api/squads/", params=params).json()["squads"]
+    assert snapshot["quarterbacks"] == client.get("/api/quarterbacks/", params=params).json()["quarterbacks"]
+    assert snapshot["rosters"] == [client.get(f"/api/squads/{squad_id}/roster/").json() for squad_id in squad_ids]
+
+@pytest.mark.parametrize("seed", range(8))
+def test_snapshot_sections_match_endpoints(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    assert_sections_match(client, league["squads"])
+
+    for qb_id in league["quarterbacks"][:3]:
+        response = client.post("/api/admin/weekly-stats/", json={
+            "qb_id": qb_id, "season": SEASON, "week": 17, "passing_yards": 300, "passing_tds": 3
+        })
+        assert response.status_code == 200, response.text
+    assert_sections_match(client, league["squads"])
+
+def test_snapshot_of_empty_season(client, db):
+    assert client.get(f"/api/seasons/{SEASON}/snapshot").json() == {
+        "season": SEASON,
+        "standings": [],
+        "worst_qb": None,
+        "squads": [],
+        "rosters": [],
+        "quarterbacks": []
+    }
@@ -0,0 +1,99 @@
+"""
+The set-based standings (UNION ALL + ROW_NUMBER, and the materialized
+totals built from it) must rank exactly like the original Python code:
+per-QB float sums rounded to 2 places, a stable sort by points (ties keep
+QB / squad id order), top 5 per squad.
+
+Leagues come from seeded random generators (see conftest.seed_league).
+"""
+from app.models.models import Squad, Quarterback
+from app.services.standings import StandingsService
+from conftest import seed_league
+from typing import Dict, List
+import pytest
+
+SEASON = 2026
+
+def reference_top_qbs(squad: Squad) -> List[Dict]:
+    """The original per-squad ranking, over QBs in id order."""
+    qbs = [
+        {
+            "qb_id": qb.id,
+            "name": qb.name,
+            "nfl_team": qb.nfl_team,
+            "total_points": StandingsService.get_qb_total_points(qb),
+        }
+        for qb in sorted(squad.quarterbacks, key=lambda qb: qb.id)
+    ]
+    qbs.sort(key=lambda x: x["total_points"], reverse=True)
+    return qbs
+
+def reference_standings(db) -> List[Dict]:
+    standings = []
+    for squad in db.query(Squad).filter(Squad.season == SEASON).order_by(Squad.id):
+        top_qbs = reference_top_qbs(squad)[:5]
+        standings.append({
+            "squad_id": squad.id,
+            "squad_name": squad.name,
+            "owner": squad.owner,
+            "total_points": round(sum(qb["total_points"] for qb in top_qbs), 2),
+            "top_qbs": top_qbs,
+        })
+    standings.sort(key=lambda x: x["total_points"], reverse=True)
+    for i, standing in enumerate(standings):
+        standing["rank"] = i + 1
+        standing["projected_payout"] = StandingsService.get_projected_payout(i + 1, SEASON)
+    return standings
+
+def reference_worst_qb(db):
+    worst = None
+    for qb in db.query(Quarterback).filter(Quarterback.season == SEASON).order_by(Quarterback.id):
+        points = StandingsService.get_qb_total_points(qb)
+        if 0 < points < (worst["total_points"] if worst else float("inf")):
+            worst = {
+                "qb_id": qb.id,
+                "name": qb.name,
+                "nfl_team": qb.nfl_team,
+                "squad_name": qb.squad.name if qb.squad else "Free Agent",
+                "total_points": points,
+            }
+    return worst
+
+@pytest.mark.parametrize("seed", range(15))
+def test_standings_match_python_ranking(db, seed):
+    seed_league(db, seed, SEASON)
+    expected = reference_standings(db)
+
+    assert StandingsService.get_league_standings(db, SEASON) == expected
+
+    computed = {squad["id"]: squad for squad in StandingsService.compute_squad_totals(db, SEASON)}
+    for standing in expected:
+        squad = computed[standing["squad_id"]]
+        assert (squad["total_points"], squad["rank"]) == (standing["total_points"], standing["rank"])
+
+    assert StandingsService.get_worst_qb(db, SEASON) == reference_worst_qb(db)
+
+@pytest.mark.parametrize("seed", range(15))
+def test_qb_totals_and_squad_ranks_match(db, seed):
+    seed_league(db, seed, SEASON)
+    ranks = {}
+    for squad in db.query(Squad).filter(Squad.season == SEASON):
+        for rank, qb in enumerate(reference_top_qbs(squad), start=1):
+            ranks[qb["qb_id"]] = rank
+
+    for qbs in (StandingsService.compute_ranked_qbs(db, SEASON), StandingsService.get_ranked_qbs(db, SEASON)):
+        for qb in qbs:
+            assert qb["total_points"] == StandingsService.get_qb_total_points(db.get(Quarterback, qb["qb_id"]))
+            if qb["squad_id"] is not None:
+                assert qb["squad_rank"] == ranks[qb["qb_id"]]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_roster_endpoint_matches_python_ranking(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    for squad_id in league["squads"]:
+        expected = reference_top_qbs(db.get(Squad, squad_id))
+        for i, qb in enumerate(expected):
+            qb["is_top_5"] = i < 5
+            qb["rank"] = i + 1
+
+        assert client.get(f"/api/squads/{squad_id}/roster/").json()["roster"] == expected
@@ -0,0 +1,91 @@
+"""
+The per-season payload cache: a committed write bumps the season version so
+the next read misses and recomputes, a rolled-back write leaves the version
+and the cached payloads alone, and seasons are evicted least recently used.
+"""
+from app.database.config import SessionLocal
+from app.models.models import WeeklyStat
+from app.services.cache import SeasonVersionService, StandingsCache, standings_cache
+from conftest import seed_league
+import pytest
+
+SEASON = 2026
+
+def counts():
+    stats = standings_cache.stats()
+    return stats["hits"], stats["misses"]
+
+def standings(client):
+    response = client.get("/api/standings/", params={"season": SEASON})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+@pytest.fixture
+def league(db):
+    return seed_league(db, 5, SEASON)
+
+def test_repeat_reads_hit(client, league):
+    first = standings(client)
+    hits, misses = counts()
+
+    assert standings(client) == first
+    assert counts() == (hits + 1, misses)
+
+def test_admin_write_bumps_version_and_next_read_misses(client, db, league):
+    before = standings(client)
+    version = SeasonVersionService.get_version(db, SEASON)
+    hits, misses = counts()
+
+    response = client.post("/api/admin/weekly-stats/", json={
+        "qb_id": league["quarterbacks"][0], "season": SEASON, "week": 18, "passing_yards": 400, "passing_tds": 4
+    })
+    assert response.status_code == 200, response.text
+
+    db.expire_all()
+    assert SeasonVersionService.get_version(db, SEASON) == version + 1
+    after = standings(client)
+    assert counts() == (hits, misses + 1)
+    assert after != before
+    assert standings_cache.stats()["seasons"][SEASON]["version"] == version + 1
+
+def test_write_from_another_session_invalidates(client, db, league):
+    standings(client)
+    hits, misses = counts()
+
+    other = SessionLocal()
+    try:
+        SeasonVersionService.bump(other, [SEASON])
+        other.commit()
+    finally:
+        other.close()
+
+    standings(client)
+    assert counts() == (hits, misses + 1)
+    standings(client)
+    assert counts() == (hits + 1, misses + 1)
+
+def test_rollback_leaves_version_and_cache_alone(client, db, league):
+    before = standings(client)
+    version = SeasonVersionService.get_version(db, SEASON)
+    hits, misses = counts()
+
+    db.add(WeeklyStat(qb_id=league["quarterbacks"][0], season=SEASON, week=18, points=99.0))
+    SeasonVersionService.bump(db, [SEASON])
+    db.flush()
+    db.rollback()
+
+    assert SeasonVersionService.get_version(db, SEASON) == version
+    assert standings(client) == before
+    assert counts() == (hits + 1, misses)
+
+def test_seasons_are_evicted_least_recently_used(db):
+    cache = StandingsCache(max_seasons=2)
+    for season in (2024, 2025):
+        cache.get_or_compute(db, season, "standings", lambda: season)
+    # Touch 2024 so 2025 is the least recently used
+    cache.get_or_compute(db, 2024, "standings", lambda: None)
+    cache.get_or_compute(db, 2026, "standings", lambda: 2026)
+
+    stats = cache.stats()
+    assert sorted(stats["seasons"]) == [2024, 2026]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
@@ -0,0 +1,140 @@
+"""
+Dry-run sync change sets: planning writes nothing, applying writes exactly
+the planned rows once, and a change set planned before another write to
+the season is refused with StaleChangeSetError.
+
+NFL data comes from small in-memory frames shaped like the nflverse fetches.
+"""
+from app.models.models import Squad, Quarterback, WeeklyStat, PlayoffAppearance, SyncJob, SyncWatermark
+from app.services.cache import SeasonVersionService
+from app.services.errors import StaleChangeSetError
+from app.services.jobs import job_runner
+from app.services.nfl_stats import NFLStatsService
+from app.services.totals import TotalsService
+from conftest import games_frame, weekly_frame
+from datetime import datetime, timezone
+from typing import List
+import pytest
+
+SEASON = 2026
+
+ROSTER = {"Team A": ["Josh Allen", "C.J. Stroud"], "Team B": ["Jalen Hurts", "Bo Nix"]}
+
+def add_roster(db) -> dict:
+    """Create ROSTER's squads and QBs; returns QB id by name."""
+    qb_ids = {}
+    for squad_name, names in ROSTER.items():
+        squad = Squad(name=squad_name, owner=squad_name, season=SEASON)
+        db.add(squad)
+        db.flush()
+        for name in names:
+            qb = Quarterback(name=name, nfl_team="NFL", squad_id=squad.id, season=SEASON)
+            db.add(qb)
+            db.flush()
+            qb_ids[name] = qb.id
+    db.commit()
+    return qb_ids
+
+def season_state(db) -> dict:
+    db.expire_all()
+    return {
+        "version": SeasonVersionService.get_version(db, SEASON),
+        "weekly_stats": sorted(
+            (row.qb_id, row.week, row.passing_yards, row.game_won, row.points) for row in db.query(WeeklyStat)
+        ),
+        "playoff_appearances": sorted(
+            (row.qb_id, row.round.value, row.points) for row in db.query(PlayoffAppearance)
+        ),
+        "watermarks": sorted((row.source, row.last_week) for row in db.query(SyncWatermark)),
+        "gsis_ids": sorted(str(qb.gsis_id) for qb in db.query(Quarterback)),
+    }
+
+def dry_run_jobs(db) -> List[SyncJob]:
+    """Plan weekly stats, wins and playoffs as dry runs, stored as one succeeded job each."""
+    results = [
+        NFLStatsService.sync_qb_weekly_stats(
+            db, SEASON, weekly_data=weekly_frame([("Josh Allen", 1, 250, 2), ("CJ Stroud", 1, 300, 3)]),
+            last_completed_week=1, dry_run=True
+        ),
+        NFLStatsService.sync_qb_wins(
+            db, SEASON, completed_games=games_frame([("REG", 1, "Jalen Hurts", "Bo Nix", "Bo Nix", True)]),
+            last_completed_week=1, dry_run=True
+        ),
+        NFLStatsService.sync_playoff_appearances(
+            db, SEASON, completed_games=games_frame([("WC", 19, "Josh Allen", "Jalen Hurts", "Jalen Hurts", False)]),
+            dry_run=True
+        ),
+    ]
+    jobs = [
+        SyncJob(kind=kind, season=SEASON, status="succeeded", dry_run=True,
+                created_at=datetime.now(timezone.utc), result=result)
+        for kind, result in zip(("weekly", "wins", "playoffs"), results)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    return jobs
+
+def test_dry_run_writes_nothing(db):
+    add_roster(db)
+    before = season_state(db)
+
+    jobs = dry_run_jobs(db)
+
+    assert season_state(db) == before
+    change_sets = [job.result["change_set"] for job in jobs]
+    assert [len(changes["weekly_stats"]["insert"]) for changes in change_sets] == [2, 1, 0]
+    assert [len(changes["playoff_appearances"]["insert"]) for changes in change_sets] == [0, 0, 2]
+    assert change_sets[0]["watermarks"] == {"weekly_stats": 1}
+    assert all(changes["base_version"] == before["version"] for changes in change_sets)
+
+def test_apply_writes_the_planned_rows_once(client, db):
+    qb_ids = add_roster(db)
+    weekly_job, _, _ = dry_run_jobs(db)
+    changes = weekly_job.result["change_set"]
+
+    response = client.post(f"/api/admin/jobs/{weekly_job.id}/apply")
+    assert response.status_code == 200, response.text
+    assert response.json()["changes"]["weekly_stats"] == {"insert": 2, "update": 0, "delete": 0}
+
+    state = season_state(db)
+    assert state["version"] == changes["base_version"] + 1
+    assert [(qb_id, week, yards) for qb_id, week, yards, _, _ in state["weekly_stats"]] == sorted([
+        (qb_ids["Josh Allen"], 1, 250), (qb_ids["C.J. Stroud"], 1, 300)
+    ])
+    assert state["watermarks"] == [("weekly_stats", 1)]
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+    # Applying it again is refused and writes nothing
+    response = client.post(f"/api/admin/jobs/{weekly_job.id}/apply")
+    assert response.status_code == 409
+    assert "already applied" in response.json()["detail"]
+    assert season_state(db) == state
+
+def test_apply_after_another_write_is_stale(client, db):
+    add_roster(db)
+    weekly_job, wins_job, playoffs_job = dry_run_jobs(db)
+
+    assert client.post(f"/api/admin/jobs/{weekly_job.id}/apply").status_code == 200
+    state = season_state(db)
+
+    # Planned against the version before the weekly apply
+    with pytest.raises(StaleChangeSetError, match="run the dry run again"):
+        job_runner.apply(db, wins_job.id)
+    assert season_state(db) == state
+    db.expire_all()
+    assert db.get(SyncJob, wins_job.id).applied_at is None
+
+    response = client.post(f"/api/admin/jobs/{playoffs_job.id}/apply")
+    assert response.status_code == 409
+    assert season_state(db) == state
+
+def test_apply_rejects_jobs_that_are_not_reviewable_dry_runs(client, db):
+    now = datetime.now(timezone.utc)
+    live = SyncJob(kind="all", season=SEASON, status="succeeded", dry_run=False, created_at=now, result={})
+    failed = SyncJob(kind="all", season=SEASON, status="failed", dry_run=True, created_at=now)
+    db.add_all([live, failed])
+    db.commit()
+
+    assert client.post(f"/api/admin/jobs/{live.id}/apply").status_code == 400
+    assert client.post(f"/api/admin/jobs/{failed.id}/apply").status_code == 400
+    assert client.post("/api/admin/jobs/9999/apply").status_code == 404
@@ -0,0 +1,199 @@
+"""
+Sync planning from small in-memory frames: plan_weekly and plan_playoffs
+mark each row insert / update / delete / unchanged against the stored rows,
+the incremental syncs skip weeks at or below their watermark, and the
+nflverse fetches project and filter in the Polars scan.
+"""
+from app.models.models import Squad, Quarterback, WeeklyStat, PlayoffAppearance, PlayoffRound
+from app.services import nfl_stats
+from app.services.nfl_stats import NFLStatsService
+from app.services.scoring import ScoringEngine
+from app.services.sync_changes import WEEKLY_STAT_COLUMNS, SyncChangeService
+from conftest import games_frame, weekly_frame
+import polars as pl
+import pytest
+
+SEASON = 2026
+
+NAMES = ["Josh Allen", "Jalen Hurts", "Bo Nix", "Geno Smith"]
+
+@pytest.fixture
+def qbs(db):
+    squad = Squad(name="Team A", owner="A", season=SEASON)
+    db.add(squad)
+    db.flush()
+    rows = [Quarterback(name=name, nfl_team="NFL", squad_id=squad.id, season=SEASON) for name in NAMES]
+    db.add_all(rows)
+    db.commit()
+    return [qb.id for qb in rows]
+
+def add_line(db, qb_id, week, **stats):
+    stat = WeeklyStat(qb_id=qb_id, season=SEASON, week=week, **stats)
+    stat.points = ScoringEngine.calculate_weekly_points(stat)
+    db.add(stat)
+    db.commit()
+    return stat
+
+def stat_frame(rows):
+    """plan_weekly stats from (qb_id, week, passing yards, passing TDs)."""
+    return pl.DataFrame(
+        [
+            {"qb_id": qb_id, "week": week, **dict.fromkeys(WEEKLY_STAT_COLUMNS, 0),
+             "passing_yards": yards, "passing_tds": tds}
+            for qb_id, week, yards, tds in rows
+        ],
+        schema={"qb_id": pl.Int64, "week": pl.Int64, **dict.fromkeys(WEEKLY_STAT_COLUMNS, pl.Int64)}
+    )
+
+def by_key(plan: pl.DataFrame, keys):
+    return {tuple(row[key] for key in keys): row for row in plan.iter_rows(named=True)}
+
+def test_plan_weekly_actions(db, qbs):
+    allen, hurts, nix, smith = qbs
+    add_line(db, allen, 1, passing_yards=250, passing_tds=2)
+    add_line(db, hurts, 1, passing_yards=100)
+    add_line(db, hurts, 0, passing_yards=3000, passing_tds=20)
+    add_line(db, nix, 1, game_won=True)
+    add_line(db, smith, 1, game_won=True, prime_time_win=True)
+
+    plan = SyncChangeService.plan_weekly(
+        db, SEASON,
+        stats=stat_frame([(allen, 1, 250, 2), (hurts, 1, 150, 0), (allen, 2, 300, 1)]),
+        clear_aggregate=True,
+        wins={
+            "won": pl.DataFrame({"qb_id": [hurts], "week": [1], "prime_time_win": [False]}),
+            # Nix started and lost; Smith isn't a matched starter, so keeps his win
+            "started": pl.DataFrame({"qb_id": [hurts, nix], "week": [1, 1]}),
+        }
+    )
+    rows = by_key(plan, ["qb_id", "week"])
+
+    assert {key: row["action"] for key, row in rows.items()} == {
+        (allen, 1): None,
+        (hurts, 1): "update",
+        (hurts, 0): "delete",
+        (nix, 1): "delete",
+        (smith, 1): None,
+        (allen, 2): "insert",
+    }
+    assert (rows[(hurts, 1)]["passing_yards"], rows[(hurts, 1)]["game_won"]) == (150, True)
+    assert rows[(nix, 1)]["had_win"] and not rows[(nix, 1)]["game_won"]
+    assert rows[(smith, 1)]["prime_time_win"]
+    for row in rows.values():
+        line = WeeklyStat(**{column: row[column] for column in [*WEEKLY_STAT_COLUMNS, "game_won", "prime_time_win"]})
+        assert row["points"] == ScoringEngine.calculate_weekly_points(line)
+
+def test_plan_weekly_unchanged_data_plans_nothing(db, qbs):
+    allen = qbs[0]
+    add_line(db, allen, 3, passing_yards=275, passing_tds=3, game_won=True)
+
+    plan = SyncChangeService.plan_weekly(db, SEASON, stats=stat_frame([(allen, 3, 275, 3)]))
+
+    assert plan["action"].to_list() == [None]
+    assert SyncChangeService.build(db, SEASON, weekly=plan)["weekly_stats"] == {"insert": [], "update": [], "delete": []}
+
+def test_plan_playoffs_actions(db, qbs):
+    allen, hurts, nix, smith = qbs
+    db.add_all([
+        PlayoffAppearance(qb_id=allen, season=SEASON, round=PlayoffRound.WILD_CARD, points=3.0),
+        PlayoffAppearance(qb_id=hurts, season=SEASON, round=PlayoffRound.SUPER_BOWL, points=15.0),
+        # Manual entry the results don't cover
+        PlayoffAppearance(qb_id=nix, season=SEASON, round=PlayoffRound.DIVISIONAL, points=6.0),
+    ])
+    db.commit()
+    super_bowl_win = ScoringEngine.get_playoff_points(PlayoffRound.SUPER_BOWL, True)
+
+    plan = SyncChangeService.plan_playoffs(db, SEASON, pl.DataFrame({
+        "qb_id": [allen, hurts, smith],
+        "round": ["WILD_CARD", "SUPER_BOWL", "CONF_CHAMPIONSHIP"],
+        "won_super_bowl": [False, True, False],
+        "points": [3.0, super_bowl_win, 10.0],
+    }))
+    rows = by_key(plan, ["qb_id", "round"])
+
+    assert {key: row["action"] for key, row in rows.items()} == {
+        (allen, "WILD_CARD"): None,
+        (hurts, "SUPER_BOWL"): "update",
+        (nix, "DIVISIONAL"): None,
+        (smith, "CONF_CHAMPIONSHIP"): "insert",
+    }
+    assert (rows[(hurts, "SUPER_BOWL")]["won_super_bowl"], rows[(hurts, "SUPER_BOWL")]["points"]) == (True, super_bowl_win)
+    assert not rows[(nix, "DIVISIONAL")]["desired"]
+
+def test_weekly_sync_skips_weeks_at_or_below_watermark(db, qbs, monkeypatch):
+    allen, hurts, _, _ = qbs
+    first = NFLStatsService.sync_qb_weekly_stats(
+        db, SEASON,
+        weekly_data=weekly_frame([("Josh Allen", 1, 250, 2), ("Josh Allen", 2, 200, 1), ("Jalen Hurts", 3, 180, 1)]),
+        last_completed_week=2
+    )
+    # Week 3 is still being played: synced, but the watermark stops at 2
+    assert (first["weeks_synced"], first["watermark"]) == ([1, 2, 3], 2)
+    assert NFLStatsService.get_watermark(db, SEASON, "weekly_stats") == 2
+
+    second = NFLStatsService.sync_qb_weekly_stats(
+        db, SEASON,
+        weekly_data=weekly_frame([
+            ("Josh Allen", 1, 999, 9), ("Josh Allen", 2, 999, 9), ("Jalen Hurts", 3, 210, 2), ("Jalen Hurts", 4, 90, 0)
+        ]),
+        last_completed_week=4
+    )
+    assert (second["weeks_synced"], second["watermark"]) == ([3, 4], 4)
+    assert (second["created"], second["updated"]) == (1, 1)
+
+    db.expire_all()
+    lines = {(row.qb_id, row.week): (row.passing_yards, row.passing_tds) for row in db.query(WeeklyStat)}
+    assert lines == {(allen, 1): (250, 2), (allen, 2): (200, 1), (hurts, 3): (210, 2), (hurts, 4): (90, 0)}
+
+    # Without a network fetch, the next sync only asks for weeks after the watermark
+    requested = []
+    def fetch(season, after_week=0):
+        requested.append(after_week)
+        return weekly_frame([])
+    monkeypatch.setattr(NFLStatsService, "fetch_weekly_stats", staticmethod(fetch))
+    NFLStatsService.sync_qb_weekly_stats(db, SEASON, last_completed_week=4)
+    assert requested == [4]
+
+    full = NFLStatsService.sync_qb_weekly_stats(
+        db, SEASON, weekly_data=weekly_frame([("Josh Allen", 1, 999, 9)]), last_completed_week=4, full=True
+    )
+    assert (full["weeks_synced"], full["updated"]) == ([1], 1)
+
+def test_incremental_wins_skip_weeks_at_or_below_watermark(db, qbs):
+    allen, hurts, nix, smith = qbs
+    games = games_frame([
+        ("REG", 1, "Josh Allen", "Jalen Hurts", "Josh Allen", False),
+        ("REG", 2, "Bo Nix", "Geno Smith", "Bo Nix", True),
+    ])
+    first = NFLStatsService.sync_qb_wins(db, SEASON, completed_games=games, incremental=True, last_completed_week=2)
+    assert (first["games_checked"], first["watermark"]) == (2, 2)
+
+    # A corrected week-1 result is ignored: week 1 is below the watermark
+    games = games_frame([
+        ("REG", 1, "Josh Allen", "Jalen Hurts", "Jalen Hurts", False),
+        ("REG", 3, "Jalen Hurts", "Geno Smith", "Geno Smith", False),
+    ])
+    second = NFLStatsService.sync_qb_wins(db, SEASON, completed_games=games, incremental=True, last_completed_week=3)
+    assert (second["games_checked"], second["watermark"]) == (1, 3)
+
+    db.expire_all()
+    wins = sorted((row.qb_id, row.week, row.prime_time_win) for row in db.query(WeeklyStat) if row.game_won)
+    assert wins == sorted([(allen, 1, False), (nix, 2, True), (smith, 3, False)])
+
+def test_weekly_fetch_projects_and_filters_in_the_scan(tmp_path, monkeypatch):
+    path = tmp_path / "week.parquet"
+    weekly_frame([("Josh Allen", 1, 250, 2), ("Josh Allen", 2, 200, 1), ("Jalen Hurts", 5, 180, 1)]).with_columns(
+        pl.when(pl.col("week") == 5).then(pl.lit("WR")).otherwise(pl.col("position")).alias("position"),
+        pl.lit(1.0).alias("fantasy_points"),
+    ).vstack(
+        weekly_frame([("Josh Allen", 19, 300, 3)]).with_columns(
+            pl.lit("POST").alias("season_type"), pl.lit(1.0).alias("fantasy_points")
+        )
+    ).write_parquet(path)
+    monkeypatch.setattr(nfl_stats.NFLDataCache, "scan", staticmethod(lambda dataset, season=None: pl.scan_parquet(path)))
+
+    frame = NFLStatsService.fetch_weekly_stats(SEASON, after_week=1)
+
+    assert frame["week"].to_list() == [2]
+    assert "fantasy_points" not in frame.columns
+    assert set(NFLStatsService.SEASON_STAT_COLUMNS) <= set(frame.columns)
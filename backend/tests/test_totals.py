@@ -0,0 +1,147 @@
+"""
+The materialized QB / squad totals stay equal to a from-scratch rebuild
+through every admin write path, and QBs or squads created outside the
+seeding endpoint get totals rows in the same transaction.
+"""
+from app.database.config import SessionLocal
+from app.models.models import Squad, Quarterback, QBSeasonTotal, SquadSeasonTotal, SeasonVersion
+from app.services.totals import TotalsService
+from conftest import seed_league
+import random
+import pytest
+
+SEASON = 2026
+
+def assert_no_drift(client, db):
+    db.expire_all()
+    report = TotalsService.check_consistency(db, SEASON)
+    assert report["consistent"], report
+    assert client.get("/api/admin/totals/check/", params={"season": SEASON}).json()["consistent"]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_admin_writes_keep_totals_consistent(client, db, seed):
+    league = seed_league(db, seed, SEASON)
+    qb_ids = league["quarterbacks"]
+    if not qb_ids:
+        pytest.skip("empty league")
+    rng = random.Random(seed)
+
+    for week in (1, 2, 1):
+        # Week 1 twice: the second post replaces the first line
+        response = client.post("/api/admin/weekly-stats/", json={
+            "qb_id": rng.choice(qb_ids), "season": SEASON, "week": week,
+            "passing_yards": rng.randint(0, 400), "passing_tds": rng.randint(0, 4),
+            "interceptions": rng.randint(0, 3), "game_won": rng.random() < 0.5,
+        })
+        assert response.status_code == 200, response.text
+        assert_no_drift(client, db)
+
+    response = client.post("/api/admin/bonuses/", json={
+        "qb_id": rng.choice(qb_ids), "season": SEASON, "bonus_type": "CONF_POM"
+    })
+    assert response.status_code in (200, 400), response.text
+    assert_no_drift(client, db)
+
+    response = client.post("/api/admin/playoffs/", json={
+        "qb_id": rng.choice(qb_ids), "season": SEASON, "round": "SUPER_BOWL", "won_super_bowl": True
+    })
+    assert response.status_code in (200, 400), response.text
+    assert_no_drift(client, db)
+
+    response = client.post("/api/admin/weekly-stats/bulk/", json=[
+        {"qb_id": qb_id, "season": SEASON, "week": 18, "rushing_yards": rng.randint(-5, 80), "fumbles": 1}
+        for qb_id in rng.sample(qb_ids, min(4, len(qb_ids)))
+    ])
+    assert response.status_code == 200, response.text
+    assert_no_drift(client, db)
+
+    response = client.post("/api/admin/bonuses/bulk/", json=[
+        {"qb_id": qb_id, "season": SEASON, "bonus_type": "ROOKIE_OF_YEAR"}
+        for qb_id in rng.sample(qb_ids, min(2, len(qb_ids)))
+    ])
+    assert response.status_code == 200, response.text
+    assert_no_drift(client, db)
+
+    response = client.post("/api/admin/playoffs/bulk/", json=[
+        {"qb_id": qb_id, "season": SEASON, "round": "DIVISIONAL"}
+        for qb_id in rng.sample(qb_ids, min(3, len(qb_ids)))
+    ])
+    assert response.status_code == 200, response.text
+    assert_no_drift(client, db)
+
+def test_quarterback_created_outside_seeding_gets_totals(client, db):
+    league = seed_league(db, 0, SEASON)
+    squad_id = league["squads"][0]
+
+    # A script adding a squad and a QB with its own session, no rebuild
+    with SessionLocal() as session:
+        squad = Squad(name="Expansion Team", owner="New Owner", season=SEASON)
+        session.add(squad)
+        session.flush()
+        session.add_all([
+            Quarterback(name="Late Signing", nfl_team="NYJ", squad_id=squad_id, season=SEASON),
+            Quarterback(name="Expansion QB", nfl_team="CAR", squad_id=squad.id, season=SEASON),
+        ])
+        session.commit()
+        new_squad_id = squad.id
+
+    qb_ids = {qb.name: qb.id for qb in db.query(Quarterback).filter(Quarterback.name.in_(["Late Signing", "Expansion QB"]))}
+    assert db.query(QBSeasonTotal).filter(QBSeasonTotal.qb_id.in_(qb_ids.values())).count() == 2
+    assert db.get(SquadSeasonTotal, new_squad_id) is not None
+    assert_no_drift(client, db)
+
+    roster = client.get(f"/api/squads/{squad_id}/roster/").json()["roster"]
+    assert qb_ids["Late Signing"] in [qb["qb_id"] for qb in roster]
+    standings = client.get("/api/standings/", params={"season": SEASON}).json()
+    assert new_squad_id in [standing["squad_id"] for standing in standings["standings"]]
+
+def test_rolled_back_quarterback_leaves_totals_alone(db):
+    seed_league(db, 1, SEASON)
+    version = db.get(SeasonVersion, SEASON).version
+    db.add(Quarterback(name="Never Signed", nfl_team="NYG", season=SEASON))
+    db.flush()
+    db.rollback()
+
+    # The next commit only builds the season it added to
+    db.add(Squad(name="Unrelated", owner="Owner", season=SEASON + 1))
+    db.commit()
+    assert db.get(SeasonVersion, SEASON).version == version
+    assert db.query(QBSeasonTotal).filter(QBSeasonTotal.season == SEASON + 1).count() == 0
+    assert db.query(SquadSeasonTotal).filter(SquadSeasonTotal.season == SEASON + 1).count() == 1
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_startup_backfills_only_after_migrations_or_empty_totals(db, monkeypatch):
+    import app.main as main
+
+    seed_league(db, 2, SEASON)
+    calls = []
+    ensure_all_seasons = TotalsService.ensure_all_seasons
+    monkeypatch.setattr(TotalsService, "ensure_all_seasons", staticmethod(
+        lambda session: calls.append(1) or ensure_all_seasons(session)
+    ))
+    applied = []
+    monkeypatch.setattr(main, "migrate", lambda engine: applied)
+
+    # Current schema and totals: no per-season scan
+    assert not TotalsService.totals_missing(db)
+    main.prepare_database()
+    assert calls == []
+
+    # A migration was applied
+    applied.append(99)
+    main.prepare_database()
+    assert calls == [1]
+
+    # A totals table left empty is rebuilt
+    applied.clear()
+    db.query(QBSeasonTotal).delete()
+    db.commit()
+    assert TotalsService.totals_missing(db)
+    main.prepare_database()
+    assert calls == [1, 1]
+    db.expire_all()
+    assert not TotalsService.totals_missing(db)
+    assert TotalsService.check_consistency(db, SEASON)["consistent"]
+
+def test_empty_database_has_no_missing_totals(db):
+    assert not TotalsService.totals_missing(db)
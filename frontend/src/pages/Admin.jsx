@@ -157,6 +157,57 @@ export default function Admin() {
     }
   };
 
+  const handleSyncAll = async (e) => {
+    e.preventDefault();
+    try {
+      setSyncing(true);
+      setMessage({ type: 'info', text: `Syncing stats, wins and playoffs for ${syncForm.season}...` });
+      const result = await api.syncAll(syncForm.season, (job) => {
+        setMessage({
+          type: 'info',
+          text: `Syncing stats, wins and playoffs for ${syncForm.season}... (${job.stage || job.status})`
+        });
+      });
+      setMessage({
+        type: 'success',
+        text: `${result.message} - Stats: ${result.stats.total_synced}, Wins: ${result.wins.total_wins_synced}, Playoff appearances: ${result.playoffs.total_wins_synced} (${result.metrics.seconds}s)`
+      });
+    } catch (err) {
+      setMessage({
+        type: 'error',
+        text: `Failed to sync. The ${syncForm.season} season data may not be available yet.`
+      });
+    } finally {
+      setSyncing(false);
+    }
+  };
+
+  const handleSyncWeekly = async (e) => {
+    e.preventDefault();
+    try {
+      setSyncing(true);
+      setMessage({ type: 'info', text: `Syncing new weeks for ${syncForm.season}...` });
+      const result = await api.syncWeekly(syncForm.season, (job) => {
+        setMessage({
+          type: 'info',
+          text: `Syncing new weeks for ${syncForm.season}... (${job.stage || job.status})`
+        });
+      });
+      const weeks = result.stats.weeks_synced;
+      setMessage({
+        type: 'success',
+        text: `${result.message} - Weeks: ${weeks.length ? weeks.join(', ') : 'none'}, Wins: ${result.wins.total_wins_synced}, Synced through week ${result.stats.watermark}`
+      });
+    } catch (err) {
+      setMessage({
+        type: 'error',
+        text: `Failed to sync new weeks. The ${syncForm.season} weekly data may not be available yet.`
+      });
+    } finally {
+      setSyncing(false);
+    }
+  };
+
   const handleSyncStats = async (e) => {
     e.preventDefault();
     try {
@@ -198,11 +249,11 @@ export default function Admin() {
     e.preventDefault();
     try {
       setSyncing(true);
-      setMessage({ type: 'info', text: `Syncing playoff wins for ${syncForm.season}...` });
+      setMessage({ type: 'info', text: `Syncing playoff appearances for ${syncForm.season}...` });
       const result = await api.syncPlayoffs(syncForm.season);
       setMessage({
         type: 'success',
-        text: `${result.message} - Wins synced: ${result.total_wins_synced}`
+        text: `${result.message} - Appearances synced: ${result.total_wins_synced}`
       });
     } catch (err) {
       setMessage({ type: 'error', text: 'Failed to sync playoffs.' });
@@ -219,7 +270,7 @@ export default function Admin() {
       const result = await api.seedAwards(syncForm.season);
       setMessage({
         type: 'success',
-        text: `${result.message} - POW: ${result.pow_awards}, POM: ${result.pom_awards}`
+        text: `${result.message}${result.unmatched_names.length ? ` - not on roster: ${result.unmatched_names.join(', ')}` : ''}`
       });
     } catch (err) {
       setMessage({ type: 'error', text: 'Failed to seed awards.' });
@@ -365,6 +416,24 @@ export default function Admin() {
               </div>
 
               <div className="space-y-3">
+                <button
+                  type="button"
+                  onClick={handleSyncAll}
+                  disabled={syncing}
+                  className={`btn w-full ${syncing ? 'bg-text-muted cursor-not-allowed' : 'btn-gold'}`}
+                >
+                  {syncing ? 'Syncing...' : 'Sync Everything'}
+                </button>
+
+                <button
+                  type="button"
+                  onClick={handleSyncWeekly}
+                  disabled={syncing}
+                  className={`btn w-full ${syncing ? 'bg-text-muted cursor-not-allowed' : 'btn-gold'}`}
+                >
+                  {syncing ? 'Syncing...' : 'Sync New Weeks'}
+                </button>
+
                 <button
                   type="submit"
                   disabled={syncing}
@@ -392,7 +461,7 @@ export default function Admin() {
                     syncing ? 'bg-text-muted cursor-not-allowed text-dark-primary' : 'bg-purple-600 hover:bg-purple-700 text-white'
                   }`}
                 >
-                  {syncing ? 'Syncing...' : 'Sync Playoff Wins'}
+                  {syncing ? 'Syncing...' : 'Sync Playoff Appearances'}
                 </button>
 
                 <button
@@ -412,9 +481,11 @@ export default function Admin() {
                   How it works:
                 </h4>
                 <ul className="text-sm text-text-secondary space-y-1">
+                  <li>• <strong className="text-white">Sync Everything:</strong> Runs stats, wins and playoffs in one pass</li>
+                  <li>• <strong className="text-white">Sync New Weeks:</strong> Per-week stats and wins for weeks not synced yet</li>
                   <li>• <strong className="text-white">Sync Stats:</strong> Fetches yards, TDs, INTs, fumbles</li>
                   <li>• <strong className="text-white">Sync Wins:</strong> Credits wins to starting QBs</li>
-                  <li>• <strong className="text-white">Sync Playoffs:</strong> Credits playoff wins</li>
+                  <li>• <strong className="text-white">Sync Playoffs:</strong> Credits playoff appearances to each round's starters</li>
                   <li>• <strong className="text-white">Seed Awards:</strong> Adds POW/POM bonuses</li>
                 </ul>
               </div>
@@ -13,15 +13,36 @@ export default function Home() {
     loadData();
   }, [season]);
 
+  // Apply live standings changes pushed by the server after each sync
+  useEffect(() => {
+    return api.subscribeStandings(season, {
+      onStandings: (data) => {
+        setStandings(data.standings);
+        setWorstQB(data.worst_qb);
+      },
+      onUpdate: (update) => {
+        setStandings((current) => {
+          const changed = new Map(update.changed.map((squad) => [squad.squad_id, squad]));
+          const removed = new Set(update.removed || []);
+          const kept = current
+            .filter((squad) => !removed.has(squad.squad_id))
+            .map((squad) => changed.get(squad.squad_id) || squad);
+          const added = update.changed.filter((squad) => !current.some((s) => s.squad_id === squad.squad_id));
+          return [...kept, ...added].sort((a, b) => a.rank - b.rank);
+        });
+        if ('worst_qb' in update) {
+          setWorstQB(update.worst_qb);
+        }
+      },
+    });
+  }, [season]);
+
   const loadData = async () => {
     try {
       setLoading(true);
-      const [standingsData, worstQBData] = await Promise.all([
-        api.getStandings(season),
-        api.getWorstQB(season),
-      ]);
-      setStandings(standingsData.standings);
-      setWorstQB(worstQBData.worst_qb);
+      const snapshot = await api.getSeasonSnapshot(season);
+      setStandings(snapshot.standings);
+      setWorstQB(snapshot.worst_qb);
     } catch (err) {
       setError('Failed to load standings. Make sure the backend is running.');
       console.error(err);
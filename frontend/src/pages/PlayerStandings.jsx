@@ -16,7 +16,7 @@ export default function PlayerStandings() {
   const loadPlayers = async () => {
     try {
       setLoading(true);
-      const data = await api.getQuarterbacks(season);
+      const data = await api.getSeasonSnapshot(season);
       // Show all rostered QBs (even with 0 points) + free agents with >0 points
       const filteredPlayers = data.quarterbacks.filter(qb =>
         qb.squad_name !== 'Free Agent' || qb.total_points > 0
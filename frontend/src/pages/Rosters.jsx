@@ -7,6 +7,7 @@ export default function Rosters() {
   const { season } = useSeason();
   const [squads, setSquads] = useState([]);
   const [selectedSquad, setSelectedSquad] = useState(null);
+  const [rosters, setRosters] = useState([]);
   const [roster, setRoster] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -20,10 +21,14 @@ export default function Rosters() {
       setLoading(true);
       setRoster(null);
       setSelectedSquad(null);
-      const data = await api.getSquads(season);
+      // The snapshot carries every squad's roster, so switching squads
+      // doesn't need another request
+      const data = await api.getSeasonSnapshot(season);
       setSquads(data.squads);
-      if (data.squads.length > 0) {
-        loadRoster(data.squads[0].id);
+      setRosters(data.rosters);
+      if (data.rosters.length > 0) {
+        setRoster(data.rosters[0]);
+        setSelectedSquad(data.rosters[0].squad_id);
       }
     } catch (err) {
       setError('Failed to load squads');
@@ -33,14 +38,9 @@ export default function Rosters() {
     }
   };
 
-  const loadRoster = async (squadId) => {
-    try {
-      const data = await api.getSquadRoster(squadId);
-      setRoster(data);
-      setSelectedSquad(squadId);
-    } catch (err) {
-      console.error('Failed to load roster:', err);
-    }
+  const loadRoster = (squadId) => {
+    setRoster(rosters.find((r) => r.squad_id === squadId) || null);
+    setSelectedSquad(squadId);
   };
 
   if (loading) {
@@ -9,7 +9,42 @@ const handleResponse = async (response) => {
   return response.json();
 };
 
+const JOB_POLL_INTERVAL_MS = 1000;
+
+// Sync endpoints queue a background job; poll it until it finishes and
+// resolve with its result (or throw with its error).
+const runSyncJob = async (path, season, onProgress) => {
+  const response = await fetch(`${API_BASE_URL}/api/admin/${path}/?season=${season}`, {
+    method: 'POST',
+  });
+  let job = await handleResponse(response);
+  while (job.status === 'queued' || job.status === 'running') {
+    if (onProgress) onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await api.getJob(job.id);
+  }
+  if (job.status !== 'succeeded') {
+    throw new Error(job.error || `Sync job ${job.id} failed`);
+  }
+  return job.result;
+};
+
 export const api = {
+  // Season snapshot: standings, worst QB, squads, rosters and QB list in one request
+  getSeasonSnapshot: async (season = 2026) => {
+    const response = await fetch(`${API_BASE_URL}/api/seasons/${season}/snapshot`);
+    return handleResponse(response);
+  },
+
+  // Live standings over Server-Sent Events: onStandings gets the full
+  // standings on (re)connect, onUpdate each change. Returns a close function.
+  subscribeStandings: (season, { onStandings, onUpdate }) => {
+    const source = new EventSource(`${API_BASE_URL}/api/standings/stream/?season=${season}`);
+    source.addEventListener('standings', (event) => onStandings(JSON.parse(event.data)));
+    source.addEventListener('standings-update', (event) => onUpdate(JSON.parse(event.data)));
+    return () => source.close();
+  },
+
   // Standings
   getStandings: async (season = 2026) => {
     const response = await fetch(`${API_BASE_URL}/api/standings/?season=${season}`);
@@ -43,6 +78,17 @@ export const api = {
     return handleResponse(response);
   },
 
+  // Several QBs' details in one request, keyed by QB id
+  getQuarterbackDetailsBatch: async (qbIds) => {
+    const response = await fetch(`${API_BASE_URL}/api/quarterbacks/details/?ids=${qbIds.join(',')}`);
+    return handleResponse(response);
+  },
+
+  getSquadDetails: async (squadId) => {
+    const response = await fetch(`${API_BASE_URL}/api/squads/${squadId}/details/`);
+    return handleResponse(response);
+  },
+
   // Admin
   addWeeklyStat: async (statData) => {
     const response = await fetch(`${API_BASE_URL}/api/admin/weekly-stats/`, {
@@ -71,24 +117,18 @@ export const api = {
     return handleResponse(response);
   },
 
-  syncNFLStats: async (season = 2026) => {
-    const response = await fetch(`${API_BASE_URL}/api/admin/sync-stats/?season=${season}`, {
-      method: 'POST',
-    });
-    return handleResponse(response);
-  },
+  syncNFLStats: async (season = 2026, onProgress) => runSyncJob('sync-stats', season, onProgress),
 
-  syncQBWins: async (season = 2026) => {
-    const response = await fetch(`${API_BASE_URL}/api/admin/sync-wins/?season=${season}`, {
-      method: 'POST',
-    });
-    return handleResponse(response);
-  },
+  syncQBWins: async (season = 2026, onProgress) => runSyncJob('sync-wins', season, onProgress),
 
-  syncPlayoffs: async (season = 2026) => {
-    const response = await fetch(`${API_BASE_URL}/api/admin/sync-playoffs/?season=${season}`, {
-      method: 'POST',
-    });
+  syncPlayoffs: async (season = 2026, onProgress) => runSyncJob('sync-playoffs', season, onProgress),
+
+  syncAll: async (season = 2026, onProgress) => runSyncJob('sync-all', season, onProgress),
+
+  syncWeekly: async (season = 2026, onProgress) => runSyncJob('sync-weekly', season, onProgress),
+
+  getJob: async (jobId) => {
+    const response = await fetch(`${API_BASE_URL}/api/admin/jobs/${jobId}`);
     return handleResponse(response);
   },
 